@@ -1,8 +1,38 @@
-import random
-from collections import deque
-
-import networkx as nx
-import matplotlib.pyplot as plt
+import contextlib
+
+import numpy as np
+
+from FirePrevention.agendador import AgendadorEventos
+from FirePrevention.caminhos import CacheCaminhos
+from FirePrevention.despacho import (
+    CANDIDATOS_GULOSO,
+    LIMITE_OTIMO,
+    MODOS_DESPACHO,
+    atribuir,
+    matriz_custos,
+    montar_matriz,
+)
+from FirePrevention.estado import EstadoCompacto, EstadoGrafo
+from FirePrevention.eventos import (
+    Deslocamento,
+    FogoApagado,
+    FogoIncontrolavel,
+    Passo,
+    Reabastecimento,
+    RegistroTexto,
+    SemReabastecimento,
+)
+from FirePrevention.geradores import gerar_arestas
+from FirePrevention.instrumentacao import Instrumentacao
+from FirePrevention.propagacao import PropagacaoDeterministica
+from FirePrevention.recarga import IndiceRecarga
+from FirePrevention.rotas import (
+    ALGORITMOS_ROTA,
+    HeuristicaCoordenadas,
+    IndiceMarcos,
+    a_estrela,
+    busca_bidirecional,
+)
 
 class FirePreventionandFight:
     
@@ -14,7 +44,17 @@ class FirePreventionandFight:
             pontos_agua=None,
             capacidade_caminhoes=10,
             consumo_por_fogo=1,
-            grafo=None
+            grafo=None,
+            backend='networkx',
+            raio_propagacao=None,
+            topologia='aleatoria',
+            semente=None,
+            posicoes=None,
+            limite_cache=1_000_000,
+            instrumentar=False,
+            modo_despacho='guloso',
+            modelo_propagacao=None,
+            processos_despacho=None
         ):
         """
         Inicializa o sistema de combate a incêndios com um grafo representando
@@ -25,12 +65,68 @@ class FirePreventionandFight:
         - num_vertices (int): número total de vértices no grafo (opcional se grafo for passado).
         - num_arestas (int): número de arestas (opcional se grafo for passado).
         - postos_brigadistas (list[int]): vértices com postos de brigadistas.
-        - pontos_agua (list[int]): vértices com fontes de água.
+        - pontos_agua (list[int] | np.ndarray): vértices com fontes de água
+        (ver também 'carregadores.carregar_simulacao' para lê-los de arquivo).
         - capacidade_caminhoes (int): capacidade de água por caminhão.
-        - consumo_por_fogo (int): quantidade de água consumida por foco de fogo.
-        - grafo (nx.Graph): grafo customizado já construído (opcional).
+        - consumo_por_fogo (int): quantidade de água consumida por foco de fogo
+        (no máximo 'capacidade_caminhoes').
+        - grafo (nx.Graph | EstadoCompacto): grafo customizado já construído (opcional).
+        - backend (str): onde o estado dos vértices é guardado:
+            * 'networkx': nos atributos dos nós de 'self.grafo' (padrão).
+            * 'compacto': em arrays NumPy com adjacência CSR ('EstadoCompacto'),
+            usando bem menos memória em grafos grandes. Neste modo
+            'self.grafo' é None e o estado é consultado por 'self.estado'.
+        - raio_propagacao (int | None): quantos saltos o fogo avança a cada
+        chamada de 'propagar_fogo' (ex.: 1 para um salto por passo). None
+        mantém a propagação por toda a componente conexa.
+        - topologia (str): tipo do grafo gerado quando 'grafo' não é passado:
+        'aleatoria', 'conexa', 'grade' ou 'geometrica' (ver 'gerar_arestas').
+        - semente (int | None): semente do gerador aleatório da simulação.
+        - posicoes (dict | np.ndarray | None): coordenadas dos vértices para
+        o desenho, como {vértice: (x, y)} ou um array (n, 2) na ordem dos
+        vértices. Evitam o cálculo do layout de molas.
+        - limite_cache (int): máximo de vértices guardados no cache de
+        árvores de caminhos mínimos ('self.caminhos').
+        - instrumentar (bool): registra tempo, buscas de caminhos e tamanho
+        do fogo por passo e por fase em 'self.instrumentacao' (ver
+        'Instrumentacao'). Desligado, 'self.instrumentacao' é None.
+        - modo_despacho (str): como 'enviar_brigadistas' escolhe os focos:
+            * 'guloso': cada brigadista, na ordem do dicionário, vai ao foco
+            mais próximo, mesmo que outro já tenha ido a ele (padrão).
+            * 'otimo': atribuição de custo mínimo brigadista x foco, em que
+            cada foco recebe no máximo um brigadista.
+            * 'capacidade': como 'otimo', mas quem ficará sem água soma ao
+            custo a distância do foco ao reabastecimento mais próximo. A
+            matriz de custos inclui então todos os focos, pois um foco
+            distante pode compensar por estar perto da água; acima de
+            'despacho.LIMITE_OTIMO' entradas, a atribuição vira a
+            aproximação gulosa entre os focos mais próximos.
+        - modelo_propagacao (ModeloPropagacao | None): regra usada por
+        'propagar_fogo' (ver 'propagacao'). Por padrão, a propagação
+        determinística em largura ('PropagacaoDeterministica').
+        - processos_despacho (int | None): com mais de 1, as buscas dos
+        brigadistas em 'enviar_brigadistas' são feitas em paralelo nesse
+        número de processos (ver 'PlanejadorDespacho'), com o mesmo
+        resultado da execução sequencial. Compensa com frotas grandes; os
+        processos são encerrados por 'fechar'.
         """
 
+        if backend not in ('networkx', 'compacto'):
+            raise ValueError("backend deve ser 'networkx' ou 'compacto'.")
+        if modo_despacho not in MODOS_DESPACHO:
+            raise ValueError(f"modo_despacho deve ser um de {MODOS_DESPACHO}.")
+        # Um caminhão que não comporta a água de um foco reabasteceria a
+        # cada passo sem nunca apagar nada
+        if capacidade_caminhoes < consumo_por_fogo:
+            raise ValueError("capacidade_caminhoes deve ser pelo menos consumo_por_fogo.")
+
+        # Define como os brigadistas são atribuídos aos focos
+        self.modo_despacho = modo_despacho
+
+        # Processos das buscas do despacho, criados no primeiro turno
+        self.processos_despacho = processos_despacho
+        self._planejador = None
+
         # Define o consumo de água por foco de incêndio
         self.consumo_por_fogo = consumo_por_fogo
 
@@ -40,88 +136,330 @@ class FirePreventionandFight:
         # Inicializa o dicionário de brigadistas
         self.brigadistas = {}
 
-        # Lista para armazenar os focos de fogo ativos
-        self.fogo_ativo = []
+        # Conjunto dos focos de fogo ativos (pertinência e remoção em O(1))
+        self.fogo_ativo = set()
+
+        # Focos que ainda não espalharam o fogo para os vizinhos
+        self.fronteira_fogo = set()
+
+        # Número máximo de saltos que o fogo avança a cada propagação
+        self.raio_propagacao = raio_propagacao
+
+        # Regra de propagação do fogo
+        self.modelo_propagacao = modelo_propagacao or PropagacaoDeterministica()
 
         # Lista para armazenar os focos de fogo que já foram apagados
         self.fogos_apagados = []
 
+        # Eventos do turno corrente de enviar_brigadistas
+        self._eventos = []
+
+        # Arrays NumPy (ex.: lidos de arquivo) viram listas de inteiros
+        if isinstance(postos_brigadistas, np.ndarray):
+            postos_brigadistas = postos_brigadistas.tolist()
+        if isinstance(pontos_agua, np.ndarray):
+            pontos_agua = pontos_agua.tolist()
+
+        # Converte a lista de postos de brigadistas para um conjunto
+        self.postos_brigadistas = set(postos_brigadistas or [])
+
+        # Gerador de números aleatórios da simulação
+        self.rng = np.random.default_rng(semente)
+
+        # Coordenadas dos vértices (dict ou array indexado pelos vértices)
+        self._coordenadas = posicoes
+
         # Verifica se um grafo já foi fornecido
-        if grafo is not None:
+        if grafo is None:
+            # Se nenhum grafo for passado, número de vértices e arestas são obrigatórios
+            if num_vertices is None or (num_arestas is None and topologia != 'grade'):
+                raise ValueError("Se o grafo não for fornecido, num_vertices e num_arestas são obrigatórios.")
 
-            # Atribui o grafo fornecido à instância
+            # Gera as arestas aleatórias com pesos entre os vértices
+            origens, destinos, pesos, coordenadas = gerar_arestas(
+                num_vertices, num_arestas, topologia, self.rng
+            )
+            if self._coordenadas is None:
+                self._coordenadas = coordenadas
+
+            # No backend compacto os arrays viram o estado sem passar pelo networkx
+            if backend == 'compacto':
+                grafo = EstadoCompacto.de_arestas(
+                    origens, destinos, pesos, num_vertices
+                )
+            else:
+                # O networkx só é carregado quando o backend o usa
+                import networkx as nx
+
+                grafo = nx.Graph()
+                grafo.add_nodes_from(range(num_vertices))
+                grafo.add_weighted_edges_from(zip(
+                    origens.tolist(), destinos.tolist(), pesos.tolist()
+                ))
+
+        # Escolhe onde o estado dos vértices será guardado
+        if isinstance(grafo, EstadoCompacto):
+            self.grafo = None
+            self.estado = grafo
+        elif backend == 'compacto':
+            self.grafo = None
+            self.estado = EstadoCompacto.de_grafo(grafo)
+        else:
             self.grafo = grafo
+            self.estado = EstadoGrafo(grafo)
 
-            # Converte a lista de postos de brigadistas para um conjunto
-            self.postos_brigadistas = set(postos_brigadistas or [])
+        # Define se cada nó é um posto de brigadistas
+        for p in self.postos_brigadistas:
+            self.estado.definir(p, 'posto_brigadista', True)
 
-            # Para cada nó do grafo, define atributos padrão
-            for i in self.grafo.nodes:
-                self.grafo.nodes[i].setdefault('fogo', False)
-                self.grafo.nodes[i].setdefault('agua', False)
-                self.grafo.nodes[i].setdefault('queimado', False)
+        # Inicializa os brigadistas nos respectivos postos
+        for p in self.postos_brigadistas:
+            self.brigadistas[p] = (p, self.capacidade_caminhoes)
 
-                # Define se o nó é um posto de brigadistas
-                self.grafo.nodes[i]['posto_brigadista'] = i in self.postos_brigadistas
+            # Marca o posto como contendo água
+            self.estado.definir(p, 'agua', True)
 
-            # Inicializa os brigadistas nos respectivos postos
-            for p in self.postos_brigadistas:
-                self.brigadistas[p] = (p, self.capacidade_caminhoes)
+        # Marca os pontos de água adicionais no grafo
+        for p in pontos_agua or []:
+            self.estado.definir(p, 'agua', True)
 
-                # Marca o posto como contendo água
-                self.grafo.nodes[p]['agua'] = True
+        # Posições dos nós para visualização, calculadas só quando necessárias
+        self._pos = None
 
-            # Marca os pontos de água adicionais no grafo
-            for p in pontos_agua or []:
-                self.grafo.nodes[p]['agua'] = True
+        # Índice do ponto de reabastecimento mais próximo, criado sob demanda
+        # e refeito quando a versão das arestas do estado muda
+        self._indice_recarga = None
+        self._versao_recarga = None
 
-        else:
-            # Se nenhum grafo for passado, número de vértices e arestas são obrigatórios
-            if num_vertices is None or num_arestas is None:
-                raise ValueError("Se o grafo não for fornecido, num_vertices e num_arestas são obrigatórios.")
+        # Desenho da simulação, criado na primeira chamada de desenhar_grafo
+        self._renderizador = None
 
-            # Cria um novo grafo vazio
-            self.grafo = nx.Graph()
+        # Cache das árvores de caminhos mínimos, indexadas pela origem
+        self.caminhos = CacheCaminhos(self.estado, limite_cache)
 
-            # Converte a lista de postos de brigadistas para um conjunto
-            self.postos_brigadistas = set(postos_brigadistas or [])
+        # Estimativas do A* para 'caminho_mais_curto', criadas no primeiro
+        # uso e refeitas quando os pesos mudam
+        self._heuristica_coordenadas = None
+        self._marcos = None
 
-            # Adiciona vértices ao grafo com atributos padrão
-            for i in range(num_vertices):
-                self.grafo.add_node(
-                    i,
-                    fogo=False,
-                    agua=False,
-                    queimado=False,
-                    posto_brigadista=(i in self.postos_brigadistas)
-                )
+        # Peso original de cada aresta fechada, indexada pelo par de vértices
+        self.arestas_fechadas = {}
 
-            # Gera arestas aleatórias com pesos entre os vértices
-            arestas_adicionadas = set()
-            while len(arestas_adicionadas) < num_arestas:
-                u, v = random.sample(range(num_vertices), 2)
+        # Objetos avisados das alterações feitas por 'alterar_peso' e pelos
+        # pontos de água, com 'aresta_alterada(u, v)' e 'vertice_alterado(v)'
+        self.observadores = []
 
-                # Adiciona aresta se ainda não tiver sido criada
-                if (u, v) not in arestas_adicionadas and (v, u) not in arestas_adicionadas:
-                    peso = random.randint(1, 10)
-                    self.grafo.add_edge(u, v, weight=peso)
-                    arestas_adicionadas.add((u, v))
+        # Medições por passo e por fase, apenas quando pedidas
+        self.instrumentacao = Instrumentacao(self) if instrumentar else None
 
-            # Inicializa os brigadistas nos respectivos postos
-            for p in self.postos_brigadistas:
-                self.brigadistas[p] = (p, self.capacidade_caminhoes)
 
-                # Marca o posto como contendo água
-                self.grafo.nodes[p]['agua'] = True
+    @property
+    def pos(self):
+        """
+        Posições dos nós usadas no desenho. Vêm das coordenadas fornecidas
+        (ou geradas pela topologia) quando existem; caso contrário, o layout
+        de molas é calculado apenas no primeiro acesso, para que simulações
+        sem desenho não paguem por ele.
+        """
+        if self._pos is None:
+            if isinstance(self._coordenadas, dict):
+                self._pos = self._coordenadas
+            elif self._coordenadas is not None:
+                self._pos = {
+                    no: tuple(xy)
+                    for no, xy in zip(self.estado.nos(), self._coordenadas.tolist())
+                }
+            else:
+                import networkx as nx
 
-            # Marca os pontos de água adicionais no grafo
-            for p in pontos_agua or []:
-                self.grafo.nodes[p]['agua'] = True
+                # Arestas fechadas entram no layout com o peso original
+                grafo = self.estado.para_networkx()
+                if self.arestas_fechadas:
+                    grafo = grafo.copy()
+                    for (u, v), peso in self.arestas_fechadas.items():
+                        grafo[u][v]['weight'] = peso
+                self._pos = nx.spring_layout(grafo)
+        return self._pos
 
-        # Calcula posições dos nós para visualização com layout de molas
-        self.pos = nx.spring_layout(self.grafo)
+    @pos.setter
+    def pos(self, posicoes):
+        self._pos = posicoes
+        self._heuristica_coordenadas = None
 
 
+    @property
+    def indice_recarga(self):
+        """
+        Índice com o ponto de água ou posto de brigadistas mais próximo de
+        cada vértice, construído no primeiro uso com um Dijkstra de
+        múltiplas fontes e refeito se as arestas forem alteradas.
+        """
+        if self._versao_recarga != self.estado.versao:
+            self._versao_recarga = self.estado.versao
+            fontes = set(self.estado.nos_com('agua'))
+            fontes.update(self.estado.nos_com('posto_brigadista'))
+            anterior = self._indice_recarga
+            self._indice_recarga = IndiceRecarga(
+                self.estado.vizinhos_ponderados, fontes
+            )
+
+            # Os contadores continuam acumulando entre reconstruções
+            if anterior is not None:
+                self._indice_recarga.buscas += anterior.buscas
+                self._indice_recarga.vertices_fixados += anterior.vertices_fixados
+        return self._indice_recarga
+
+
+    def contadores_caminhos(self):
+        """
+        Totais acumulados de buscas de Dijkstra e de vértices fixados por
+        elas, somando o cache de caminhos e o índice de reabastecimento.
+
+        Retorna:
+        - tuple(int, int): (buscas, vértices fixados).
+        """
+        buscas = self.caminhos.buscas
+        fixados = self.caminhos.vertices_fixados
+        if self._indice_recarga is not None:
+            buscas += self._indice_recarga.buscas
+            fixados += self._indice_recarga.vertices_fixados
+        return buscas, fixados
+
+
+    def adicionar_ponto_agua(self, vertice):
+        """
+        Adiciona um ponto de água durante a simulação, atualizando o índice
+        de reabastecimento de forma incremental.
+
+        Parâmetros:
+        - vertice (int): vértice que passa a ter água.
+        """
+        self.estado.definir(vertice, 'agua', True)
+        if self._indice_recarga is not None:
+            self._indice_recarga.adicionar(vertice)
+        for observador in self.observadores:
+            observador.vertice_alterado(vertice)
+
+
+    def remover_ponto_agua(self, vertice):
+        """
+        Remove um ponto de água durante a simulação. Postos de brigadistas
+        continuam servindo como ponto de reabastecimento.
+
+        Parâmetros:
+        - vertice (int): vértice que deixa de ter água.
+        """
+        self.estado.definir(vertice, 'agua', False)
+        if (self._indice_recarga is not None and
+                not self.estado.obter(vertice, 'posto_brigadista')):
+            self._indice_recarga.remover(vertice)
+        for observador in self.observadores:
+            observador.vertice_alterado(vertice)
+
+        # Sem a água, o vértice pode pegar fogo: os focos vizinhos, que já
+        # haviam espalhado, voltam à frente de fogo para alcançá-lo
+        if not (self.estado.obter(vertice, 'posto_brigadista') or
+                self.estado.obter(vertice, 'fogo') or
+                self.estado.obter(vertice, 'queimado')):
+            self.fronteira_fogo.update(
+                vizinho for vizinho in self.estado.vizinhos(vertice)
+                if vizinho in self.fogo_ativo
+            )
+
+
+    def alterar_peso(self, u, v, peso):
+        """
+        Altera o peso da aresta (u, v) durante a simulação. Em vez de
+        recalcular tudo, o índice de reabastecimento é reparado só onde a
+        aresta importa, e do cache de caminhos saem só as árvores que a
+        usavam (ver 'IndiceRecarga.aresta_alterada' e
+        'CacheCaminhos.aresta_alterada'). Numa aresta fechada, o novo peso
+        passa a valer quando ela for reaberta.
+
+        Parâmetros:
+        - u, v (int): extremidades da aresta.
+        - peso (float): novo peso.
+        """
+        chave = self._chave_aresta(u, v)
+        if chave in self.arestas_fechadas:
+            self.arestas_fechadas[chave] = peso
+            return
+        self._aplicar_peso(u, v, peso)
+
+
+    def fechar_aresta(self, u, v):
+        """
+        Fecha a aresta (u, v) para os brigadistas (ex.: estrada interditada
+        ou ponte destruída): ela recebe peso infinito, que nenhuma busca de
+        caminho atravessa, e o peso original é guardado para a reabertura.
+        O fogo, que não depende das estradas, continua se propagando por
+        ela no modelo determinístico. Os vértices não mudam, então
+        'self.pos' continua válido.
+
+        Parâmetros:
+        - u, v (int): extremidades da aresta.
+        """
+        chave = self._chave_aresta(u, v)
+        if chave in self.arestas_fechadas:
+            return
+        self.arestas_fechadas[chave] = self.estado.peso(u, v)
+        self._aplicar_peso(u, v, float('inf'))
+
+
+    def reabrir_aresta(self, u, v):
+        """
+        Reabre uma aresta fechada por 'fechar_aresta', com o peso original
+        (ou o último definido por 'alterar_peso' enquanto estava fechada).
+
+        Parâmetros:
+        - u, v (int): extremidades da aresta.
+        """
+        peso = self.arestas_fechadas.pop(self._chave_aresta(u, v), None)
+        if peso is not None:
+            self._aplicar_peso(u, v, peso)
+
+
+    def _chave_aresta(self, u, v):
+        """Chave de 'arestas_fechadas', a mesma nos dois sentidos."""
+        return (u, v) if (v, u) not in self.arestas_fechadas else (v, u)
+
+
+    def _aplicar_peso(self, u, v, peso):
+        """
+        Altera o peso no estado e atualiza de forma incremental as
+        estruturas derivadas que estavam em dia antes da alteração; as
+        demais continuam sendo refeitas no próximo uso.
+        """
+        peso_antigo = self.estado.peso(u, v)
+        if peso == peso_antigo:
+            return
+        versao = self.estado.versao
+        self.estado.alterar_peso(u, v, peso)
+        for observador in self.observadores:
+            observador.aresta_alterada(u, v)
+
+        self.caminhos.aresta_alterada(u, v, peso_antigo, peso)
+
+        if self._indice_recarga is not None and self._versao_recarga == versao:
+            self._indice_recarga.aresta_alterada(u, v, peso_antigo, peso)
+            self._versao_recarga = self.estado.versao
+
+        heuristica = self._heuristica_coordenadas
+        if heuristica is not None and heuristica.versao == versao:
+            heuristica.aresta_alterada(self.estado, u, v, peso)
+
+        # Aumentos mantêm os limites dos marcos; reduções os refazem no próximo uso
+        if self._marcos is not None and self._marcos.versao == versao and peso > peso_antigo:
+            self._marcos.versao = self.estado.versao
+
+
+    def invalidar_caminhos(self):
+        """
+        Descarta os caminhos calculados. Necessário apenas quando
+        'self.grafo' for alterado diretamente, sem passar por 'alterar_peso'.
+        """
+        self.estado.versao += 1
+
 
     def iniciar_fogo(self, inicio):
         """
@@ -140,19 +478,21 @@ class FirePreventionandFight:
         de focos ativos.
         """
         # Não inicia fogo em locais inválidos
-        if (self.grafo.nodes[inicio]['agua'] or
-            self.grafo.nodes[inicio]['queimado'] or
-            self.grafo.nodes[inicio]['posto_brigadista']):
+        if (self.estado.obter(inicio, 'agua') or
+            self.estado.obter(inicio, 'queimado') or
+            self.estado.obter(inicio, 'posto_brigadista')):
             return  
 
         # Marca o vértice como com fogo ativo
-        self.fogo_ativo.append(inicio)
-        self.grafo.nodes[inicio]['fogo'] = True
+        self.fogo_ativo.add(inicio)
+        self.fronteira_fogo.add(inicio)
+        self.estado.definir(inicio, 'fogo', True)
 
 
     def propagar_fogo(self):
         """
-        Propaga o fogo utilizando busca em largura (BFS) a partir dos vértices atualmente em chamas.
+        Propaga o fogo em largura (BFS) a partir da frente de fogo, isto é,
+        dos vértices que pegaram fogo e ainda não espalharam as chamas.
 
         A propagação só ocorre se o vértice vizinho:
         - Não estiver em chamas.
@@ -160,31 +500,18 @@ class FirePreventionandFight:
         - Não tiver sido queimado anteriormente.
         - Não for um posto de brigadistas.
 
-        Os novos focos são marcados e adicionados à lista de fogo ativo.
-        """
-        fila = deque(self.fogo_ativo)  # Fila BFS inicial com os vértices em chamas
-        visitados = set(self.fogo_ativo)  # Para evitar reprocessar vértices
+        Focos antigos, cujos vizinhos já foram examinados, não são
+        revisitados, então o custo depende apenas do tamanho da frente.
+        A cada chamada o fogo avança no máximo 'raio_propagacao' saltos
+        (sem limite quando None, espalhando-se por toda a componente).
 
-        novos_focos = []
+        Esse é o comportamento do modelo padrão; a regra efetiva é a de
+        'self.modelo_propagacao' (ex.: 'PropagacaoEstocastica').
 
-        while fila:
-            atual = fila.popleft()
-
-            for vizinho in self.grafo.neighbors(atual):
-                if (vizinho not in visitados and
-                    not self.grafo.nodes[vizinho]['fogo'] and
-                    not self.grafo.nodes[vizinho]['agua'] and
-                    not self.grafo.nodes[vizinho]['queimado'] and
-                    not self.grafo.nodes[vizinho]['posto_brigadista']):
-                    
-                    # Marca o vizinho como novo foco
-                    self.grafo.nodes[vizinho]['fogo'] = True
-                    novos_focos.append(vizinho)
-                    fila.append(vizinho)
-                    visitados.add(vizinho)
-
-        # Atualiza a lista de fogo ativo
-        self.fogo_ativo.extend(novos_focos)
+        Retorna:
+        - list[int]: novos focos criados nesta chamada.
+        """
+        return self.modelo_propagacao.propagar(self)
 
 
     def apagar_fogo(self, vertice):
@@ -197,24 +524,25 @@ class FirePreventionandFight:
         A função realiza as seguintes ações:
         - Marca o vértice como não estando mais em chamas.
         - Marca o vértice como queimado (registro do incêndio).
-        - Remove o vértice da lista de focos de fogo ativos.
+        - Remove o vértice do conjunto de focos de fogo ativos.
         - Adiciona o vértice à lista de fogos apagados.
         """
 
         # Marca o vértice como não estando mais em chamas
-        self.grafo.nodes[vertice]['fogo'] = False
+        self.estado.definir(vertice, 'fogo', False)
 
         # Marca o vértice como queimado (registro do incêndio)
-        self.grafo.nodes[vertice]['queimado'] = True
+        self.estado.definir(vertice, 'queimado', True)
 
-        # Remove o vértice da lista de focos de fogo ativos
+        # Remove o vértice do conjunto de focos ativos e da frente de fogo
         self.fogo_ativo.remove(vertice)
+        self.fronteira_fogo.discard(vertice)
 
         # Adiciona o vértice à lista de fogos apagados
         self.fogos_apagados.append(vertice)
 
 
-    def caminho_mais_curto(self, origem, destino):
+    def caminho_mais_curto(self, origem, destino, algoritmo='dijkstra'):
         """
         Calcula o caminho mais curto entre dois vértices no grafo,
         usando o algoritmo dijkstra que leva
@@ -223,24 +551,93 @@ class FirePreventionandFight:
         Parâmetros:
         - origem (int): vértice de partida.
         - destino (int): vértice de chegada.
+        - algoritmo (str): como o caminho é buscado:
+            * 'dijkstra': árvore de caminhos da origem, guardada em
+            'self.caminhos' e reaproveitada por outras consultas (padrão).
+            * 'bidirecional': Dijkstra a partir dos dois extremos ao mesmo
+            tempo, sem cache; para pares distantes em grafos grandes.
+            * 'a_estrela': A* guiado pelas coordenadas dos vértices (as
+            fornecidas, as da topologia ou 'self.pos' já definido).
+            * 'alt': A* guiado pelo índice de marcos ('preparar_marcos'),
+            criado com os valores padrão no primeiro uso.
 
         Retorna:
         - Lista com os vértices do caminho mais curto, incluindo origem e
         destino, ou None se não houver caminho entre os dois vértices.
+        Todos os algoritmos devolvem um caminho de mesmo comprimento; havendo
+        mais de um caminho mínimo (pesos inteiros empatados), os modos ponto
+        a ponto podem escolher outro deles.
         """
+        if algoritmo not in ALGORITMOS_ROTA:
+            raise ValueError(f"algoritmo deve ser um de {ALGORITMOS_ROTA}.")
 
-        # Calcular o caminho mais curto usando Dijkstra com base nos pesos das arestas
-        try:
-            return nx.shortest_path(
-                self.grafo,          # Grafo no qual será buscado o caminho
-                source=origem,       # Vértice de origem
-                target=destino,      # Vértice de destino
-                weight='weight'      # Considera o peso das arestas
+        # Calcula o caminho mais curto usando Dijkstra com base nos pesos das
+        # arestas, reaproveitando a árvore de caminhos da origem se houver.
+        # Se não existir caminho possível entre os dois vértices, retorna None
+        if algoritmo == 'dijkstra':
+            return self.caminhos.caminho(origem, destino)
+
+        vizinhos = self.estado.vizinhos_ponderados
+        if algoritmo == 'bidirecional':
+            rota = busca_bidirecional(vizinhos, origem, destino)
+        elif algoritmo == 'a_estrela':
+            rota = a_estrela(
+                vizinhos, origem, destino,
+                self._obter_heuristica_coordenadas().para(destino)
             )
+        else:
+            marcos = self._marcos
+            if marcos is None:
+                marcos = self.preparar_marcos()
+            elif marcos.versao != self.estado.versao:
+                marcos = self.preparar_marcos(*marcos.parametros)
+            if marcos.desconectados(origem, destino):
+                return None
+            rota = a_estrela(vizinhos, origem, destino, marcos.para(destino))
+
+        # As buscas ponto a ponto entram nos mesmos contadores das árvores
+        self.caminhos.buscas += 1
+        self.caminhos.vertices_fixados += rota.fixados
+        return rota.caminho
+
+
+    def preparar_marcos(self, num_marcos=8, marcos=None, semente=None):
+        """
+        Constrói o índice de marcos usado por
+        'caminho_mais_curto(..., algoritmo="alt")'. Custa um Dijkstra
+        completo por marco e compensa quando muitas rotas serão consultadas
+        antes de os pesos mudarem; com pesos alterados, o índice é refeito
+        na consulta seguinte.
 
-        # Se não existir caminho possível entre os dois vértices, retorna None
-        except nx.NetworkXNoPath:
-            return None
+        Parâmetros:
+        - num_marcos (int): quantos marcos escolher.
+        - marcos (list | None): marcos fixos (por padrão, escolhidos na
+        periferia do grafo).
+        - semente (int | None): semente do sorteio do primeiro marco.
+
+        Retorna:
+        - IndiceMarcos: o índice construído.
+        """
+        self._marcos = IndiceMarcos(self.estado, num_marcos, marcos, semente)
+        return self._marcos
+
+
+    def _obter_heuristica_coordenadas(self):
+        """
+        Estimativa do A* pelas coordenadas dos vértices, refeita se os pesos
+        mudarem. O layout de molas não é calculado só para isso.
+        """
+        heuristica = self._heuristica_coordenadas
+        if heuristica is None or heuristica.versao != self.estado.versao:
+            if self._coordenadas is None and self._pos is None:
+                raise ValueError(
+                    "O A* requer coordenadas ('posicoes' ou 'self.pos'); "
+                    "use algoritmo='bidirecional' ou 'alt'."
+                )
+            coordenadas = self._coordenadas if self._pos is None else self._pos
+            heuristica = HeuristicaCoordenadas(self.estado, coordenadas)
+            self._heuristica_coordenadas = heuristica
+        return heuristica
 
 
     def enviar_brigadistas(self):
@@ -253,18 +650,46 @@ class FirePreventionandFight:
         - Para cada brigadista:
             - Se estiver sem água, ele é enviado ao ponto de reabastecimento
             mais próximo.
-            - Caso tenha água, ele é enviado ao foco de fogo mais próximo.
+            - Caso tenha água, ele é enviado ao foco de fogo mais próximo
+            (modo 'guloso') ou ao foco que lhe coube na atribuição conjunta
+            de todos os brigadistas com água (modos 'otimo' e 'capacidade',
+            ver '_despachar_em_lote').
         - A posição e a quantidade de água do brigadista são atualizadas
         conforme ele se move.
 
         Observações:
         - A movimentação é baseada no caminho mais curto (menor peso).
+        - Cada brigadista faz uma única busca de Dijkstra por turno, que
+        devolve ao mesmo tempo o alvo mais próximo e o caminho até ele. A
+        busca é guardada em 'self.caminhos' e retomada nos turnos seguintes.
+        - O reabastecimento usa o índice 'self.indice_recarga'.
         - Os focos ativos e pontos de reabastecimento são dinâmicos.
+
+        Retorna:
+        - list: eventos do turno (deslocamentos, reabastecimentos e fogos
+        apagados), na ordem em que ocorreram.
         """
 
+        # Eventos gerados neste turno, preenchidos também por deslocar_brigadista
+        self._eventos = []
+
         # Verifica se há algum foco de fogo ativo; se não houver, retorna imediatamente
         if not self.fogo_ativo:
-            return  
+            return self._eventos
+
+        # Brigadistas com água, despachados juntos nos modos em lote
+        com_agua = []
+
+        # No modo paralelo, os focos mais próximos de todos os brigadistas
+        # com água são buscados de uma vez sobre os focos do início do turno
+        planejador = self._obter_planejador()
+        planejados = {}
+        if planejador is not None and self.modo_despacho == 'guloso':
+            planejados = self._planejar([
+                (brigadista, posicao)
+                for brigadista, (posicao, agua) in self.brigadistas.items()
+                if agua >= self.consumo_por_fogo
+            ])
 
         # Itera sobre todos os brigadistas e suas respectivas posições e níveis de água
         for brigadista, (posicao_atual, agua) in self.brigadistas.items():
@@ -272,21 +697,17 @@ class FirePreventionandFight:
             # Se o brigadista não tem água suficiente para apagar o fogo
             if agua < self.consumo_por_fogo:
 
-                # Encontra o ponto de reabastecimento mais próximo usando caminho mais curto
-                ponto_reabastecimento = min(
-                    (n for n in self.grafo.nodes if self.grafo.nodes[n]['agua']),
-                    key=lambda p: nx.shortest_path_length(
-                        self.grafo, posicao_atual, p, weight='weight'
-                    ),
-                    default=None
+                # Consulta no índice o ponto de reabastecimento mais próximo
+                caminho_ate_agua = self.encontrar_caminho_ate_agua_ou_posto(
+                    posicao_atual
                 )
 
                 # Se encontrou um ponto de reabastecimento
-                if ponto_reabastecimento:
-                    print(
-                        f"💧 Brigadista {brigadista} sem água indo reabastecer "
-                        f"em {ponto_reabastecimento}."
-                    )
+                if caminho_ate_agua is not None:
+                    ponto_reabastecimento = caminho_ate_agua[-1]
+                    self._eventos.append(Reabastecimento(
+                        brigadista, ponto_reabastecimento, None
+                    ))
 
                     # Atualiza a posição do brigadista e recarrega a água
                     self.brigadistas[brigadista] = (
@@ -296,30 +717,190 @@ class FirePreventionandFight:
                 # Passa para o próximo brigadista
                 continue
 
-            # Se o brigadista tem água, encontra o foco de fogo mais próximo
-            foco_mais_proximo = min(
-                (f for f in self.fogo_ativo if f != posicao_atual),
-                key=lambda f: nx.shortest_path_length(
-                    self.grafo, posicao_atual, f, weight='weight'
-                ),
-                default=None
+            if self.modo_despacho != 'guloso':
+                com_agua.append((brigadista, posicao_atual, agua))
+                continue
+
+            # Se o brigadista tem água, a mesma busca encontra o foco mais
+            # próximo e o caminho até ele, parando no primeiro vértice em chamas
+            foco_mais_proximo, _, caminho = planejados.get(brigadista, (None, None, None))
+
+            # Focos só se apagam durante o turno: se o planejado ainda queima,
+            # continua sendo o mais próximo; senão, a busca é refeita aqui
+            if brigadista not in planejados or (
+                    foco_mais_proximo is not None and
+                    not self.estado.obter(foco_mais_proximo, 'fogo')):
+                foco_mais_proximo, _, caminho = self.caminhos.mais_proximo(
+                    posicao_atual,
+                    lambda n: n != posicao_atual and self.estado.obter(n, 'fogo')
+                )
+
+            # Se encontrou um foco alcançável
+            if foco_mais_proximo is not None:
+
+                # Move o brigadista ao longo do caminho e atualiza sua posição e água restante
+                self.brigadistas[brigadista] = self.deslocar_brigadista(
+                    brigadista, caminho, agua
+                )
+
+        if com_agua:
+            self._despachar_em_lote(com_agua)
+
+        return self._eventos
+
+
+    def _despachar_em_lote(self, com_agua):
+        """
+        Atribui focos a todos os brigadistas com água de uma só vez,
+        minimizando a distância total, e os desloca com deslocar_brigadista.
+
+        A matriz de custos sai de uma árvore de caminhos por brigadista,
+        com os focos mais próximos de cada um (todos, no modo 'capacidade'
+        com alguém prestes a ficar sem água). Quando ela ficaria grande
+        demais, cada brigadista considera poucos focos e a atribuição vira
+        a aproximação gulosa (ver 'atribuir'). Brigadistas sem foco
+        atribuído ficam parados neste turno.
+
+        Parâmetros:
+        - com_agua (list[tuple]): (brigadista, posição, água) de cada um.
+        """
+        origens = [posicao for _, posicao, _ in com_agua]
+
+        # Quem fica sem água após este foco ainda precisa ir reabastecer
+        vazios = None
+        if self.modo_despacho == 'capacidade':
+            vazios = np.array([
+                agua - self.consumo_por_fogo < self.consumo_por_fogo
+                for _, _, agua in com_agua
+            ])
+            if not vazios.any():
+                vazios = None
+
+        # Com k igual ao número de brigadistas a atribuição é exata, pois
+        # só a distância conta. Com o custo do reabastecimento, um foco
+        # fora dos k mais próximos pode ser o melhor, então entram todos
+        k = len(com_agua) if vazios is None else len(self.fogo_ativo)
+        if len(com_agua) * min(k, len(self.fogo_ativo)) > LIMITE_OTIMO:
+            k = CANDIDATOS_GULOSO
+
+        # A matriz é montada antes de qualquer deslocamento, então as buscas
+        # podem ser feitas em paralelo sem mudar o resultado
+        planejador = self._obter_planejador()
+        if planejador is None:
+            alvos, custos = matriz_custos(
+                self.caminhos, origens, lambda n: self.estado.obter(n, 'fogo'), k
             )
+        else:
+            planejador.atualizar_focos(self.fogo_ativo)
+            candidatos, fixados = planejador.mais_proximos(origens, k)
+            self._contar_buscas(len(origens), fixados)
+            alvos, custos = montar_matriz(candidatos)
+
+        if vazios is not None and alvos:
+            # As consultas ao índice contam na fase 'recarga'
+            with (contextlib.nullcontext() if self.instrumentacao is None
+                  else self.instrumentacao.fase('recarga')):
+                distancias = self.indice_recarga.distancia
+                retorno = np.array([distancias.get(alvo, np.inf) for alvo in alvos],
+                                   dtype=np.float64)
+
+            # Foco sem recarga alcançável: o retorno vira uma penalidade
+            # maior que o custo de qualquer atribuição com recarga, então
+            # a última carga só é gasta nele quando não há alternativa
+            sem_recarga = ~np.isfinite(retorno)
+            if sem_recarga.any():
+                retorno[sem_recarga] = (
+                    custos[np.isfinite(custos)].sum() +
+                    len(com_agua) * retorno[~sem_recarga].sum() + 1
+                )
+            custos[vazios] += retorno
+
+        pares = sorted(atribuir(custos))
+        if planejador is not None:
+            caminhos, fixados = planejador.caminhos([
+                (com_agua[linha][1], alvos[coluna]) for linha, coluna in pares
+            ])
+            self._contar_buscas(len(pares), fixados)
+
+        for i, (linha, coluna) in enumerate(pares):
+            brigadista, posicao, agua = com_agua[linha]
+            if planejador is None:
+                caminho = self.caminhos.caminho(posicao, alvos[coluna])
+            else:
+                caminho = caminhos[i]
 
-            # Se encontrou um foco mais próximo
-            if foco_mais_proximo:
+            # Move o brigadista ao longo do caminho e atualiza sua posição e água restante
+            self.brigadistas[brigadista] = self.deslocar_brigadista(
+                brigadista, caminho, agua
+            )
 
-                # Obtém o caminho mais curto até o foco
-                caminho = self.caminho_mais_curto(posicao_atual, foco_mais_proximo)
 
-                # Se o caminho foi encontrado com sucesso
-                if caminho:
+    def _obter_planejador(self):
+        """
+        Planejador das buscas em paralelo, criado no primeiro turno; None
+        no modo sequencial. Pesos alterados por 'alterar_peso' chegam a ele
+        como aviso; só é refeito após alterações sem aviso (ex.:
+        'invalidar_caminhos').
+        """
+        if not self.processos_despacho or self.processos_despacho <= 1:
+            return None
+        if self._planejador is not None and self._planejador.versao != self.estado.versao:
+            self._planejador.fechar()
+            self._planejador = None
+        if self._planejador is None:
+            # Os processos só são carregados quando o modo paralelo é usado
+            from FirePrevention.planejamento import PlanejadorDespacho
+
+            self._planejador = PlanejadorDespacho(self, self.processos_despacho)
+        return self._planejador
+
+
+    def _planejar(self, brigadistas):
+        """
+        Busca em paralelo o foco mais próximo de cada brigadista.
+
+        Parâmetros:
+        - brigadistas (list[tuple]): pares (brigadista, posição).
+
+        Retorna:
+        - dict: (foco, distância, caminho) de cada brigadista.
+        """
+        planejador = self._planejador
+        planejador.atualizar_focos(self.fogo_ativo)
+        resultados, fixados = planejador.mais_proximos(
+            [posicao for _, posicao in brigadistas]
+        )
+        self._contar_buscas(len(brigadistas), fixados)
+        return {
+            brigadista: resultado
+            for (brigadista, _), resultado in zip(brigadistas, resultados)
+        }
+
+
+    def _contar_buscas(self, buscas, fixados):
+        """Soma aos contadores as buscas feitas pelos processos."""
+        self.caminhos.buscas += buscas
+        self.caminhos.vertices_fixados += fixados
+
+
+    def fechar(self):
+        """
+        Encerra os processos do despacho em paralelo, se houver. A
+        simulação continua utilizável e os recria no próximo turno.
+        """
+        if self._planejador is not None:
+            self._planejador.fechar()
+            self._planejador = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *excecao):
+        self.fechar()
 
-                    # Move o brigadista ao longo do caminho e atualiza sua posição e água restante
-                    self.brigadistas[brigadista] = self.deslocar_brigadista(
-                        brigadista, caminho, agua
-                    )
 
-                        
     def encontrar_caminho_ate_agua_ou_posto(self, origem):
         """
         Encontra o caminho mais curto de 'origem' até um ponto com água 
@@ -333,42 +914,14 @@ class FirePreventionandFight:
         até o ponto de reabastecimento. Retorna None se não houver caminho.
         """
 
-        # Filtra os nós do grafo que têm água ou são postos de brigadistas
-        destinos_possiveis = [
-            n for n in self.grafo.nodes
-            if self.grafo.nodes[n].get('agua') or
-            self.grafo.nodes[n].get('posto_brigadista')
-        ]
-
-        # Inicializa o menor caminho como None e a menor distância como infinita
-        menor_caminho = None
-        menor_distancia = float('inf')
-
-        # Itera sobre todos os destinos possíveis para encontrar o mais próximo
-        for destino in destinos_possiveis:
-            try:
-                # Calcula o caminho mais curto entre a origem e o destino atual
-                caminho = nx.shortest_path(
-                    self.grafo, origem, destino, weight='weight'
-                )
-
-                # Calcula o comprimento (peso total) do caminho encontrado
-                distancia = nx.shortest_path_length(
-                    self.grafo, origem, destino, weight='weight'
-                )
-
-                # Atualiza o menor caminho e distância, se esse for melhor
-                if distancia < menor_distancia:
-                    menor_distancia = distancia
-                    menor_caminho = caminho
-
-            # Ignora o destino se não houver caminho até ele
-            except nx.NetworkXNoPath:
-                continue
+        # O caminho sai pronto do índice de reabastecimento, seguindo os
+        # ponteiros a partir da origem
+        if self.instrumentacao is None:
+            return self.indice_recarga.caminho(origem)
 
+        with self.instrumentacao.fase('recarga'):
+            return self.indice_recarga.caminho(origem)
 
-            return menor_caminho
-        
     def deslocar_brigadista(self, brigadista, caminho, agua):
         """
         Move o brigadista ao longo do caminho indicado ou até um ponto
@@ -385,7 +938,6 @@ class FirePreventionandFight:
 
         # Se não houver caminho, retorna a posição atual do brigadista
         if not caminho:
-            print(f"🧭 Caminho percorrido por {brigadista}: nenhum (sem deslocamento)")
             return self.brigadistas[brigadista]
 
         # Define a posição inicial, destino final e o trecho intermediário
@@ -395,51 +947,127 @@ class FirePreventionandFight:
 
         # Se o brigadista está sem água, tenta encontrar ponto de reabastecimento
         if agua <= 0:
-            print(f"🚫 Brigadista {brigadista} está sem água. "
-                f"Buscando ponto de reabastecimento...")
-
             caminho_ate_agua = self.encontrar_caminho_ate_agua_ou_posto(posicao_atual)
 
             if caminho_ate_agua:
                 nova_posicao = caminho_ate_agua[-1]
-                print(f"💧 Brigadista {brigadista} indo reabastecer em "
-                    f"{nova_posicao} via {caminho_ate_agua}")
-                print(f"🧭 Caminho percorrido por {brigadista}: {caminho_ate_agua}")
+                self._eventos.append(Reabastecimento(
+                    brigadista, nova_posicao, caminho_ate_agua
+                ))
                 return (nova_posicao, self.capacidade_caminhoes)
 
-            print(f"🛑 Brigadista {brigadista} não encontrou ponto de água.")
-            print(f"🧭 Caminho percorrido por {brigadista}: nenhum (sem deslocamento)")
+            self._eventos.append(SemReabastecimento(brigadista))
             return self.brigadistas[brigadista]
 
-        # Mensagem de deslocamento do brigadista com água suficiente
-        print(f"🚒 Brigadista {brigadista} ({agua}L) saindo de {posicao_atual} "
-            f"para apagar fogo em {destino}. Passou por {caminho_percorrido}")
-        print(f"🧭 Caminho percorrido por {brigadista}: {caminho}")
+        # Registra o deslocamento do brigadista com água suficiente
+        self._eventos.append(Deslocamento(brigadista, caminho, agua))
 
         # Verifica se há ponto de água no caminho e reabastece se encontrar
-        for v in caminho_percorrido:
-            if self.grafo.nodes[v]['agua']:
-                print(f"💧 Brigadista {brigadista} reabastecendo em {v}.")
+        for i, v in enumerate(caminho_percorrido, start=1):
+            if self.estado.obter(v, 'agua'):
+                self._eventos.append(Reabastecimento(
+                    brigadista, v, caminho[:i + 1]
+                ))
                 return (v, self.capacidade_caminhoes)
 
         # Se o destino tiver fogo, apaga e consome água
-        if self.grafo.nodes[destino]['fogo']:
+        if self.estado.obter(destino, 'fogo'):
             self.apagar_fogo(destino)
             agua -= self.consumo_por_fogo
-            print(f"🔥 Fogo apagado em {destino} pelo brigadista {brigadista} "
-                f"(Restante: {agua}L).")
+            self._eventos.append(FogoApagado(brigadista, destino, agua))
             return (destino, agua)
 
         # Se não há fogo no destino, apenas atualiza a posição
         return (destino, agua)
 
 
-    def simular(self, inicio_fogo):
+    def simular_iter(self, inicio_fogo, max_passos=None):
+        """
+        Executa a simulação sem exibir nada, produzindo um registro por passo.
+
+        Parâmetros:
+        - inicio_fogo (int): vértice onde o fogo começa.
+        - max_passos (int | None): limite opcional de passos após o inicial.
+
+        Retorna:
+        - Gerador de 'Passo', cada um com o número do estado, os novos focos,
+        os eventos dos brigadistas e a quantidade de focos ativos restantes.
+        O primeiro passo (estado 1) contém apenas a ignição inicial.
+        """
+
+        # Inicia o fogo no vértice especificado
+        if self.instrumentacao is None:
+            self.iniciar_fogo(inicio_fogo)
+        else:
+            self.instrumentacao.passo = 1
+            with self.instrumentacao.fase('ignicao'):
+                self.iniciar_fogo(inicio_fogo)
+        yield Passo(1, list(self.fogo_ativo), [], len(self.fogo_ativo))
+
+        yield from self.retomar_iter(1, max_passos)
+
+
+    def retomar_iter(self, passo, max_passos=None):
+        """
+        Continua a simulação a partir do estado atual, como se 'passo' já
+        tivesse sido produzido por 'simular_iter' (ex.: após restaurar um
+        checkpoint com 'persistencia.carregar_checkpoint').
+
+        Parâmetros:
+        - passo (int): número do último passo já executado.
+        - max_passos (int | None): limite opcional de passos a executar.
+
+        Retorna:
+        - Gerador de 'Passo', começando pelo estado 'passo + 1'. Termina
+        quando o fogo se extingue, quando 'max_passos' é atingido ou quando
+        um passo não muda mais nada: nenhum brigadista alcança um foco (ou
+        consegue reabastecer) e o fogo não tem mais para onde se espalhar.
+        Nesse caso o fogo continua ativo e o último passo traz um evento
+        'FogoIncontrolavel' com os focos restantes.
+        """
+        estado = passo + 1
+        ultimo = None if max_passos is None else passo + max_passos
+        # Loop enquanto ainda houver fogo ativo no grafo
+        while self.fogo_ativo and (ultimo is None or estado <= ultimo):
+            instrumentacao = self.instrumentacao
+
+            # Propaga o fogo e envia os brigadistas para combatê-lo
+            if instrumentacao is None:
+                novos_focos = self.propagar_fogo()
+                eventos = self.enviar_brigadistas()
+            else:
+                instrumentacao.passo = estado
+                with instrumentacao.fase('propagacao'):
+                    novos_focos = self.propagar_fogo()
+                with instrumentacao.fase('despacho'):
+                    eventos = self.enviar_brigadistas()
+
+            # Nenhum brigadista agiu e o fogo não pode mais crescer: os passos
+            # seguintes seriam todos iguais, então a simulação termina aqui
+            estagnado = (
+                self.fogo_ativo and
+                not any(not isinstance(e, SemReabastecimento) for e in eventos) and
+                not self.modelo_propagacao.pode_propagar(self)
+            )
+            if estagnado:
+                eventos.append(FogoIncontrolavel(sorted(self.fogo_ativo)))
+
+            yield Passo(estado, novos_focos, eventos, len(self.fogo_ativo))
+            if estagnado:
+                break
+            estado += 1
+
+
+    def simular(self, inicio_fogo, consumidores=None):
         """
         Inicia e executa a simulação da propagação e combate ao fogo.
 
-        Parâmetro:
+        Parâmetros:
         - inicio_fogo (int): vértice onde o fogo começa.
+        - consumidores (list[callable] | None): funções chamadas com cada
+        'Passo' produzido por 'simular_iter'. Por padrão, o passo é impresso
+        em texto ('RegistroTexto') e o grafo é desenhado. Consumidores com
+        método 'finalizar' são avisados ao fim da simulação.
 
         Lógica:
         - Inicia o fogo no vértice especificado.
@@ -451,50 +1079,49 @@ class FirePreventionandFight:
         - Ao final, imprime os vértices onde os fogos foram apagados.
         """
 
-        # Inicia o fogo no vértice especificado
-        self.iniciar_fogo(inicio_fogo)
+        if consumidores is None:
+            consumidores = [
+                RegistroTexto(),
+                lambda passo: self.desenhar_grafo(passo.estado)
+            ]
 
-        # Exibe o estado inicial do grafo
-        print("🖼️ Exibindo estado inicial do grafo...")
-        self.desenhar_grafo(1)
+        for passo in self.simular_iter(inicio_fogo):
+            for consumidor in consumidores:
+                consumidor(passo)
 
-        estado = 2
-        # Loop enquanto ainda houver fogo ativo no grafo
-        while self.fogo_ativo:
-            # Propaga o fogo para os vértices vizinhos
-            self.propagar_fogo()
-            print('estado:',estado)
-            # Exibe os vértices com fogo antes da atuação dos brigadistas
-            print(
-                "🔥 Fogo ativo nos vértices antes da ação dos brigadistas: "
-                f"{sorted(self.fogo_ativo)}"
-            )
+        for consumidor in consumidores:
+            if hasattr(consumidor, 'finalizar'):
+                consumidor.finalizar()
 
-            # Envia os brigadistas para combater o fogo
-            self.enviar_brigadistas()
 
-            # Exibe os vértices com fogo após a atuação dos brigadistas
-            print(
-                "🔥 Fogo ativo nos vértices após a ação dos brigadistas: "
-                f"{sorted(self.fogo_ativo)}"
-            )
+    def simular_eventos(self, inicio_fogo, tempo_max=None, **opcoes):
+        """
+        Executa a simulação por eventos discretos, em que os pesos das
+        arestas são durações: o fogo avança aresta a aresta no tempo e cada
+        brigadista só age ao chegar ao destino (ver 'AgendadorEventos').
 
-            # Atualiza a visualização do grafo com o estado atual
-            self.desenhar_grafo(estado)
-            estado += 1
+        Deve ser chamada em uma simulação recém-criada, no lugar de
+        'simular_iter'.
 
-        # Exibe os vértices nos quais o fogo foi apagado ao final da simulação
-        print(
-            f"✅ Simulação concluída. Fogos apagados: "
-            f"{sorted(self.fogos_apagados)}"
-        )
-            
-    def desenhar_grafo(self, estado):
+        Parâmetros:
+        - inicio_fogo (int): vértice onde o fogo começa.
+        - tempo_max (float | None): instante limite da simulação.
+        - opcoes: velocidade_fogo, velocidade_brigadistas, tempo_extincao e
+        tempo_reabastecimento de 'AgendadorEventos'.
+
+        Retorna:
+        - Gerador de 'Ocorrencia' (instante e evento), em ordem de tempo.
+        """
+        return AgendadorEventos(self, **opcoes).executar(inicio_fogo, tempo_max)
+
+
+    def desenhar_grafo(self, estado, pausa=1.5):
         """
         Exibe graficamente o estado atual do grafo durante a simulação.
 
-        Parâmetro:
+        Parâmetros:
         - estado (int): número que representa o estágio atual da simulação.
+        - pausa (float): tempo, em segundos, que o gráfico fica em exibição.
 
         Lógica:
         - Define a cor dos nós com base no seu estado:
@@ -503,60 +1130,30 @@ class FirePreventionandFight:
             * 🔵 Azul: possui água ou é posto de brigadista
             * ⚫ Cinza: já foi queimado
             * 🟢 Verde: está seguro
-        - Desenha o grafo com seus nós, arestas e pesos.
-        - Exibe o gráfico por 1.5 segundos.
-        """
-
-        # Limpa o gráfico anterior
-        plt.clf()
-
-        node_colors = []
-        # Percorre todos os nós do grafo para determinar sua cor com base no estado
-        for n in self.grafo.nodes:
-            if self.grafo.nodes[n]['fogo']:
-                # 🔴 Nó em chamas
-                node_colors.append('red')
-            elif any(self.brigadistas[b][0] == n for b in self.brigadistas):
-                # 🟡 Brigadista presente neste nó
-                node_colors.append('yellow')
-            elif (self.grafo.nodes[n]['agua'] or
-                self.grafo.nodes[n]['posto_brigadista']):
-                # 🔵 Ponto com água ou posto de brigadistas
-                node_colors.append('blue')
-            elif self.grafo.nodes[n]['queimado']:
-                # ⚫ Nó já queimado
-                node_colors.append('gray')
-            else:
-                # 🟢 Nó seguro
-                node_colors.append('green')
-
-        # Define o tamanho da figura do gráfico
-        plt.figure(figsize=(10, 8))
-
-        # Desenha os nós e as arestas do grafo com rótulos
-        nx.draw(
-            self.grafo,
-            self.pos,
-            with_labels=True,
-            node_size=500,
-            node_color=node_colors,
-            font_size=10
-        )
+        - Na primeira chamada desenha o grafo com seus nós, arestas e pesos;
+        nas seguintes reaproveita a mesma figura e só atualiza as cores.
+        - Exibe o gráfico por 'pausa' segundos.
 
-        # Obtém os rótulos das arestas (os pesos de cada conexão)
-        edge_labels = nx.get_edge_attributes(self.grafo, 'weight')
+        Para gravar a simulação em vídeo, GIF ou PNGs sem exibi-la, use
+        'GravadorAnimacao' como consumidor de 'simular'.
+        """
 
-        # Desenha os rótulos das arestas (pesos) no grafo
-        nx.draw_networkx_edge_labels(
-            self.grafo,
-            self.pos,
-            edge_labels=edge_labels,
-            font_size=9
-        )
+        if self.instrumentacao is None:
+            self._exibir(estado, pausa)
+            return
+
+        with self.instrumentacao.fase('desenho', estado):
+            self._exibir(estado, pausa)
+
+
+    def _exibir(self, estado, pausa):
+        """Exibe o estado no renderizador, criando-o na primeira chamada."""
+
+        # A figura e os artistas são criados uma única vez; o matplotlib só
+        # é carregado aqui, para que simulações sem desenho não paguem por ele
+        if self._renderizador is None:
+            from FirePrevention.renderizador import Renderizador
 
-        # Título indicando o estado atual da simulação
-        plt.title(f"Estado Atual do Grafo [estado {estado}]")
+            self._renderizador = Renderizador(self)
 
-        # Atualiza e exibe o gráfico, pausando por 1.5 segundos para visualização
-        plt.draw()
-        plt.pause(1.5)
+        self._renderizador.exibir(estado, pausa)
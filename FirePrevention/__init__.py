@@ -1,2 +1 @@
 from FirePrevention.FirePrevention import FirePreventionandFight
-print('import FirePreventionandFight ✔')
\ No newline at end of file
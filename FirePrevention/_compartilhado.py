@@ -0,0 +1,133 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from FirePrevention.estado import EstadoCompacto
+
+
+# Estado global de cada processo trabalhador de 'executar_lote' e de
+# 'otimizar_posicionamento', preenchido pelo inicializador
+TRABALHADOR = {}
+
+
+def compartilhar_estado(estado):
+    """
+    Coloca a topologia e os atributos iniciais de 'estado' em memória
+    compartilhada.
+
+    Retorna:
+    - tuple: os blocos de memória (a liberar pelo chamador) e a descrição
+    da topologia usada por 'inicializar_trabalhador'.
+    """
+    arrays = {
+        'indptr': estado.indptr,
+        'indices': estado.indices,
+        'pesos': estado.pesos,
+        **estado.flags
+    }
+    memorias = []
+    topologia = {'ids': estado.ids, 'arrays': {}}
+    try:
+        for chave, array in arrays.items():
+            memoria, descritor = compartilhar_array(array)
+            memorias.append(memoria)
+            topologia['arrays'][chave] = descritor
+    except BaseException:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+        raise
+    return memorias, topologia
+
+
+def compartilhar_array(array):
+    """
+    Copia 'array' para um bloco de memória compartilhada.
+
+    Retorna:
+    - tuple: o bloco (que deve ser mantido vivo e liberado pelo chamador) e
+    um descritor (nome, forma, dtype) para anexá-lo em outro processo.
+    """
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    copia = np.ndarray(array.shape, dtype=array.dtype, buffer=memoria.buf)
+    copia[...] = array
+    return memoria, (memoria.name, array.shape, array.dtype.str)
+
+
+def anexar_array(descritor):
+    """
+    Anexa um array compartilhado por 'compartilhar_array', somente leitura.
+
+    Retorna:
+    - tuple: o bloco de memória (a ser mantido vivo) e o array.
+    """
+    nome, forma, tipo = descritor
+    # Os trabalhadores compartilham o rastreador de recursos do processo
+    # principal, que é quem remove o bloco ao final do lote
+    memoria = shared_memory.SharedMemory(name=nome)
+    array = np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+    array.flags.writeable = False
+    return memoria, array
+
+
+def inicializar_trabalhador(topologia, gerador, parametros, max_passos):
+    """
+    Prepara o processo trabalhador: anexa a topologia compartilhada uma única
+    vez e guarda os parâmetros comuns a todas as tarefas.
+    """
+    TRABALHADOR.update(
+        estado=None, gerador=gerador,
+        parametros=parametros, max_passos=max_passos
+    )
+
+    if topologia is not None:
+        memorias = []
+        arrays = {}
+        for chave, descritor in topologia['arrays'].items():
+            memoria, arrays[chave] = anexar_array(descritor)
+            memorias.append(memoria)
+
+        estado = EstadoCompacto(
+            arrays.pop('indptr'), arrays.pop('indices'), arrays.pop('pesos'),
+            topologia['ids']
+        )
+
+        # Os atributos iniciais ficam só para leitura; 'clonar' os copia
+        estado.flags = arrays
+        TRABALHADOR['memorias'] = memorias
+        TRABALHADOR['estado'] = estado
+
+
+def compactar(simulacao):
+    """
+    Estado compacto da simulação: o próprio estado no backend 'compacto'
+    ou uma cópia em CSR do grafo networkx, que preserva a ordem dos
+    vértices e dos vizinhos de cada vértice (e, com ela, os desempates
+    entre caminhos de mesmo comprimento).
+    """
+    if isinstance(simulacao.estado, EstadoCompacto):
+        return simulacao.estado
+
+    adjacencia = simulacao.grafo.adj
+    nos = list(adjacencia)
+    num_vertices = len(nos)
+    ids = None if nos == list(range(num_vertices)) else nos
+    indice = (lambda no: no) if ids is None else {
+        no: i for i, no in enumerate(nos)
+    }.__getitem__
+
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(
+        np.fromiter((len(vizinhos) for vizinhos in adjacencia.values()),
+                    dtype=np.int64, count=num_vertices),
+        out=indptr[1:]
+    )
+    indices = np.fromiter(
+        (indice(v) for vizinhos in adjacencia.values() for v in vizinhos),
+        dtype=np.int64, count=indptr[-1]
+    )
+    pesos = np.array([
+        atributos.get('weight', 1)
+        for vizinhos in adjacencia.values() for atributos in vizinhos.values()
+    ])
+    return EstadoCompacto(indptr, indices, pesos, ids)
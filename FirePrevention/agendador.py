@@ -0,0 +1,264 @@
+import heapq
+import math
+from itertools import count
+
+from FirePrevention.caminhos import dijkstra_ate_alvo
+from FirePrevention.eventos import (
+    Deslocamento,
+    FogoApagado,
+    Ignicao,
+    Ocorrencia,
+    Reabastecimento,
+    SemReabastecimento,
+)
+
+
+# Tipos de evento; em instantes iguais são tratados nesta ordem
+IGNICAO, CHEGADA, EXTINCAO, REABASTECIMENTO, PARTIDA = range(5)
+
+
+class AgendadorEventos:
+    """
+    Simulação por eventos discretos, com uma fila de prioridade ordenada
+    pelo instante de cada evento.
+
+    Os pesos das arestas viram durações: o fogo leva 'peso / velocidade_fogo'
+    para atravessar uma aresta e um brigadista leva 'distância /
+    velocidade_brigadistas' para percorrer um caminho. Cada ação agenda a
+    seguinte, então o custo depende do número de eventos, e não de turnos
+    vezes brigadistas: um brigadista em viagem não é tocado até chegar, e
+    um sem focos livres fica ocioso até que uma ignição o acorde (cada
+    ignição acorda apenas o ocioso mais próximo do novo foco).
+
+    Eventos tratados:
+    - ignição: o fogo atinge um vértice e agenda a ignição dos vizinhos;
+    é cancelada se o vértice de origem for apagado antes.
+    - partida: o brigadista escolhe o foco livre mais próximo (ou o ponto
+    de reabastecimento, se estiver sem água) e parte rumo a ele.
+    - chegada: o brigadista alcança o destino.
+    - extinção: o foco é apagado após 'tempo_extincao'.
+    - reabastecimento: o caminhão é recarregado após 'tempo_reabastecimento'.
+
+    Cada foco é reservado pelo brigadista que parte rumo a ele, para que
+    dois brigadistas não persigam o mesmo foco.
+    """
+
+    def __init__(
+            self,
+            simulacao,
+            velocidade_fogo=1.0,
+            velocidade_brigadistas=1.0,
+            tempo_extincao=0,
+            tempo_reabastecimento=0
+        ):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação recém-criada, cujo
+        estado e brigadistas serão usados.
+        - velocidade_fogo (float): peso de aresta percorrido pelo fogo por
+        unidade de tempo.
+        - velocidade_brigadistas (float): peso de aresta percorrido pelos
+        brigadistas por unidade de tempo.
+        - tempo_extincao (float): duração do combate a um foco.
+        - tempo_reabastecimento (float): duração de uma recarga de água.
+        """
+        self.simulacao = simulacao
+        self.velocidade_fogo = velocidade_fogo
+        self.velocidade_brigadistas = velocidade_brigadistas
+        self.tempo_extincao = tempo_extincao
+        self.tempo_reabastecimento = tempo_reabastecimento
+
+        # Instante atual e número de eventos já tratados
+        self.tempo = 0
+        self.eventos_processados = 0
+
+        # Fila de eventos (instante, tipo, contador, dados); o contador
+        # desempata eventos iguais mantendo a ordem de agendamento
+        self._fila = []
+        self._contador = count()
+
+        # Brigadistas sem foco livre, agrupados pela posição em que esperam
+        self._ociosos = {}
+
+        # Focos já escolhidos como alvo por algum brigadista
+        self._reservados = set()
+
+        self._tratadores = {
+            IGNICAO: self._ignicao,
+            CHEGADA: self._chegada,
+            EXTINCAO: self._extincao,
+            REABASTECIMENTO: self._reabastecimento,
+            PARTIDA: self._partida,
+        }
+
+    def __len__(self):
+        return len(self._fila)
+
+    def agendar(self, tempo, tipo, *dados):
+        """Coloca um evento do 'tipo' dado na fila para o instante 'tempo'."""
+        heapq.heappush(self._fila, (tempo, tipo, next(self._contador), dados))
+
+    def executar(self, inicio_fogo, tempo_max=None):
+        """
+        Inicia o fogo e trata os eventos em ordem de tempo até a fila
+        esvaziar ou o próximo evento passar de 'tempo_max'.
+
+        Parâmetros:
+        - inicio_fogo (int): vértice onde o fogo começa.
+        - tempo_max (float | None): instante limite da simulação.
+
+        Retorna:
+        - Gerador de 'Ocorrencia', com o instante e o evento observável
+        ('Ignicao', 'Deslocamento', 'FogoApagado', 'Reabastecimento' ou
+        'SemReabastecimento').
+        """
+        self.agendar(self.tempo, IGNICAO, inicio_fogo, None)
+        for brigadista in self.simulacao.brigadistas:
+            self.agendar(self.tempo, PARTIDA, brigadista)
+
+        fila = self._fila
+        while fila:
+            if tempo_max is not None and fila[0][0] > tempo_max:
+                return
+
+            tempo, tipo, _, dados = heapq.heappop(fila)
+            self.tempo = tempo
+            self.eventos_processados += 1
+
+            evento = self._tratadores[tipo](*dados)
+            if evento is not None:
+                yield Ocorrencia(tempo, evento)
+
+    def _inflamavel(self, vertice):
+        """Diz se o fogo pode atingir 'vertice' (mesmas regras de propagar_fogo)."""
+        estado = self.simulacao.estado
+        return not (estado.obter(vertice, 'fogo') or
+                    estado.obter(vertice, 'agua') or
+                    estado.obter(vertice, 'queimado') or
+                    estado.obter(vertice, 'posto_brigadista'))
+
+    def _ignicao(self, vertice, origem):
+        simulacao = self.simulacao
+        estado = simulacao.estado
+
+        # O fogo não chega se a origem foi apagada durante a travessia
+        if origem is not None and not estado.obter(origem, 'fogo'):
+            return None
+        if not self._inflamavel(vertice):
+            return None
+
+        estado.definir(vertice, 'fogo', True)
+        simulacao.fogo_ativo.add(vertice)
+
+        # Arestas fechadas (peso infinito) não levam o fogo a lugar algum
+        for vizinho, peso in estado.vizinhos_ponderados(vertice):
+            if math.isfinite(peso) and self._inflamavel(vizinho):
+                self.agendar(
+                    self.tempo + peso / self.velocidade_fogo,
+                    IGNICAO, vizinho, vertice
+                )
+
+        if self._ociosos:
+            self._acordar(vertice)
+
+        return Ignicao(vertice, origem)
+
+    def _acordar(self, foco):
+        """
+        Agenda a partida do brigadista ocioso mais próximo do novo 'foco',
+        buscando a partir do foco até a primeira posição com ociosos.
+
+        A busca é avulsa, fora do cache de caminhos: cada ignição parte de
+        um vértice diferente, e guardar essas árvores tiraria do cache as
+        dos brigadistas, que são reaproveitadas a cada partida.
+        """
+        ociosos = self._ociosos
+        posicao, _, _ = dijkstra_ate_alvo(
+            self.simulacao.estado.vizinhos_ponderados, foco, lambda n: n in ociosos
+        )
+        if posicao is None:
+            return
+
+        brigadistas = ociosos[posicao]
+        self.agendar(self.tempo, PARTIDA, brigadistas.pop())
+        if not brigadistas:
+            del ociosos[posicao]
+
+    def _partida(self, brigadista):
+        simulacao = self.simulacao
+        estado = simulacao.estado
+        posicao, agua = simulacao.brigadistas[brigadista]
+
+        # Sem água: segue para o ponto de reabastecimento mais próximo
+        if agua < simulacao.consumo_por_fogo:
+            caminho = simulacao.encontrar_caminho_ate_agua_ou_posto(posicao)
+            if caminho is None:
+                # Fica parado de vez, pois nenhum ponto é alcançável
+                return SemReabastecimento(brigadista)
+            distancia = simulacao.indice_recarga.distancia[posicao]
+            self.agendar(
+                self.tempo + distancia / self.velocidade_brigadistas,
+                CHEGADA, brigadista, caminho, None
+            )
+            return None
+
+        # Com água: segue para o foco livre mais próximo. Os reservados são
+        # sempre focos ativos, então se todos estão reservados nem há busca
+        reservados = self._reservados
+        alvo = None
+        if len(simulacao.fogo_ativo) > len(reservados):
+            alvo, distancia, caminho = simulacao.caminhos.mais_proximo(
+                posicao,
+                lambda n: n not in reservados and estado.obter(n, 'fogo')
+            )
+        if alvo is None:
+            self._ociosos.setdefault(posicao, []).append(brigadista)
+            return None
+
+        reservados.add(alvo)
+        self.agendar(
+            self.tempo + distancia / self.velocidade_brigadistas,
+            CHEGADA, brigadista, caminho, alvo
+        )
+        return Deslocamento(brigadista, caminho, agua)
+
+    def _chegada(self, brigadista, caminho, alvo):
+        simulacao = self.simulacao
+        _, agua = simulacao.brigadistas[brigadista]
+        simulacao.brigadistas[brigadista] = (caminho[-1], agua)
+
+        if alvo is None:
+            self.agendar(
+                self.tempo + self.tempo_reabastecimento,
+                REABASTECIMENTO, brigadista, caminho
+            )
+        elif simulacao.estado.obter(alvo, 'fogo'):
+            self.agendar(
+                self.tempo + self.tempo_extincao, EXTINCAO, brigadista, alvo
+            )
+        else:
+            # O foco já não existe: libera a reserva e escolhe outro
+            self._reservados.discard(alvo)
+            self.agendar(self.tempo, PARTIDA, brigadista)
+        return None
+
+    def _extincao(self, brigadista, alvo):
+        simulacao = self.simulacao
+        self._reservados.discard(alvo)
+        self.agendar(self.tempo, PARTIDA, brigadista)
+
+        if not simulacao.estado.obter(alvo, 'fogo'):
+            return None
+
+        posicao, agua = simulacao.brigadistas[brigadista]
+        simulacao.apagar_fogo(alvo)
+        agua -= simulacao.consumo_por_fogo
+        simulacao.brigadistas[brigadista] = (posicao, agua)
+        return FogoApagado(brigadista, alvo, agua)
+
+    def _reabastecimento(self, brigadista, caminho):
+        simulacao = self.simulacao
+        ponto = caminho[-1]
+        simulacao.brigadistas[brigadista] = (ponto, simulacao.capacidade_caminhoes)
+        self.agendar(self.tempo, PARTIDA, brigadista)
+        return Reabastecimento(brigadista, ponto, caminho)
@@ -0,0 +1,346 @@
+import heapq
+from collections import OrderedDict
+from itertools import count
+
+
+class ArvoreCaminhos:
+    """
+    Árvore de caminhos mínimos a partir de uma origem, calculada sob demanda.
+
+    O Dijkstra é interrompido assim que a consulta é respondida e retomado
+    do ponto em que parou na consulta seguinte, então a árvore cresce apenas
+    o necessário e nenhuma parte é calculada duas vezes.
+    """
+
+    def __init__(self, vizinhos, origem):
+        """
+        Parâmetros:
+        - vizinhos (callable): função que recebe um vértice e devolve pares
+        (vizinho, peso) das arestas incidentes.
+        - origem (int): vértice de partida.
+        """
+        self.origem = origem
+        self._vizinhos = vizinhos
+
+        # Distâncias provisórias e predecessores dos vértices alcançados
+        self.distancia = {origem: 0}
+        self.predecessor = {origem: None}
+
+        # Vértices já fixados, na ordem crescente de distância
+        self.fixados = []
+        self._fixados = set()
+
+        # O contador desempata entradas de mesma distância sem comparar vértices
+        self._contador = count()
+        self._heap = [(0, next(self._contador), origem)]
+
+    def __len__(self):
+        return len(self.distancia)
+
+    def expandir(self):
+        """
+        Fixa o próximo vértice mais próximo da origem.
+
+        Retorna:
+        - int | None: o vértice fixado, ou None se a árvore estiver completa.
+        """
+        heap = self._heap
+        while heap:
+            distancia, _, atual = heapq.heappop(heap)
+            if atual in self._fixados:
+                continue
+            self._fixados.add(atual)
+            self.fixados.append(atual)
+
+            for vizinho, peso in self._vizinhos(atual):
+                nova_distancia = distancia + peso
+                if (vizinho not in self._fixados and
+                        nova_distancia < self.distancia.get(vizinho, float('inf'))):
+                    self.distancia[vizinho] = nova_distancia
+                    self.predecessor[vizinho] = atual
+                    heapq.heappush(
+                        heap, (nova_distancia, next(self._contador), vizinho)
+                    )
+            return atual
+        return None
+
+    def mais_proximo(self, eh_alvo):
+        """
+        Encontra o vértice mais próximo da origem que satisfaz 'eh_alvo'.
+
+        Primeiro percorre os vértices já fixados, em ordem de distância, e só
+        expande a árvore se nenhum deles servir.
+
+        Retorna:
+        - tuple(int, float, list[int]): alvo, distância e caminho, ou
+        (None, None, None) se nenhum alvo for alcançável.
+        """
+        for vertice in self.fixados:
+            if eh_alvo(vertice):
+                return vertice, self.distancia[vertice], self.caminho(vertice)
+
+        while True:
+            vertice = self.expandir()
+            if vertice is None:
+                return None, None, None
+            if eh_alvo(vertice):
+                return vertice, self.distancia[vertice], self.caminho(vertice)
+
+    def mais_proximos(self, eh_alvo, k):
+        """
+        Encontra os 'k' vértices mais próximos da origem que satisfazem
+        'eh_alvo', expandindo a árvore apenas o necessário.
+
+        Retorna:
+        - list[tuple(int, float)]: pares (alvo, distância) em ordem crescente
+        de distância; menos de 'k' se não houver alvos suficientes.
+        """
+        encontrados = []
+        for vertice in self.fixados:
+            if len(encontrados) == k:
+                break
+            if eh_alvo(vertice):
+                encontrados.append((vertice, self.distancia[vertice]))
+
+        while len(encontrados) < k:
+            vertice = self.expandir()
+            if vertice is None:
+                break
+            if eh_alvo(vertice):
+                encontrados.append((vertice, self.distancia[vertice]))
+        return encontrados
+
+    def mais_barato(self, custos):
+        """
+        Encontra o vértice de 'custos' que minimiza a distância da origem
+        mais o custo do vértice (ex.: o peso de uma aresta a atravessar
+        depois dele). A árvore só é expandida até que nenhum vértice mais
+        distante possa sair mais barato.
+
+        Retorna:
+        - tuple(int, float, list[int]): alvo, custo total e caminho até o
+        alvo, ou (None, None, None) se nenhum alvo for alcançável.
+        """
+        melhor, menor = None, float('inf')
+        posicao = 0
+        while posicao < len(self.fixados) or self.expandir() is not None:
+            vertice = self.fixados[posicao]
+            posicao += 1
+            distancia = self.distancia[vertice]
+            if distancia >= menor:
+                break
+            if vertice in custos and distancia + custos[vertice] < menor:
+                melhor, menor = vertice, distancia + custos[vertice]
+
+        if melhor is None:
+            return None, None, None
+        return melhor, menor, self.caminho(melhor)
+
+    def distancia_ate(self, destino):
+        """
+        Retorna a distância mínima até 'destino', ou None se não houver
+        caminho.
+        """
+        while destino not in self._fixados:
+            if self.expandir() is None:
+                return None
+        return self.distancia[destino]
+
+    def afetada(self, u, v, peso_antigo, peso):
+        """
+        Diz se a parte já calculada da árvore deixa de valer quando o peso
+        da aresta (u, v) passa de 'peso_antigo' para 'peso'.
+
+        Um aumento só importa se a aresta liga um vértice ao seu
+        predecessor; as demais arestas já relaxadas perderam a disputa e
+        continuam perdendo. Uma redução só importa se um extremo já foi
+        fixado (a aresta já foi relaxada com o peso antigo) e o novo peso
+        encurta a distância do outro. Arestas ainda não relaxadas serão
+        lidas com o peso novo quando a árvore crescer.
+        """
+        if peso > peso_antigo:
+            return self.predecessor.get(v) == u or self.predecessor.get(u) == v
+
+        infinito = float('inf')
+        for a, b in ((u, v), (v, u)):
+            if a in self._fixados and self.distancia[a] + peso < self.distancia.get(b, infinito):
+                return True
+        return False
+
+    def caminho(self, destino):
+        """
+        Retorna o caminho mínimo da origem até 'destino' (incluindo os dois
+        extremos), ou None se não houver caminho.
+        """
+        if self.distancia_ate(destino) is None:
+            return None
+
+        caminho = []
+        atual = destino
+        while atual is not None:
+            caminho.append(atual)
+            atual = self.predecessor[atual]
+        caminho.reverse()
+        return caminho
+
+
+def dijkstra_ate_alvo(vizinhos, origem, eh_alvo):
+    """
+    Executa o algoritmo de Dijkstra a partir de 'origem' e para assim que
+    o primeiro vértice que satisfaz 'eh_alvo' é fixado.
+
+    Parâmetros:
+    - vizinhos (callable): função que recebe um vértice e devolve pares
+    (vizinho, peso) das arestas incidentes.
+    - origem (int): vértice de partida.
+    - eh_alvo (callable): função que recebe um vértice e diz se ele é um
+    destino aceitável.
+
+    Retorna:
+    - tuple(int, float, list[int]): alvo mais próximo, distância até ele e
+    o caminho (incluindo origem e alvo), ou (None, None, None) se nenhum
+    alvo for alcançável.
+    """
+    return ArvoreCaminhos(vizinhos, origem).mais_proximo(eh_alvo)
+
+
+class CacheCaminhos:
+    """
+    Cache de árvores de caminhos mínimos indexadas pelo vértice de origem,
+    com descarte do menos usado recentemente (LRU).
+
+    Como os pesos não mudam durante uma simulação, a árvore de uma origem
+    continua válida entre turnos. Quando um peso é alterado e o cache é
+    avisado por 'aresta_alterada', só as árvores afetadas são descartadas;
+    qualquer outra mudança de versão do estado esvazia o cache inteiro.
+    """
+
+    def __init__(self, estado, limite_nos=1_000_000):
+        """
+        Parâmetros:
+        - estado (EstadoGrafo | EstadoCompacto): estado da simulação, que
+        fornece a vizinhança e a versão das arestas.
+        - limite_nos (int): número máximo de vértices guardados somando
+        todas as árvores; ao ultrapassá-lo, as árvores menos usadas são
+        descartadas.
+        """
+        self.estado = estado
+        self.limite_nos = limite_nos
+
+        self._arvores = OrderedDict()
+        self._versao = estado.versao
+        self.nos_armazenados = 0
+
+        # Contadores para dimensionar o cache
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+        # Árvores descartadas por alterações de peso
+        self.invalidadas = 0
+
+        # Buscas atendidas e vértices fixados por elas, para a instrumentação
+        self.buscas = 0
+        self.vertices_fixados = 0
+
+    def __len__(self):
+        return len(self._arvores)
+
+    def arvore(self, origem):
+        """
+        Retorna a árvore de caminhos de 'origem', criando-a se necessário.
+        """
+        if self._versao != self.estado.versao:
+            self.invalidar()
+
+        arvore = self._arvores.get(origem)
+        if arvore is None:
+            self.falhas += 1
+            arvore = ArvoreCaminhos(self.estado.vizinhos_ponderados, origem)
+            self._arvores[origem] = arvore
+            self.nos_armazenados += len(arvore)
+        else:
+            self.acertos += 1
+            self._arvores.move_to_end(origem)
+        return arvore
+
+    def mais_proximo(self, origem, eh_alvo):
+        """Versão com cache de 'ArvoreCaminhos.mais_proximo'."""
+        return self._consultar(origem, lambda arvore: arvore.mais_proximo(eh_alvo))
+
+    def mais_proximos(self, origem, eh_alvo, k):
+        """Versão com cache de 'ArvoreCaminhos.mais_proximos'."""
+        return self._consultar(origem, lambda arvore: arvore.mais_proximos(eh_alvo, k))
+
+    def mais_barato(self, origem, custos):
+        """Versão com cache de 'ArvoreCaminhos.mais_barato'."""
+        return self._consultar(origem, lambda arvore: arvore.mais_barato(custos))
+
+    def caminho(self, origem, destino):
+        """Versão com cache de 'ArvoreCaminhos.caminho'."""
+        return self._consultar(origem, lambda arvore: arvore.caminho(destino))
+
+    def distancia(self, origem, destino):
+        """Versão com cache de 'ArvoreCaminhos.distancia_ate'."""
+        return self._consultar(origem, lambda arvore: arvore.distancia_ate(destino))
+
+    def aresta_alterada(self, u, v, peso_antigo, peso):
+        """
+        Descarta apenas as árvores afetadas pela alteração do peso da
+        aresta (u, v), chamada logo depois de o peso mudar no estado. Se o
+        cache já estava desatualizado antes dela, é esvaziado.
+        """
+        if self._versao + 1 != self.estado.versao:
+            self.invalidar()
+            return
+        self._versao = self.estado.versao
+
+        for origem, arvore in list(self._arvores.items()):
+            if arvore.afetada(u, v, peso_antigo, peso):
+                del self._arvores[origem]
+                self.nos_armazenados -= len(arvore)
+                self.invalidadas += 1
+
+    def invalidar(self):
+        """Descarta todas as árvores (por exemplo, após mudar o grafo)."""
+        self._arvores.clear()
+        self.nos_armazenados = 0
+        self._versao = self.estado.versao
+
+    def estatisticas(self):
+        """
+        Retorna um dicionário com acertos, falhas, descartes, árvores
+        invalidadas por alterações de peso, taxa de acerto, número de
+        árvores e de vértices armazenados.
+        """
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'descartes': self.descartes,
+            'invalidadas': self.invalidadas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'arvores': len(self._arvores),
+            'nos_armazenados': self.nos_armazenados,
+        }
+
+    def _consultar(self, origem, consulta):
+        """
+        Executa 'consulta' na árvore de 'origem', contabiliza quanto ela
+        cresceu e descarta árvores antigas se o limite for ultrapassado.
+        """
+        arvore = self.arvore(origem)
+        tamanho = len(arvore)
+        fixados = len(arvore.fixados)
+        resultado = consulta(arvore)
+        self.nos_armazenados += len(arvore) - tamanho
+        self.buscas += 1
+        self.vertices_fixados += len(arvore.fixados) - fixados
+
+        # Descarta as árvores menos usadas, preservando a que acabou de ser usada
+        while self.nos_armazenados > self.limite_nos and len(self._arvores) > 1:
+            _, antiga = self._arvores.popitem(last=False)
+            self.nos_armazenados -= len(antiga)
+            self.descartes += 1
+
+        return resultado
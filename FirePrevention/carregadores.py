@@ -0,0 +1,433 @@
+import os
+import tempfile
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+
+from FirePrevention.estado import EstadoCompacto
+
+
+# Delimitador de cada extensão de arquivo de texto (None = espaços)
+DELIMITADORES = {'.csv': ',', '.tsv': '\t', '.txt': None, '.edges': None}
+
+# Linhas (ou arestas) processadas por bloco
+TAMANHO_BLOCO = 1_000_000
+
+
+def carregar_arestas(
+        fonte,
+        delimitador=None,
+        colunas=(0, 1, 2),
+        cabecalho=0,
+        peso_padrao=1,
+        num_vertices=None,
+        tamanho_bloco=TAMANHO_BLOCO
+    ):
+    """
+    Carrega uma lista de arestas não direcionadas diretamente em um
+    'EstadoCompacto', em blocos vetorizados, sem criar um grafo networkx.
+
+    A adjacência CSR é montada em passagens sobre os blocos: primeiro os
+    vértices, depois os graus e por fim o preenchimento de cada vizinhança
+    na posição certa. Assim nunca se ordena nem se duplica a lista inteira
+    de arestas; arquivos '.npy' são lidos por mapeamento em memória e
+    ficam no disco até serem copiados bloco a bloco. Arquivos de texto são
+    convertidos uma única vez, bloco a bloco, para um arquivo binário
+    temporário, que é mapeado da mesma forma nas passagens.
+
+    Laços (u, u) são descartados e arestas repetidas viram uma só, com o
+    menor dos pesos (o único que um caminho mínimo usaria).
+
+    Parâmetros:
+    - fonte (str | np.ndarray): arquivo '.csv', '.tsv', '.txt'/'.edges'
+    (separado por espaços) ou '.npy', ou um array (E, 2) ou (E, 3) já
+    carregado ou mapeado ('np.load(..., mmap_mode="r")').
+    - delimitador (str | None): separador dos arquivos de texto; por padrão
+    é deduzido da extensão.
+    - colunas (tuple): colunas de origem, destino e peso (texto ou array);
+    com apenas duas colunas todas as arestas recebem 'peso_padrao'.
+    - cabecalho (int): linhas iniciais ignoradas nos arquivos de texto.
+    - peso_padrao (float): peso das arestas sem coluna de peso.
+    - num_vertices (int | None): quando informado, os vértices são os
+    inteiros 0..num_vertices-1, inclusive os isolados, que não aparecem
+    em nenhuma aresta.
+    - tamanho_bloco (int): arestas por bloco.
+
+    Os vértices devem ser inteiros. Sem 'num_vertices', se os que aparecem
+    nas arestas forem exatamente 0..n-1 são usados como índices; caso
+    contrário são renumerados em ordem crescente e os originais ficam em
+    'estado.ids'.
+
+    Retorna:
+    - EstadoCompacto: estado com a topologia carregada e nenhum atributo
+    marcado.
+    """
+    with _abrir_blocos(fonte, delimitador, colunas, cabecalho,
+                       peso_padrao, tamanho_bloco) as blocos:
+        indptr, indices, pesos, ids = _montar_csr(blocos, num_vertices)
+    indptr, indices, pesos = _remover_repetidas(indptr, indices, pesos, tamanho_bloco)
+    return EstadoCompacto(indptr, indices, pesos, ids)
+
+
+def _montar_csr(blocos, num_vertices):
+    """
+    Monta a adjacência CSR simétrica a partir dos blocos de arestas, nas
+    três passagens descritas em 'carregar_arestas'.
+
+    Retorna:
+    - tuple: (indptr, indices, pesos, ids), com ids None quando os vértices
+    já são os índices.
+    """
+    # Passagem 1: número de arestas, maior vértice e tipo dos pesos
+    num_arestas = 0
+    maior = -1
+    tipo_peso = None
+    for origens, destinos, pesos in blocos():
+        if len(origens):
+            maior = max(maior, int(origens.max()), int(destinos.max()))
+            if min(origens.min(), destinos.min()) < 0:
+                raise ValueError("Os vértices devem ser inteiros não negativos.")
+        num_arestas += len(origens)
+        tipo_peso = pesos.dtype if tipo_peso is None else np.result_type(tipo_peso, pesos)
+
+    if num_vertices is not None:
+        if maior >= num_vertices:
+            raise ValueError(f"Vértice {maior} fora do intervalo 0..{num_vertices - 1}.")
+        vertices = mapa = None
+    else:
+        vertices, mapa = _vertices_distintos(blocos, maior, num_arestas)
+        num_vertices = len(vertices)
+    identidade = vertices is None or num_vertices == maior + 1
+    if identidade:
+        indexar = lambda nos: nos
+    elif mapa is not None:
+        indexar = mapa.__getitem__
+    else:
+        indexar = lambda nos: np.searchsorted(vertices, nos)
+
+    # Passagem 2: grau de cada vértice, que define os ponteiros CSR
+    graus = np.zeros(num_vertices, dtype=np.int64)
+    for origens, destinos, _ in blocos():
+        graus += np.bincount(indexar(origens), minlength=num_vertices)
+        graus += np.bincount(indexar(destinos), minlength=num_vertices)
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(graus, out=indptr[1:])
+    del graus
+
+    # Passagem 3: cada bloco é escrito na próxima posição livre de cada
+    # vizinhança, com as arestas nos dois sentidos
+    tipo_indice = np.int32 if num_vertices < 2**31 else np.int64
+    indices = np.empty(2 * num_arestas, dtype=tipo_indice)
+    pesos_csr = np.empty(2 * num_arestas, dtype=tipo_peso or np.int64)
+    cursor = indptr[:-1].copy()
+    for origens, destinos, pesos in blocos():
+        origens = indexar(origens)
+        destinos = indexar(destinos)
+        _espalhar(
+            cursor, indices, pesos_csr,
+            np.concatenate([origens, destinos]),
+            np.concatenate([destinos, origens]),
+            np.concatenate([pesos, pesos])
+        )
+
+    return indptr, indices, pesos_csr, None if identidade else vertices.tolist()
+
+
+def _remover_repetidas(indptr, indices, pesos, tamanho_bloco):
+    """
+    Remove os laços e as entradas repetidas de cada vizinhança do CSR, no
+    próprio array, percorrendo as linhas em blocos de cerca de
+    'tamanho_bloco' entradas. Fica a primeira ocorrência de cada vizinho,
+    com o menor peso entre as repetidas, então a ordem dos vizinhos não
+    muda.
+
+    Retorna:
+    - tuple: (indptr, indices, pesos) sem repetições.
+    """
+    num_vertices = len(indptr) - 1
+    novo_indptr = np.zeros_like(indptr)
+    escrita = 0
+    inicio = 0
+    while inicio < num_vertices:
+        # Linhas [inicio, fim) com cerca de 'tamanho_bloco' entradas
+        fim = int(np.searchsorted(indptr, indptr[inicio] + tamanho_bloco, side='right')) - 1
+        fim = min(max(fim, inicio + 1), num_vertices)
+        a, b = indptr[inicio], indptr[fim]
+        linhas = np.repeat(np.arange(inicio, fim), np.diff(indptr[inicio:fim + 1]))
+        colunas = indices[a:b]
+        valores = pesos[a:b]
+
+        # Grupos de entradas iguais (linha, coluna); a ordenação estável
+        # deixa a primeira ocorrência no início de cada grupo
+        ordem = np.lexsort((colunas, linhas))
+        novo_grupo = np.ones(len(ordem), dtype=bool)
+        novo_grupo[1:] = ((linhas[ordem[1:]] != linhas[ordem[:-1]]) |
+                          (colunas[ordem[1:]] != colunas[ordem[:-1]]))
+        primeiras = np.flatnonzero(novo_grupo)
+
+        manter = np.zeros(len(ordem), dtype=bool)
+        manter[ordem[primeiras]] = True
+        manter &= colunas != linhas
+        menores = valores.copy()
+        if len(ordem):
+            menores[ordem[primeiras]] = np.minimum.reduceat(valores[ordem], primeiras)
+
+        # Compacta para trás: a escrita nunca passa da leitura
+        mantidas = int(manter.sum())
+        indices[escrita:escrita + mantidas] = colunas[manter]
+        pesos[escrita:escrita + mantidas] = menores[manter]
+        novo_indptr[inicio + 1:fim + 1] = escrita + np.cumsum(
+            np.bincount(linhas[manter] - inicio, minlength=fim - inicio)
+        )
+        escrita += mantidas
+        inicio = fim
+
+    if escrita == len(indices):
+        return indptr, indices, pesos
+    # Cópias, para liberar a memória das entradas removidas
+    return novo_indptr, indices[:escrita].copy(), pesos[:escrita].copy()
+
+
+def _vertices_distintos(blocos, maior, num_arestas):
+    """
+    Encontra os vértices que aparecem nas arestas.
+
+    Com identificadores densos usa um mapa de presença e devolve também o
+    array que leva cada identificador ao seu índice; com identificadores
+    esparsos (ex.: códigos de um mapa real), une os distintos de cada bloco
+    e o índice é obtido por busca binária.
+
+    Retorna:
+    - tuple(np.ndarray, np.ndarray | None): vértices em ordem crescente e
+    o mapa identificador -> índice, quando houver.
+    """
+    if maior < 16 * num_arestas + 1024:
+        presente = np.zeros(maior + 1, dtype=bool)
+        for origens, destinos, _ in blocos():
+            presente[origens] = True
+            presente[destinos] = True
+        mapa = np.cumsum(presente, dtype=np.int64) - 1
+        return np.flatnonzero(presente), mapa
+
+    vertices = np.empty(0, dtype=np.int64)
+    for origens, destinos, _ in blocos():
+        vertices = np.union1d(vertices, np.concatenate([origens, destinos]))
+    return vertices, None
+
+
+def carregar_vertices(fonte, coluna=0, cabecalho=0, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê uma lista de vértices (pontos de água, postos de brigadistas, ...)
+    de um arquivo de texto com um vértice por linha, de um '.npy' ou de um
+    array.
+
+    Parâmetros:
+    - fonte (str | np.ndarray): arquivo ou array de vértices.
+    - coluna (int): coluna com o vértice nos arquivos de texto.
+    - cabecalho (int): linhas iniciais ignoradas nos arquivos de texto.
+    - tamanho_bloco (int): linhas lidas por vez.
+
+    Retorna:
+    - np.ndarray: os vértices, como inteiros.
+    """
+    if not isinstance(fonte, str):
+        return np.asarray(fonte, dtype=np.int64).ravel()
+    if os.path.splitext(fonte)[1].lower() == '.npy':
+        return np.load(fonte).astype(np.int64).ravel()
+
+    delimitador = DELIMITADORES.get(os.path.splitext(fonte)[1].lower())
+    partes = []
+    with open(fonte, encoding='utf-8') as arquivo:
+        for bloco in _ler_texto(arquivo, delimitador, (coluna,), [np.int64],
+                                cabecalho, tamanho_bloco):
+            partes.append(bloco[0])
+    return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+
+
+def marcar_vertices(estado, vertices, atributo, valor=True):
+    """
+    Marca 'atributo' em vários vértices de um 'EstadoCompacto' de uma vez.
+
+    Parâmetros:
+    - estado (EstadoCompacto): estado a alterar.
+    - vertices (iterable): vértices originais.
+    - atributo (str): 'fogo', 'agua', 'queimado' ou 'posto_brigadista'.
+    - valor (bool): valor atribuído.
+    """
+    if estado.ids is None:
+        indices = np.asarray(vertices, dtype=np.int64)
+    else:
+        indices = np.fromiter(
+            (estado.indice(no) for no in np.asarray(vertices).tolist()),
+            dtype=np.int64
+        )
+    estado.flags[atributo][indices] = valor
+
+
+def carregar_simulacao(arestas, pontos_agua=None, postos_brigadistas=None, **parametros):
+    """
+    Monta uma simulação no backend compacto a partir de arquivos: a lista
+    de arestas e, opcionalmente, as listas de pontos de água e de postos.
+
+    Parâmetros:
+    - arestas (str | np.ndarray): ver 'carregar_arestas'.
+    - pontos_agua, postos_brigadistas (str | np.ndarray | None): ver
+    'carregar_vertices'.
+    - parametros: demais argumentos de FirePreventionandFight, exceto
+    'grafo' e 'backend'.
+
+    Retorna:
+    - FirePreventionandFight: simulação pronta para iniciar.
+    """
+    # Importado aqui porque o módulo principal não depende dos carregadores
+    from FirePrevention.FirePrevention import FirePreventionandFight
+
+    estado = carregar_arestas(arestas)
+    if pontos_agua is not None:
+        marcar_vertices(estado, carregar_vertices(pontos_agua), 'agua')
+    if postos_brigadistas is not None:
+        postos_brigadistas = carregar_vertices(postos_brigadistas).tolist()
+
+    return FirePreventionandFight(
+        grafo=estado, postos_brigadistas=postos_brigadistas,
+        backend='compacto', **parametros
+    )
+
+
+@contextmanager
+def _abrir_blocos(fonte, delimitador, colunas, cabecalho, peso_padrao, tamanho_bloco):
+    """
+    Prepara a leitura da fonte de arestas. Arquivos de texto são lidos uma
+    vez e gravados em um arquivo binário temporário, removido ao sair do
+    'with'.
+
+    Retorna:
+    - Gerenciador de contexto com uma função que, a cada chamada, devolve
+    um novo iterador de blocos (origens, destinos, pesos), permitindo
+    várias passagens.
+    """
+    if isinstance(fonte, str) and os.path.splitext(fonte)[1].lower() == '.npy':
+        fonte = np.load(fonte, mmap_mode='r')
+
+    if not isinstance(fonte, str):
+        # Arrays (inclusive mapeados em memória) são fatiados sem cópia extra
+        dados = fonte
+        if dados.ndim != 2 or dados.shape[1] < 2:
+            raise ValueError("O array de arestas deve ter formato (E, 2) ou (E, 3).")
+        com_peso = len(colunas) > 2 and dados.shape[1] > colunas[2]
+
+        def blocos():
+            for inicio in range(0, len(dados), tamanho_bloco):
+                bloco = dados[inicio:inicio + tamanho_bloco]
+                origens = np.asarray(bloco[:, colunas[0]], dtype=np.int64)
+                destinos = np.asarray(bloco[:, colunas[1]], dtype=np.int64)
+                pesos = (np.array(bloco[:, colunas[2]]) if com_peso else
+                         np.full(len(bloco), peso_padrao))
+                yield origens, destinos, pesos
+        yield blocos
+        return
+
+    # Texto: convertido bloco a bloco para registros binários em disco,
+    # mapeados em memória nas passagens seguintes
+    if delimitador is None:
+        delimitador = DELIMITADORES.get(os.path.splitext(fonte)[1].lower())
+    tipos = [np.int64, np.int64, np.float64][:len(colunas)]
+    with tempfile.TemporaryFile() as temporario:
+        tipo = None
+        with open(fonte, encoding='utf-8') as arquivo:
+            for bloco in _ler_texto(arquivo, delimitador, colunas, tipos,
+                                    cabecalho, tamanho_bloco):
+                pesos = bloco[2] if len(bloco) > 2 else np.full(len(bloco[0]), peso_padrao)
+                if tipo is None:
+                    tipo = np.dtype([('origem', np.int64), ('destino', np.int64),
+                                     ('peso', pesos.dtype)])
+                registros = np.empty(len(pesos), dtype=tipo)
+                registros['origem'], registros['destino'], registros['peso'] = (
+                    bloco[0], bloco[1], pesos
+                )
+                registros.tofile(temporario)
+        temporario.flush()
+
+        dados = (np.empty(0, dtype=[('origem', np.int64), ('destino', np.int64),
+                                    ('peso', np.float64)])
+                 if tipo is None else np.memmap(temporario, dtype=tipo, mode='r'))
+
+        def blocos():
+            for inicio in range(0, len(dados), tamanho_bloco):
+                bloco = dados[inicio:inicio + tamanho_bloco]
+                yield (np.array(bloco['origem']), np.array(bloco['destino']),
+                       np.array(bloco['peso']))
+        try:
+            yield blocos
+        finally:
+            # O mapeamento precisa ser desfeito antes de fechar o arquivo
+            del dados
+
+
+def _ler_texto(arquivo, delimitador, colunas, tipos, cabecalho, tamanho_bloco):
+    """
+    Lê um arquivo de texto aberto em blocos de até 'tamanho_bloco' linhas
+    com o leitor vetorizado do NumPy. Linhas vazias e comentários ('#')
+    são ignorados, e colunas pedidas além das existentes na primeira linha
+    de dados são descartadas (ex.: peso em um arquivo de duas colunas).
+
+    Retorna:
+    - Gerador de tuplas de arrays, uma por coluna lida.
+    """
+    for _ in range(cabecalho):
+        arquivo.readline()
+
+    # Conta os campos da primeira linha de dados sem consumi-la
+    inicio = arquivo.tell()
+    linha = arquivo.readline()
+    while linha and (not linha.strip() or linha.lstrip().startswith('#')):
+        linha = arquivo.readline()
+    if not linha:
+        return
+    campos = len(linha.split(delimitador))
+    arquivo.seek(inicio)
+
+    colunas = [coluna for coluna in colunas if coluna < campos]
+    tipo = np.dtype([(f'c{i}', t) for i, t in enumerate(tipos[:len(colunas)])])
+
+    while True:
+        with warnings.catch_warnings():
+            # Aviso do NumPy sobre linhas sem dados não contarem em max_rows
+            # e sobre blocos vazios no fim do arquivo
+            warnings.filterwarnings('ignore', message='Input line', category=UserWarning)
+            warnings.filterwarnings('ignore', message='loadtxt: input contained no data',
+                                    category=UserWarning)
+            bloco = np.loadtxt(
+                arquivo, dtype=tipo, delimiter=delimitador, usecols=colunas,
+                max_rows=tamanho_bloco, ndmin=1
+            )
+        if len(bloco) == 0:
+            return
+        yield tuple(bloco[nome] for nome in tipo.names)
+        if len(bloco) < tamanho_bloco:
+            return
+
+
+def _espalhar(cursor, indices, pesos, linhas, colunas, valores):
+    """
+    Escreve as entradas (linha, coluna, valor) de um bloco nas próximas
+    posições livres de cada linha do CSR, avançando 'cursor'.
+    """
+    if len(linhas) == 0:
+        return
+    ordem = np.argsort(linhas, kind='stable')
+    linhas = linhas[ordem]
+
+    # Posição de cada entrada dentro do seu grupo de mesma linha
+    novo_grupo = np.empty(len(linhas), dtype=bool)
+    novo_grupo[0] = True
+    np.not_equal(linhas[1:], linhas[:-1], out=novo_grupo[1:])
+    inicios = np.flatnonzero(novo_grupo)
+    tamanhos = np.diff(np.append(inicios, len(linhas)))
+    deslocamento = np.arange(len(linhas)) - np.repeat(inicios, tamanhos)
+
+    posicoes = cursor[linhas] + deslocamento
+    indices[posicoes] = colunas[ordem]
+    pesos[posicoes] = valores[ordem]
+    cursor[linhas[inicios]] += tamanhos
@@ -0,0 +1,194 @@
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # o scipy é opcional; sem ele usa-se o húngaro abaixo
+    linear_sum_assignment = None
+
+
+# Modos aceitos por FirePreventionandFight(modo_despacho=...)
+MODOS_DESPACHO = ('guloso', 'otimo', 'capacidade')
+
+# Tamanho máximo da matriz de custos resolvida de forma ótima; acima dele
+# a atribuição é feita pela aproximação gulosa. O húngaro em NumPy é
+# O(n³) e já leva ~0,3 s numa matriz 200 x 200 de distâncias, então sem o
+# scipy o limite é bem menor
+LIMITE_OTIMO = 250_000 if linear_sum_assignment is not None else 40_000
+
+# Focos candidatos por brigadista na aproximação gulosa
+CANDIDATOS_GULOSO = 16
+
+
+def matriz_custos(caminhos, origens, eh_alvo, k):
+    """
+    Monta a matriz de distâncias brigadista x foco a partir de uma árvore de
+    caminhos mínimos por origem, considerando os 'k' focos mais próximos de
+    cada origem (a própria origem não conta como alvo).
+
+    Com 'k' igual ao número de origens, nenhuma atribuição ótima é perdida:
+    se um brigadista ficasse com um foco fora dos seus 'k' mais próximos,
+    algum desses estaria livre e seria no máximo tão distante quanto ele.
+
+    Parâmetros:
+    - caminhos (CacheCaminhos): cache das árvores de caminhos.
+    - origens (list[int]): posição de cada brigadista (uma linha cada).
+    - eh_alvo (callable): diz se um vértice é um foco.
+    - k (int): focos candidatos por origem.
+
+    Retorna:
+    - tuple(list[int], np.ndarray): focos (uma coluna cada) e matriz de
+    custos, com infinito onde o foco não é candidato da origem.
+    """
+    return montar_matriz([
+        caminhos.mais_proximos(
+            origem, lambda n, origem=origem: n != origem and eh_alvo(n), k
+        )
+        for origem in origens
+    ])
+
+
+def montar_matriz(candidatos):
+    """
+    Monta a matriz de custos a partir dos focos candidatos de cada origem,
+    já buscados (por 'matriz_custos' ou pelo planejamento em paralelo).
+
+    Parâmetros:
+    - candidatos (list[list[tuple]]): pares (foco, distância) de cada
+    origem, em ordem crescente de distância.
+
+    Retorna:
+    - tuple(list[int], np.ndarray): como 'matriz_custos'.
+    """
+    colunas = {}
+    for proximos in candidatos:
+        for alvo, _ in proximos:
+            colunas.setdefault(alvo, len(colunas))
+
+    custos = np.full((len(candidatos), len(colunas)), np.inf)
+    for linha, proximos in enumerate(candidatos):
+        for alvo, distancia in proximos:
+            custos[linha, colunas[alvo]] = distancia
+    return list(colunas), custos
+
+
+def atribuir(custos, limite=LIMITE_OTIMO):
+    """
+    Resolve a atribuição de custo mínimo entre linhas (brigadistas) e
+    colunas (focos), cada um usado no máximo uma vez.
+
+    Matrizes com até 'limite' entradas são resolvidas de forma ótima (pelo
+    'linear_sum_assignment' do scipy, se instalado, ou pelo método húngaro);
+    as maiores, pela aproximação gulosa.
+
+    Retorna:
+    - list[tuple(int, int)]: pares (linha, coluna) atribuídos, apenas com
+    custo finito.
+    """
+    if custos.size == 0:
+        return []
+    if custos.size > limite:
+        return _atribuicao_gulosa(custos)
+
+    # Entradas infinitas viram um custo maior que qualquer atribuição real
+    finitos = np.isfinite(custos)
+    proibido = custos[finitos].sum() + 1 if finitos.any() else 1
+    matriz = np.where(finitos, custos, proibido)
+
+    if linear_sum_assignment is not None:
+        linhas, colunas = linear_sum_assignment(matriz)
+    else:
+        linhas, colunas = _hungaro(matriz)
+
+    return [
+        (int(linha), int(coluna))
+        for linha, coluna in zip(linhas, colunas)
+        if finitos[linha, coluna]
+    ]
+
+
+def _hungaro(custos):
+    """
+    Método húngaro com potenciais (caminhos aumentantes mínimos), em
+    O(n²m) para n linhas e m colunas, vetorizado sobre as colunas.
+
+    Retorna:
+    - tuple(np.ndarray, np.ndarray): linhas e colunas atribuídas.
+    """
+    transposta = custos.shape[0] > custos.shape[1]
+    if transposta:
+        custos = custos.T
+    n, m = custos.shape
+
+    # Potenciais de linhas e colunas; a coluna 0 é uma sentinela e
+    # 'dono[j]' é a linha (a partir de 1) atribuída à coluna j
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    dono = np.zeros(m + 1, dtype=np.int64)
+    anterior = np.zeros(m + 1, dtype=np.int64)
+
+    for linha in range(1, n + 1):
+        dono[0] = linha
+        coluna = 0
+        minimo = np.full(m + 1, np.inf)
+        usada = np.zeros(m + 1, dtype=bool)
+
+        # Cresce a árvore alternante até achar uma coluna livre
+        while True:
+            usada[coluna] = True
+            atual = dono[coluna]
+            livres = ~usada
+            livres[0] = False
+
+            reduzido = np.full(m + 1, np.inf)
+            reduzido[1:] = custos[atual - 1] - u[atual] - v[1:]
+            melhora = livres & (reduzido < minimo)
+            minimo[melhora] = reduzido[melhora]
+            anterior[melhora] = coluna
+
+            candidatos = np.where(livres, minimo, np.inf)
+            proxima = int(np.argmin(candidatos))
+            delta = candidatos[proxima]
+
+            u[dono[usada]] += delta
+            v[usada] -= delta
+            minimo[livres] -= delta
+
+            coluna = proxima
+            if dono[coluna] == 0:
+                break
+
+        # Inverte o caminho aumentante
+        while coluna:
+            origem = anterior[coluna]
+            dono[coluna] = dono[origem]
+            coluna = origem
+
+    colunas = np.flatnonzero(dono[1:])
+    linhas = dono[1:][colunas] - 1
+    if transposta:
+        linhas, colunas = colunas, linhas
+    ordem = np.argsort(linhas)
+    return linhas[ordem], colunas[ordem]
+
+
+def _atribuicao_gulosa(custos):
+    """
+    Aproximação gulosa: percorre os pares em ordem crescente de custo e
+    aceita cada um cuja linha e coluna ainda estejam livres.
+    """
+    linhas, colunas = np.nonzero(np.isfinite(custos))
+    ordem = np.argsort(custos[linhas, colunas], kind='stable')
+
+    linhas_usadas = set()
+    colunas_usadas = set()
+    pares = []
+    limite = min(custos.shape)
+    for linha, coluna in zip(linhas[ordem].tolist(), colunas[ordem].tolist()):
+        if linha in linhas_usadas or coluna in colunas_usadas:
+            continue
+        linhas_usadas.add(linha)
+        colunas_usadas.add(coluna)
+        pares.append((linha, coluna))
+        if len(pares) == limite:
+            break
+    return pares
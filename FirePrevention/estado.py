@@ -0,0 +1,341 @@
+import copy
+import numbers
+
+import numpy as np
+
+
+# Atributos booleanos que descrevem o estado de cada vértice na simulação
+ATRIBUTOS = ('fogo', 'agua', 'queimado', 'posto_brigadista')
+
+
+def arestas_csr(indptr, fontes):
+    """
+    Posições no CSR de todas as arestas que saem de 'fontes' e, para cada
+    uma, a posição da fonte correspondente em 'fontes', sem laços Python.
+
+    Parâmetros:
+    - indptr (np.ndarray): ponteiros do CSR.
+    - fontes (np.ndarray): índices dos vértices de origem.
+
+    Retorna:
+    - tuple(np.ndarray, np.ndarray): posições das arestas e dono de cada uma.
+    """
+    inicios = indptr[fontes]
+    graus = indptr[fontes + 1] - inicios
+    deslocamento = np.repeat(inicios - np.cumsum(graus) + graus, graus)
+    posicoes = deslocamento + np.arange(graus.sum())
+    return posicoes, np.repeat(np.arange(len(fontes)), graus)
+
+
+class EstadoGrafo:
+    """
+    Estado da simulação guardado nos dicionários de atributos dos nós de um
+    grafo networkx. É o backend padrão e mantém o comportamento original,
+    em que 'grafo.nodes[n]["fogo"]' reflete o estado da simulação.
+    """
+
+    def __init__(self, grafo):
+        """
+        Parâmetros:
+        - grafo (nx.Graph): grafo cujos nós guardarão os atributos.
+        """
+        self.grafo = grafo
+
+        # Incrementada a cada alteração de arestas, para invalidar caches
+        self.versao = 0
+
+        # Para cada nó do grafo, define atributos padrão
+        for i in self.grafo.nodes:
+            for atributo in ATRIBUTOS:
+                self.grafo.nodes[i].setdefault(atributo, False)
+
+    def __len__(self):
+        return self.grafo.number_of_nodes()
+
+    def __contains__(self, no):
+        return no in self.grafo
+
+    def nos(self):
+        """Retorna os vértices do grafo na ordem do networkx."""
+        return self.grafo.nodes
+
+    def obter(self, no, atributo):
+        """Retorna o valor do atributo booleano 'atributo' no vértice 'no'."""
+        return self.grafo.nodes[no][atributo]
+
+    def definir(self, no, atributo, valor=True):
+        """Altera o atributo booleano 'atributo' do vértice 'no'."""
+        self.grafo.nodes[no][atributo] = valor
+
+    def vizinhos(self, no):
+        """Retorna os vizinhos do vértice 'no'."""
+        return self.grafo.neighbors(no)
+
+    def vizinhos_ponderados(self, no):
+        """
+        Retorna os pares (vizinho, peso) das arestas incidentes em 'no',
+        usando peso 1 quando a aresta não tiver o atributo 'weight'.
+        """
+        return (
+            (vizinho, atributos.get('weight', 1))
+            for vizinho, atributos in self.grafo.adj[no].items()
+        )
+
+    def nos_com(self, atributo):
+        """Retorna a lista de vértices em que 'atributo' é verdadeiro."""
+        return [n for n, valor in self.grafo.nodes(data=atributo) if valor]
+
+    def peso(self, u, v):
+        """Retorna o peso da aresta (u, v)."""
+        return self.grafo[u][v].get('weight', 1)
+
+    def alterar_peso(self, u, v, peso):
+        """Altera o peso da aresta (u, v) e incrementa a versão."""
+        self.grafo[u][v]['weight'] = peso
+        self.versao += 1
+
+    def para_networkx(self):
+        """Retorna o grafo networkx que guarda o estado."""
+        return self.grafo
+
+
+class EstadoCompacto:
+    """
+    Estado da simulação em arrays NumPy. Os vértices são mapeados para
+    índices contíguos, os atributos ficam em arrays booleanos e a adjacência
+    em formato CSR (indptr, indices, pesos), com cada aresta não direcionada
+    armazenada nos dois sentidos.
+
+    Quando os vértices já são os inteiros 0..n-1, nenhum dicionário de
+    mapeamento é criado e os índices coincidem com os próprios vértices.
+    """
+
+    def __init__(self, indptr, indices, pesos, ids=None):
+        """
+        Parâmetros:
+        - indptr (np.ndarray): ponteiros de início da vizinhança de cada índice.
+        - indices (np.ndarray): índices dos vizinhos, concatenados.
+        - pesos (np.ndarray): peso de cada entrada de 'indices'.
+        - ids (list | None): vértice original de cada índice; None indica
+        que os vértices são os próprios índices 0..n-1.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.ids = ids
+        self.versao = 0
+        self._indice = (
+            None if ids is None else {no: i for i, no in enumerate(ids)}
+        )
+
+        # Verdadeiro quando os pesos são compartilhados com clones (ou com
+        # outros processos) e precisam ser copiados antes de uma alteração
+        self._pesos_compartilhados = False
+
+        # Um array booleano por atributo, todos inicialmente falsos
+        num_vertices = len(indptr) - 1
+        self.flags = {
+            atributo: np.zeros(num_vertices, dtype=bool)
+            for atributo in ATRIBUTOS
+        }
+
+    @classmethod
+    def de_arestas(cls, origens, destinos, pesos, num_vertices, ids=None):
+        """
+        Constrói o estado a partir de arrays de arestas não direcionadas já
+        expressas em índices 0..num_vertices-1.
+
+        Parâmetros:
+        - origens, destinos (array): extremidades de cada aresta.
+        - pesos (array): peso de cada aresta.
+        - num_vertices (int): número de vértices.
+        - ids (list | None): vértice original de cada índice.
+
+        Retorna:
+        - EstadoCompacto: estado com adjacência CSR simétrica.
+        """
+        origens = np.asarray(origens, dtype=np.int64)
+        destinos = np.asarray(destinos, dtype=np.int64)
+        pesos = np.asarray(pesos)
+
+        # Cada aresta aparece nos dois sentidos na adjacência
+        linhas = np.concatenate([origens, destinos])
+        colunas = np.concatenate([destinos, origens])
+        pesos = np.concatenate([pesos, pesos])
+
+        # Ordena por vértice de origem (estável, preserva a ordem das arestas)
+        ordem = np.argsort(linhas, kind='stable')
+        indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(linhas, minlength=num_vertices), out=indptr[1:])
+
+        # Índices de 32 bits bastam para grafos com até ~2 bilhões de vértices
+        tipo_indice = np.int32 if num_vertices < 2**31 else np.int64
+        return cls(
+            indptr, colunas[ordem].astype(tipo_indice), pesos[ordem], ids
+        )
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """
+        Constrói o estado a partir de um grafo networkx, copiando também os
+        atributos booleanos já presentes nos nós.
+
+        Parâmetros:
+        - grafo (nx.Graph): grafo de origem.
+
+        Retorna:
+        - EstadoCompacto: estado equivalente ao grafo.
+        """
+        nos = list(grafo.nodes)
+        num_vertices = len(nos)
+
+        # Vértices 0..n-1 dispensam o dicionário de mapeamento
+        identidade = all(isinstance(no, numbers.Integral) for no in nos) and (
+            not nos or (min(nos) == 0 and max(nos) == num_vertices - 1)
+        )
+        ids = None if identidade else nos
+        indice = (lambda no: no) if identidade else {
+            no: i for i, no in enumerate(nos)
+        }.__getitem__
+
+        origens = np.empty(grafo.number_of_edges(), dtype=np.int64)
+        destinos = np.empty_like(origens)
+        pesos = []
+        for k, (u, v, peso) in enumerate(grafo.edges(data='weight', default=1)):
+            origens[k] = indice(u)
+            destinos[k] = indice(v)
+            pesos.append(peso)
+
+        estado = cls.de_arestas(origens, destinos, pesos, num_vertices, ids)
+
+        # Copia os atributos booleanos já definidos no grafo
+        for atributo in ATRIBUTOS:
+            for no, valor in grafo.nodes(data=atributo):
+                if valor:
+                    estado.flags[atributo][indice(no)] = True
+
+        return estado
+
+    def clonar(self):
+        """
+        Retorna uma cópia que compartilha a topologia (CSR e mapeamento de
+        vértices) e copia apenas os arrays de atributos, permitindo rodar
+        várias simulações independentes sobre o mesmo grafo.
+        """
+        copia = copy.copy(self)
+        self._pesos_compartilhados = copia._pesos_compartilhados = True
+        copia.flags = {
+            atributo: flag.copy() for atributo, flag in self.flags.items()
+        }
+        return copia
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __contains__(self, no):
+        if self._indice is None:
+            return isinstance(no, numbers.Integral) and 0 <= no < len(self)
+        return no in self._indice
+
+    def indice(self, no):
+        """Retorna o índice contíguo do vértice 'no'."""
+        return no if self._indice is None else self._indice[no]
+
+    def no(self, indice):
+        """Retorna o vértice original correspondente a 'indice'."""
+        return indice if self.ids is None else self.ids[indice]
+
+    def nos(self):
+        """Retorna os vértices na ordem dos índices."""
+        return range(len(self)) if self.ids is None else self.ids
+
+    def obter(self, no, atributo):
+        """Retorna o valor do atributo booleano 'atributo' no vértice 'no'."""
+        return bool(self.flags[atributo][self.indice(no)])
+
+    def definir(self, no, atributo, valor=True):
+        """Altera o atributo booleano 'atributo' do vértice 'no'."""
+        self.flags[atributo][self.indice(no)] = valor
+
+    def vizinhos(self, no):
+        """Retorna os vizinhos do vértice 'no'."""
+        i = self.indice(no)
+        vizinhos = self.indices[self.indptr[i]:self.indptr[i + 1]].tolist()
+        if self.ids is None:
+            return vizinhos
+        return [self.ids[j] for j in vizinhos]
+
+    def vizinhos_ponderados(self, no):
+        """Retorna os pares (vizinho, peso) das arestas incidentes em 'no'."""
+        i = self.indice(no)
+        inicio, fim = self.indptr[i], self.indptr[i + 1]
+        return zip(self.vizinhos(no), self.pesos[inicio:fim].tolist())
+
+    def nos_com(self, atributo):
+        """
+        Retorna os vértices em que 'atributo' é verdadeiro, consultando o
+        array inteiro de uma vez.
+        """
+        indices = np.flatnonzero(self.flags[atributo])
+        if self.ids is None:
+            return indices.tolist()
+        return [self.ids[i] for i in indices]
+
+    def peso(self, u, v):
+        """Retorna o peso da aresta (u, v)."""
+        return self.pesos[self._posicao_aresta(u, v)].item()
+
+    def alterar_peso(self, u, v, peso):
+        """
+        Altera o peso da aresta (u, v), nos dois sentidos do CSR, e
+        incrementa a versão. Pesos compartilhados com clones são copiados
+        antes, para que a alteração valha só para este estado.
+        """
+        if (np.issubdtype(self.pesos.dtype, np.integer) and
+                (not np.isfinite(peso) or float(peso) != int(peso))):
+            self.pesos = self.pesos.astype(np.float64)
+        elif self._pesos_compartilhados or not self.pesos.flags.writeable:
+            self.pesos = self.pesos.copy()
+        self._pesos_compartilhados = False
+
+        for origem, destino in ((u, v), (v, u)):
+            self.pesos[self._posicao_aresta(origem, destino)] = peso
+        self.versao += 1
+
+    def _posicao_aresta(self, u, v):
+        """Retorna a posição da entrada u -> v nos arrays do CSR."""
+        i, j = self.indice(u), self.indice(v)
+        inicio = self.indptr[i]
+        posicoes = np.flatnonzero(self.indices[inicio:self.indptr[i + 1]] == j)
+        if len(posicoes) == 0:
+            raise KeyError(f"A aresta ({u}, {v}) não existe.")
+        return inicio + posicoes[0]
+
+    def para_networkx(self):
+        """
+        Reconstrói um grafo networkx equivalente (usado, por exemplo, para
+        desenhar). Os atributos dos nós refletem o estado atual.
+        """
+        # O networkx é opcional no backend compacto e só é carregado aqui
+        import networkx as nx
+
+        grafo = nx.Graph()
+        for i, no in enumerate(self.nos()):
+            grafo.add_node(
+                no, **{a: bool(self.flags[a][i]) for a in ATRIBUTOS}
+            )
+
+        # Cada aresta aparece duas vezes no CSR; basta adicionar u <= v
+        origens = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        mascara = origens <= self.indices
+        for u, v, peso in zip(origens[mascara].tolist(),
+                              self.indices[mascara].tolist(),
+                              self.pesos[mascara].tolist()):
+            grafo.add_edge(self.no(u), self.no(v), weight=peso)
+
+        return grafo
+
+    def memoria(self):
+        """Retorna o total de bytes ocupados pelos arrays do estado."""
+        return (self.indptr.nbytes + self.indices.nbytes + self.pesos.nbytes +
+                sum(flag.nbytes for flag in self.flags.values()))
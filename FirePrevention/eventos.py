@@ -0,0 +1,131 @@
+from collections import namedtuple
+
+
+# Brigadista com água partiu de caminho[0] rumo ao foco em caminho[-1]
+Deslocamento = namedtuple('Deslocamento', 'brigadista caminho agua')
+
+# Brigadista reabasteceu em 'vertice'; 'caminho' é None quando o envio foi
+# direto ao ponto de reabastecimento mais próximo
+Reabastecimento = namedtuple('Reabastecimento', 'brigadista vertice caminho')
+
+# Brigadista sem água não encontrou nenhum ponto de reabastecimento
+SemReabastecimento = namedtuple('SemReabastecimento', 'brigadista')
+
+# Fogo apagado em 'vertice', restando 'agua' litros ao brigadista
+FogoApagado = namedtuple('FogoApagado', 'brigadista vertice agua')
+
+# Nenhum brigadista alcança os focos restantes e o fogo não pode mais se
+# espalhar; a simulação termina com 'focos' ainda em chamas
+FogoIncontrolavel = namedtuple('FogoIncontrolavel', 'focos')
+
+# Resumo de um passo da simulação
+Passo = namedtuple('Passo', 'estado novos_focos eventos focos_ativos')
+
+# Fogo atingiu 'vertice', vindo de 'origem' (None na ignição inicial)
+Ignicao = namedtuple('Ignicao', 'vertice origem')
+
+# Evento da simulação por eventos discretos, ocorrido no instante 'tempo'
+Ocorrencia = namedtuple('Ocorrencia', 'tempo evento')
+
+# Brigadista com 'agua' litros saiu da sua região por 'caminho' e passou à
+# região 'regiao' em caminho[-1] (simulação por regiões)
+Transferencia = namedtuple('Transferencia', 'brigadista caminho regiao agua')
+
+
+class RegistroTexto:
+    """
+    Consumidor de passos que imprime a simulação no formato textual usado
+    originalmente por 'simular'. Mantém sua própria cópia dos focos ativos,
+    reconstruída a partir dos eventos, para não depender do simulador.
+    """
+
+    def __init__(self):
+        self.fogo_ativo = set()
+        self.fogos_apagados = []
+
+    def __call__(self, passo):
+        """
+        Imprime um passo recebido de 'simular_iter'.
+
+        Parâmetros:
+        - passo (Passo): registro do passo da simulação.
+        """
+        self.fogo_ativo.update(passo.novos_focos)
+
+        # O primeiro passo apenas registra a ignição inicial
+        if passo.estado == 1:
+            print("🖼️ Exibindo estado inicial do grafo...")
+            return
+
+        print('estado:', passo.estado)
+        print(
+            "🔥 Fogo ativo nos vértices antes da ação dos brigadistas: "
+            f"{sorted(self.fogo_ativo)}"
+        )
+
+        for evento in passo.eventos:
+            print(formatar_evento(evento))
+            if isinstance(evento, FogoApagado):
+                self.fogo_ativo.discard(evento.vertice)
+                self.fogos_apagados.append(evento.vertice)
+
+        print(
+            "🔥 Fogo ativo nos vértices após a ação dos brigadistas: "
+            f"{sorted(self.fogo_ativo)}"
+        )
+
+    def finalizar(self):
+        """Imprime o resumo ao final da simulação."""
+        print(
+            f"✅ Simulação concluída. Fogos apagados: "
+            f"{sorted(self.fogos_apagados)}"
+        )
+
+
+def formatar_evento(evento):
+    """
+    Converte um evento da simulação na mensagem textual correspondente.
+
+    Parâmetros:
+    - evento (namedtuple): um dos eventos definidos neste módulo.
+
+    Retorna:
+    - str: mensagem pronta para exibição.
+    """
+    if isinstance(evento, Ignicao):
+        if evento.origem is None:
+            return f"🔥 Fogo iniciado em {evento.vertice}."
+        return f"🔥 Fogo se espalhou de {evento.origem} para {evento.vertice}."
+
+    if isinstance(evento, FogoIncontrolavel):
+        return (f"🚫 Nenhum brigadista alcança os focos restantes "
+                f"{evento.focos}. Simulação encerrada.")
+
+    brigadista = evento.brigadista
+
+    if isinstance(evento, Deslocamento):
+        caminho = evento.caminho
+        return (
+            f"🚒 Brigadista {brigadista} ({evento.agua}L) saindo de "
+            f"{caminho[0]} para apagar fogo em {caminho[-1]}. Passou por "
+            f"{caminho[1:-1]}\n🧭 Caminho percorrido por {brigadista}: {caminho}"
+        )
+
+    if isinstance(evento, Reabastecimento):
+        if evento.caminho is None:
+            return (f"💧 Brigadista {brigadista} sem água indo reabastecer "
+                    f"em {evento.vertice}.")
+        return f"💧 Brigadista {brigadista} reabastecendo em {evento.vertice}."
+
+    if isinstance(evento, Transferencia):
+        return (f"🚒 Brigadista {brigadista} ({evento.agua}L) saindo de "
+                f"{evento.caminho[0]} rumo à região {evento.regiao}, onde "
+                f"entra por {evento.caminho[-1]}.")
+
+    if isinstance(evento, SemReabastecimento):
+        return (f"🛑 Brigadista {brigadista} não encontrou ponto de água.\n"
+                f"🧭 Caminho percorrido por {brigadista}: nenhum "
+                f"(sem deslocamento)")
+
+    return (f"🔥 Fogo apagado em {evento.vertice} pelo brigadista "
+            f"{brigadista} (Restante: {evento.agua}L).")
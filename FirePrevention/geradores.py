@@ -0,0 +1,200 @@
+import math
+
+import numpy as np
+
+
+# Topologias aceitas por 'gerar_arestas'
+TOPOLOGIAS = ('aleatoria', 'conexa', 'grade', 'geometrica')
+
+
+def gerar_arestas(
+        num_vertices,
+        num_arestas=None,
+        topologia='aleatoria',
+        rng=None,
+        peso_min=1,
+        peso_max=10
+    ):
+    """
+    Gera as arestas de um grafo sintético de forma vetorizada, sem laços de
+    rejeição.
+
+    Parâmetros:
+    - num_vertices (int): número de vértices (0..num_vertices-1).
+    - num_arestas (int | None): número de arestas. Ignorado na topologia
+    'grade' e aproximado na 'geometrica'.
+    - topologia (str):
+        * 'aleatoria': pares distintos sorteados uniformemente.
+        * 'conexa': árvore geradora aleatória mais pares extras sorteados,
+        garantindo um grafo conexo.
+        * 'grade': malha retangular, como um mapa dividido em células.
+        * 'geometrica': pontos aleatórios no quadrado unitário ligados aos
+        vizinhos próximos, com peso proporcional à distância.
+    - rng (np.random.Generator | int | None): gerador ou semente.
+    - peso_min, peso_max (int): intervalo dos pesos inteiros das arestas.
+
+    Retorna:
+    - tuple: (origens, destinos, pesos, coordenadas), com as três primeiras
+    sendo arrays com uma entrada por aresta e 'coordenadas' um array
+    (num_vertices, 2) com a posição de cada vértice, ou None quando a
+    topologia não tem geometria.
+    """
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(f"topologia deve ser uma de {TOPOLOGIAS}.")
+
+    rng = np.random.default_rng(rng)
+    total_pares = num_vertices * (num_vertices - 1) // 2
+
+    if topologia == 'grade':
+        return _gerar_grade(num_vertices, rng, peso_min, peso_max)
+
+    if num_arestas is None:
+        raise ValueError("num_arestas é obrigatório para esta topologia.")
+    if num_arestas > total_pares:
+        raise ValueError(
+            f"Um grafo simples com {num_vertices} vértices tem no máximo "
+            f"{total_pares} arestas."
+        )
+
+    if topologia == 'geometrica':
+        return _gerar_geometrica(num_vertices, num_arestas, rng, peso_min, peso_max)
+
+    if topologia == 'conexa':
+        if num_arestas < num_vertices - 1:
+            raise ValueError("Um grafo conexo precisa de ao menos num_vertices - 1 arestas.")
+        arvore = _arvore_aleatoria(num_vertices, rng)
+        extras = num_arestas - len(arvore)
+
+        # Sorteia pares a mais para descartar os que já estão na árvore;
+        # como a árvore tem len(arvore) pares, sobram pelo menos 'extras'
+        candidatos = rng.choice(total_pares, extras + len(arvore), replace=False)
+        candidatos = candidatos[~np.isin(candidatos, arvore)][:extras]
+        chaves = np.concatenate([arvore, candidatos])
+    else:
+        chaves = rng.choice(total_pares, num_arestas, replace=False)
+
+    origens, destinos = _decodificar_pares(chaves)
+    pesos = rng.integers(peso_min, peso_max + 1, size=len(chaves))
+    return origens, destinos, pesos, None
+
+
+def _codificar_pares(u, v):
+    """
+    Codifica pares não ordenados (u, v) com u != v em inteiros distintos no
+    intervalo [0, n(n-1)/2), usando o triângulo inferior da matriz.
+    """
+    menor = np.minimum(u, v)
+    maior = np.maximum(u, v)
+    return maior * (maior - 1) // 2 + menor
+
+
+def _decodificar_pares(chaves):
+    """Inverte '_codificar_pares', devolvendo os arrays (menor, maior)."""
+    chaves = np.asarray(chaves, dtype=np.int64)
+    maior = ((1 + np.sqrt(1 + 8 * chaves.astype(np.float64))) // 2).astype(np.int64)
+
+    # Corrige eventuais erros de arredondamento da raiz em chaves grandes
+    maior -= maior * (maior - 1) // 2 > chaves
+    maior += (maior + 1) * maior // 2 <= chaves
+    menor = chaves - maior * (maior - 1) // 2
+    return menor, maior
+
+
+def _arvore_aleatoria(num_vertices, rng):
+    """
+    Gera uma árvore geradora aleatória: cada vértice, em ordem embaralhada,
+    liga-se a um vértice sorteado entre os anteriores.
+
+    Retorna:
+    - np.ndarray: chaves das arestas da árvore (ver '_codificar_pares').
+    """
+    if num_vertices < 2:
+        return np.empty(0, dtype=np.int64)
+    ordem = rng.permutation(num_vertices)
+    posicoes = np.arange(1, num_vertices)
+    pais = ordem[(rng.random(num_vertices - 1) * posicoes).astype(np.int64)]
+    return _codificar_pares(ordem[1:], pais)
+
+
+def _gerar_grade(num_vertices, rng, peso_min, peso_max):
+    """
+    Gera uma malha com 'colunas' = ceil(sqrt(n)) vértices por linha, ligando
+    cada vértice ao da direita e ao de baixo.
+    """
+    colunas = max(1, math.ceil(math.sqrt(num_vertices)))
+    vertices = np.arange(num_vertices)
+
+    direita = vertices[(vertices % colunas != colunas - 1) &
+                       (vertices + 1 < num_vertices)]
+    abaixo = vertices[vertices + colunas < num_vertices]
+
+    origens = np.concatenate([direita, abaixo])
+    destinos = np.concatenate([direita + 1, abaixo + colunas])
+    pesos = rng.integers(peso_min, peso_max + 1, size=len(origens))
+
+    coordenadas = np.column_stack([vertices % colunas, -(vertices // colunas)])
+    return origens, destinos, pesos, coordenadas.astype(np.float64)
+
+
+def _gerar_geometrica(num_vertices, num_arestas, rng, peso_min, peso_max):
+    """
+    Gera um grafo geométrico aleatório: pontos uniformes no quadrado unitário
+    ligados quando a distância é menor que um raio escolhido para que o
+    número esperado de arestas seja 'num_arestas'.
+
+    Os pontos são agrupados em células do tamanho do raio, e só pares de
+    células vizinhas são comparados, tudo de forma vetorizada.
+    """
+    coordenadas = rng.random((num_vertices, 2))
+    if num_vertices < 2 or num_arestas == 0:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio, vazio, coordenadas
+
+    # Raio para que n(n-1)/2 * pi * r^2 ~ num_arestas
+    raio = min(
+        math.sqrt(2 * num_arestas / (math.pi * num_vertices * (num_vertices - 1))),
+        math.sqrt(2)
+    )
+    lado = max(1, int(1 / raio))
+
+    celula_x = np.minimum((coordenadas[:, 0] * lado).astype(np.int64), lado - 1)
+    celula_y = np.minimum((coordenadas[:, 1] * lado).astype(np.int64), lado - 1)
+    celula = celula_x * lado + celula_y
+
+    # Pontos ordenados por célula e intervalo ocupado por cada célula
+    ordem = np.argsort(celula, kind='stable')
+    celulas_ordenadas = celula[ordem]
+    todas = np.arange(lado * lado)
+    inicio = np.searchsorted(celulas_ordenadas, todas, side='left')
+    fim = np.searchsorted(celulas_ordenadas, todas, side='right')
+
+    origens, destinos = [], []
+    # Metade das células vizinhas basta, pois os pares não são ordenados
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        vizinha_x = celula_x + dx
+        vizinha_y = celula_y + dy
+        validos = np.flatnonzero(
+            (vizinha_x < lado) & (vizinha_y >= 0) & (vizinha_y < lado)
+        )
+        vizinha = vizinha_x[validos] * lado + vizinha_y[validos]
+        quantidades = fim[vizinha] - inicio[vizinha]
+
+        # Expande cada ponto em um par para cada ponto da célula vizinha
+        i = np.repeat(validos, quantidades)
+        deslocamento = (np.arange(quantidades.sum()) -
+                        np.repeat(np.cumsum(quantidades) - quantidades, quantidades))
+        j = ordem[np.repeat(inicio[vizinha], quantidades) + deslocamento]
+
+        mantidos = np.sum((coordenadas[i] - coordenadas[j]) ** 2, axis=1) <= raio ** 2
+        if (dx, dy) == (0, 0):
+            mantidos &= i < j
+        origens.append(i[mantidos])
+        destinos.append(j[mantidos])
+
+    origens = np.concatenate(origens)
+    destinos = np.concatenate(destinos)
+
+    # Peso proporcional ao comprimento da aresta, no intervalo pedido
+    distancias = np.linalg.norm(coordenadas[origens] - coordenadas[destinos], axis=1)
+    pesos = peso_min + np.rint(distancias / raio * (peso_max - peso_min)).astype(np.int64)
+    return origens, destinos, pesos, coordenadas
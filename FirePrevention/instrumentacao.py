@@ -0,0 +1,139 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+
+# Colunas de cada registro, na ordem usada na exportação CSV
+COLUNAS = (
+    'passo', 'fase', 'chamadas', 'tempo_s', 'buscas', 'vertices_fixados',
+    'fronteira', 'focos_ativos',
+)
+
+
+class Instrumentacao:
+    """
+    Medições por passo e por fase de uma simulação.
+
+    Cada registro corresponde a um par (passo, fase) e acumula todas as
+    entradas na fase durante o passo:
+    - chamadas: quantas vezes a fase foi executada.
+    - tempo_s: tempo de relógio gasto, em segundos.
+    - buscas: execuções ou retomadas de Dijkstra (cache de caminhos e
+    índice de reabastecimento).
+    - vertices_fixados: vértices fixados (relaxados) por essas buscas.
+    - fronteira, focos_ativos: tamanhos da frente de fogo e de 'fogo_ativo'
+    ao final da última chamada.
+
+    As fases registradas pela simulação são 'ignicao' (passo 1),
+    'propagacao', 'despacho', 'recarga' (consultas ao índice de
+    reabastecimento, feitas durante o despacho) e 'desenho'. Uma fase
+    aberta dentro de outra tem tempo e buscas descontados da externa, então
+    as fases de um passo somam o tempo do passo sem contar nada duas vezes.
+    Com a instrumentação desligada ('simulacao.instrumentacao' é None), o
+    único custo é a verificação desse atributo.
+    """
+
+    def __init__(self, simulacao):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação observada.
+        """
+        self.simulacao = simulacao
+
+        # Passo corrente, atualizado por 'simular_iter'
+        self.passo = 0
+
+        # Registros indexados por (passo, fase), na ordem de criação
+        self._registros = {}
+
+        # Totais [tempo, buscas, fixados] das fases internas de cada fase
+        # aberta, descontados dela ao fechar
+        self._abertas = []
+
+    def __len__(self):
+        return len(self._registros)
+
+    @contextmanager
+    def fase(self, nome, passo=None):
+        """
+        Mede o bloco executado dentro do 'with' como uma entrada na fase
+        'nome' do passo corrente (ou de 'passo', se informado).
+        """
+        simulacao = self.simulacao
+        internas = [0.0, 0, 0]
+        self._abertas.append(internas)
+        buscas, fixados = simulacao.contadores_caminhos()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            tempo = time.perf_counter() - inicio
+            buscas_fim, fixados_fim = simulacao.contadores_caminhos()
+            totais = (tempo, buscas_fim - buscas, fixados_fim - fixados)
+
+            # A fase externa, se houver, não conta o que foi medido aqui
+            self._abertas.pop()
+            if self._abertas:
+                externa = self._abertas[-1]
+                for i, total in enumerate(totais):
+                    externa[i] += total
+            tempo, buscas, fixados = (
+                total - interna for total, interna in zip(totais, internas)
+            )
+
+            chave = (self.passo if passo is None else passo, nome)
+            registro = self._registros.get(chave)
+            if registro is None:
+                registro = dict.fromkeys(COLUNAS, 0)
+                registro['passo'], registro['fase'] = chave
+                registro['tempo_s'] = 0.0
+                self._registros[chave] = registro
+
+            registro['chamadas'] += 1
+            registro['tempo_s'] += tempo
+            registro['buscas'] += buscas
+            registro['vertices_fixados'] += fixados
+            registro['fronteira'] = len(simulacao.fronteira_fogo)
+            registro['focos_ativos'] = len(simulacao.fogo_ativo)
+
+    def registros(self):
+        """Retorna a lista de registros (dicts), em ordem de criação."""
+        return list(self._registros.values())
+
+    def resumo(self):
+        """
+        Totaliza os registros por fase.
+
+        Retorna:
+        - dict: {fase: {'chamadas', 'tempo_s', 'buscas', 'vertices_fixados'}}.
+        """
+        resumo = {}
+        for registro in self._registros.values():
+            total = resumo.setdefault(registro['fase'], {
+                'chamadas': 0, 'tempo_s': 0.0, 'buscas': 0, 'vertices_fixados': 0
+            })
+            for campo in total:
+                total[campo] += registro[campo]
+        return resumo
+
+    def limpar(self):
+        """Descarta os registros, por exemplo entre duas simulações."""
+        self._registros.clear()
+        self._abertas.clear()
+        self.passo = 0
+
+    def exportar_json(self, arquivo):
+        """Grava o resumo por fase e todos os registros em JSON."""
+        with open(arquivo, 'w', encoding='utf-8') as saida:
+            json.dump(
+                {'resumo': self.resumo(), 'registros': self.registros()},
+                saida, indent=2
+            )
+
+    def exportar_csv(self, arquivo):
+        """Grava os registros em CSV, um por linha."""
+        with open(arquivo, 'w', newline='', encoding='utf-8') as saida:
+            escritor = csv.DictWriter(saida, fieldnames=COLUNAS)
+            escritor.writeheader()
+            escritor.writerows(self._registros.values())
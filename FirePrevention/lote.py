@@ -0,0 +1,160 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from FirePrevention._compartilhado import (
+    TRABALHADOR,
+    compartilhar_estado,
+    inicializar_trabalhador,
+)
+from FirePrevention.estado import EstadoCompacto
+from FirePrevention.FirePrevention import FirePreventionandFight
+
+
+# Estatísticas de um lote, com um elemento por simulação (ignição x semente)
+ResultadoLote = namedtuple(
+    'ResultadoLote', 'ignicoes sementes queimados passos agua_usada contido'
+)
+
+
+def executar_lote(
+        grafo,
+        ignicoes=None,
+        sementes=(0,),
+        processos=None,
+        max_passos=None,
+        **parametros
+    ):
+    """
+    Executa simulações independentes para cada combinação de vértice de
+    ignição e semente, distribuindo-as entre processos.
+
+    A topologia é convertida uma única vez para arrays CSR e colocada em
+    memória compartilhada; cada processo anexa esses arrays sem cópia e
+    apenas os atributos dos vértices são copiados por simulação.
+
+    Parâmetros:
+    - grafo (nx.Graph | EstadoCompacto | callable): grafo fixo para todas as
+    simulações, ou função que recebe a semente e devolve um grafo novo
+    (nesse caso cada tarefa gera o seu próprio grafo no trabalhador).
+    - ignicoes (list | None): vértices de ignição. Por padrão, todos os
+    vértices do grafo fixo.
+    - sementes (iterable[int]): sementes; cada tarefa cria a simulação com
+    'semente=semente' (e a passa ao gerador), tornando-a reprodutível.
+    - processos (int | None): número de processos. 1 executa tudo no
+    processo atual; None usa todos os núcleos.
+    - max_passos (int | None): limite de passos de cada simulação.
+    - parametros: demais argumentos de FirePreventionandFight
+    (postos_brigadistas, pontos_agua, capacidade_caminhoes, ...).
+
+    Retorna:
+    - ResultadoLote: arrays NumPy alinhados, um elemento por simulação, com
+    o vértice de ignição, a semente, o número de vértices queimados, os
+    passos até a contenção, a água usada e se o fogo foi contido. Uma
+    simulação em que nenhum brigadista alcança o fogo restante termina
+    assim que o fogo para de crescer, com 'contido' falso.
+    """
+    sementes = list(sementes)
+
+    if callable(grafo) and not isinstance(grafo, EstadoCompacto):
+        if ignicoes is None:
+            raise ValueError("ignicoes é obrigatório quando grafo é um gerador.")
+        estado, gerador = None, grafo
+    else:
+        estado = (grafo if isinstance(grafo, EstadoCompacto)
+                  else EstadoCompacto.de_grafo(grafo))
+        if ignicoes is None:
+            ignicoes = list(estado.nos())
+        gerador = None
+
+    tarefas = [(ignicao, semente) for ignicao in ignicoes for semente in sementes]
+
+    # Sem paralelismo, as tarefas usam diretamente o estado deste processo
+    if processos == 1:
+        TRABALHADOR.update(
+            estado=estado, gerador=gerador,
+            parametros=parametros, max_passos=max_passos
+        )
+        try:
+            resultados = list(map(_executar_tarefa, tarefas))
+        finally:
+            TRABALHADOR.clear()
+    else:
+        resultados = _executar_em_processos(
+            tarefas, estado, gerador, parametros, max_passos,
+            processos or os.cpu_count()
+        )
+
+    queimados, passos, agua_usada, contido = (
+        zip(*resultados) if resultados else ((), (), (), ())
+    )
+    return ResultadoLote(
+        ignicoes=np.array([t[0] for t in tarefas]),
+        sementes=np.array([t[1] for t in tarefas], dtype=np.int64),
+        queimados=np.array(queimados, dtype=np.int64),
+        passos=np.array(passos, dtype=np.int64),
+        agua_usada=np.array(agua_usada),
+        contido=np.array(contido, dtype=bool)
+    )
+
+
+def _executar_em_processos(tarefas, estado, gerador, parametros, max_passos,
+                           processos):
+    """
+    Distribui as tarefas entre processos, colocando antes os arrays da
+    topologia em memória compartilhada.
+
+    Retorna:
+    - list[tuple]: resultado de cada tarefa, na ordem de 'tarefas'.
+    """
+    memorias, topologia = [], None
+
+    try:
+        if estado is not None:
+            memorias, topologia = compartilhar_estado(estado)
+
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            initializer=inicializar_trabalhador,
+            initargs=(topologia, gerador, parametros, max_passos)
+        ) as executor:
+            return list(executor.map(
+                _executar_tarefa,
+                tarefas,
+                chunksize=max(1, len(tarefas) // (4 * processos))
+            ))
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+
+
+def _executar_tarefa(tarefa):
+    """
+    Executa uma simulação sem desenho para (ignição, semente).
+
+    Retorna:
+    - tuple: vértices queimados, passos, água usada e se o fogo foi contido.
+    """
+    ignicao, semente = tarefa
+
+    if TRABALHADOR['gerador'] is not None:
+        grafo = TRABALHADOR['gerador'](semente)
+    else:
+        grafo = TRABALHADOR['estado'].clonar()
+
+    simulacao = FirePreventionandFight(
+        grafo=grafo, semente=semente, **TRABALHADOR['parametros']
+    )
+
+    passos = 0
+    for passo in simulacao.simular_iter(ignicao, TRABALHADOR['max_passos']):
+        passos = passo.estado - 1
+
+    queimados = (len(simulacao.estado.nos_com('queimado')) +
+                 len(simulacao.fogo_ativo))
+    agua_usada = len(simulacao.fogos_apagados) * simulacao.consumo_por_fogo
+
+    return queimados, passos, agua_usada, not simulacao.fogo_ativo
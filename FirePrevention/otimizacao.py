@@ -0,0 +1,300 @@
+import heapq
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from FirePrevention._compartilhado import (
+    TRABALHADOR,
+    compartilhar_estado,
+    inicializar_trabalhador,
+)
+from FirePrevention.caminhos import CacheCaminhos
+from FirePrevention.estado import EstadoCompacto
+from FirePrevention.FirePrevention import FirePreventionandFight
+from FirePrevention.recarga import IndiceRecarga
+
+
+# Resultado de 'otimizar_posicionamento'; 'historico' tem um par (tipo,
+# vértice) por escolha, na ordem, com a área esperada após cada uma
+ResultadoPosicionamento = namedtuple(
+    'ResultadoPosicionamento',
+    'postos pontos_agua area_esperada historico avaliacoes'
+)
+
+# Tipos de elemento escolhidos pelo otimizador
+POSTO, AGUA = 'posto', 'agua'
+
+# Índices de reabastecimento guardados por processo, um por conjunto de
+# pontos de água e postos
+LIMITE_INDICES_RECARGA = 8
+
+
+def otimizar_posicionamento(
+        grafo,
+        ignicoes,
+        num_postos=0,
+        num_pontos_agua=0,
+        candidatos_postos=None,
+        candidatos_agua=None,
+        num_candidatos=100,
+        sementes=(0,),
+        processos=None,
+        max_passos=100,
+        preguicoso=True,
+        tamanho_lote=None,
+        semente=None,
+        **parametros
+    ):
+    """
+    Escolhe 'num_postos' postos de brigadistas e 'num_pontos_agua' pontos de
+    água que minimizam a área queimada esperada sobre um conjunto de
+    cenários de ignição.
+
+    A escolha é gulosa: a cada rodada entra o candidato que mais reduz a
+    área esperada, medida simulando todos os cenários. Com a avaliação
+    preguiçosa (CELF), o ganho calculado em uma rodada anterior serve de
+    limite superior: os candidatos ficam em uma fila de prioridade e só o
+    topo é reavaliado; se continuar no topo com o ganho atualizado, é
+    escolhido sem que os demais sejam simulados de novo. Isso supõe ganhos
+    decrescentes; quando dois postos juntos contêm o fogo e um só não
+    contém, um candidato com ganho inicial baixo pode nunca ser revisto, e
+    'preguicoso=False' (todos reavaliados a cada rodada) escolhe melhor.
+
+    As simulações de cada avaliação são distribuídas entre processos, com a
+    topologia em memória compartilhada (como em 'executar_lote'). Em cada
+    processo, as árvores de caminhos mínimos, que dependem só da topologia,
+    ficam em um cache único reaproveitado por todas as simulações, e o
+    índice de reabastecimento é reaproveitado entre cenários do mesmo
+    posicionamento.
+
+    Parâmetros:
+    - grafo (nx.Graph | EstadoCompacto): grafo do ambiente.
+    - ignicoes (list): vértices de ignição dos cenários.
+    - num_postos, num_pontos_agua (int): quantos elementos escolher.
+    - candidatos_postos, candidatos_agua (list | None): vértices candidatos;
+    por padrão, 'num_candidatos' vértices sorteados.
+    - num_candidatos (int): tamanho dos conjuntos sorteados.
+    - sementes (iterable[int]): sementes de cada cenário (ignição x semente).
+    - processos (int | None): número de processos. 1 executa tudo no
+    processo atual; None usa todos os núcleos.
+    - max_passos (int | None): limite de passos de cada simulação. Sem
+    limite, cada simulação vai até o fogo se extinguir ou parar de mudar.
+    - preguicoso (bool): usa a avaliação preguiçosa; False reavalia todos
+    os candidatos a cada rodada (guloso exato).
+    - tamanho_lote (int | None): candidatos reavaliados juntos quando o
+    topo da fila está desatualizado; por padrão, o suficiente para ocupar
+    todos os processos.
+    - semente (int | None): semente do sorteio dos candidatos.
+    - parametros: demais argumentos de FirePreventionandFight. Os
+    'postos_brigadistas' e 'pontos_agua' dados são mantidos e os escolhidos
+    são acrescentados a eles.
+
+    Retorna:
+    - ResultadoPosicionamento: postos e pontos de água finais, a área
+    esperada com eles, o histórico das escolhas e o número de
+    posicionamentos avaliados.
+    """
+    estado = grafo if isinstance(grafo, EstadoCompacto) else EstadoCompacto.de_grafo(grafo)
+    rng = np.random.default_rng(semente)
+    escolhidos = {
+        POSTO: list(parametros.pop('postos_brigadistas', None) or []),
+        AGUA: list(parametros.pop('pontos_agua', None) or []),
+    }
+    vagas = {POSTO: num_postos, AGUA: num_pontos_agua}
+
+    candidatos = []
+    for tipo, lista in ((POSTO, candidatos_postos), (AGUA, candidatos_agua)):
+        if not vagas[tipo]:
+            continue
+        if lista is None:
+            sorteados = rng.choice(len(estado), min(num_candidatos, len(estado)), replace=False)
+            lista = [estado.no(i) for i in sorteados.tolist()]
+        candidatos.extend((tipo, v) for v in lista if v not in escolhidos[tipo])
+
+    cenarios = [(ignicao, s) for ignicao in ignicoes for s in sementes]
+    processos = processos or os.cpu_count()
+    if not preguicoso:
+        tamanho_lote = len(candidatos)
+    elif tamanho_lote is None:
+        tamanho_lote = max(1, -(-processos // len(cenarios)))
+
+    with _Avaliador(estado, cenarios, parametros, max_passos, processos) as avaliador:
+        def areas(novos):
+            return avaliador.areas([
+                (escolhidos[POSTO] + [v] * (tipo == POSTO),
+                 escolhidos[AGUA] + [v] * (tipo == AGUA))
+                for tipo, v in novos
+            ])
+
+        area = avaliador.areas([(escolhidos[POSTO], escolhidos[AGUA])])[0]
+
+        # Fila de (-ganho, ordem, candidato, rodada da avaliação, área com ele)
+        fila = [
+            (area_com - area, ordem, candidato, 0, area_com)
+            for ordem, (candidato, area_com) in enumerate(zip(candidatos, areas(candidatos)))
+        ]
+        heapq.heapify(fila)
+
+        rodada = 0
+        historico = []
+        while fila and any(vagas.values()):
+            _, ordem, (tipo, vertice), avaliado, area_com = fila[0]
+            if not vagas[tipo]:
+                heapq.heappop(fila)
+                continue
+
+            # Ganho atualizado no topo: nenhum outro limite o supera
+            if avaliado == rodada:
+                heapq.heappop(fila)
+                escolhidos[tipo].append(vertice)
+                vagas[tipo] -= 1
+                area = area_com
+                historico.append((tipo, vertice, area))
+                rodada += 1
+                continue
+
+            # Reavalia juntos os primeiros candidatos desatualizados
+            lote = []
+            atualizados = []
+            while fila and len(lote) < tamanho_lote:
+                entrada = heapq.heappop(fila)
+                if not vagas[entrada[2][0]]:
+                    continue
+                (atualizados if entrada[3] == rodada else lote).append(entrada)
+            novos = areas([entrada[2] for entrada in lote])
+            for (_, ordem, candidato, _, _), area_com in zip(lote, novos):
+                heapq.heappush(fila, (area_com - area, ordem, candidato, rodada, area_com))
+            for entrada in atualizados:
+                heapq.heappush(fila, entrada)
+
+        avaliacoes = avaliador.avaliacoes
+
+    return ResultadoPosicionamento(
+        postos=escolhidos[POSTO],
+        pontos_agua=escolhidos[AGUA],
+        area_esperada=float(area),
+        historico=historico,
+        avaliacoes=avaliacoes,
+    )
+
+
+class _Avaliador:
+    """
+    Simula todos os cenários para cada posicionamento pedido, em processos
+    que permanecem ativos durante toda a otimização.
+    """
+
+    def __init__(self, estado, cenarios, parametros, max_passos, processos):
+        self.cenarios = cenarios
+        self.processos = processos
+        self.avaliacoes = 0
+        self._memorias = []
+        self._executor = None
+
+        if processos == 1:
+            TRABALHADOR.update(
+                estado=estado, gerador=None,
+                parametros=parametros, max_passos=max_passos
+            )
+        else:
+            self._memorias, topologia = compartilhar_estado(estado)
+            self._executor = ProcessPoolExecutor(
+                max_workers=processos,
+                initializer=inicializar_trabalhador,
+                initargs=(topologia, None, parametros, max_passos)
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        if self._executor is None:
+            TRABALHADOR.clear()
+        else:
+            self._executor.shutdown()
+        for memoria in self._memorias:
+            memoria.close()
+            memoria.unlink()
+
+    def areas(self, posicionamentos):
+        """
+        Área queimada média sobre os cenários de cada posicionamento.
+
+        Parâmetros:
+        - posicionamentos (list[tuple(list, list)]): pares (postos, pontos
+        de água).
+
+        Retorna:
+        - np.ndarray: uma área por posicionamento.
+        """
+        self.avaliacoes += len(posicionamentos)
+        tarefas = [
+            (postos, agua, ignicao, semente)
+            for postos, agua in posicionamentos
+            for ignicao, semente in self.cenarios
+        ]
+        if not tarefas:
+            return np.zeros(0)
+
+        if self._executor is None:
+            queimados = list(map(_simular_cenario, tarefas))
+        else:
+            # Cenários do mesmo posicionamento juntos reaproveitam o índice
+            # de reabastecimento no processo que os recebe
+            queimados = list(self._executor.map(
+                _simular_cenario, tarefas,
+                chunksize=max(1, min(len(self.cenarios),
+                                     len(tarefas) // (4 * self.processos)))
+            ))
+
+        return np.array(queimados, dtype=np.float64).reshape(
+            len(posicionamentos), len(self.cenarios)
+        ).mean(axis=1)
+
+
+def _simular_cenario(tarefa):
+    """
+    Simula uma ignição com um posicionamento, no processo trabalhador.
+
+    Retorna:
+    - int: vértices queimados ou ainda em chamas ao final.
+    """
+    postos, agua, ignicao, semente = tarefa
+    estado = TRABALHADOR['estado']
+
+    simulacao = FirePreventionandFight(
+        grafo=estado.clonar(), semente=semente,
+        postos_brigadistas=postos, pontos_agua=agua,
+        **TRABALHADOR['parametros']
+    )
+
+    # As árvores de caminhos dependem só da topologia, que é a mesma em
+    # todas as simulações: um único cache por processo serve a todas
+    caminhos = TRABALHADOR.get('caminhos')
+    if caminhos is None:
+        caminhos = CacheCaminhos(estado, simulacao.caminhos.limite_nos)
+        TRABALHADOR['caminhos'] = caminhos
+    simulacao.caminhos = caminhos
+
+    # O índice de reabastecimento depende só dos pontos de água e postos
+    indices = TRABALHADOR.setdefault('recarga', OrderedDict())
+    fontes = frozenset(simulacao.estado.nos_com('agua')).union(
+        simulacao.estado.nos_com('posto_brigadista')
+    )
+    indice = indices.get(fontes)
+    if indice is None:
+        indice = IndiceRecarga(simulacao.estado.vizinhos_ponderados, fontes)
+        indices[fontes] = indice
+        if len(indices) > LIMITE_INDICES_RECARGA:
+            indices.popitem(last=False)
+    else:
+        indices.move_to_end(fontes)
+    simulacao._indice_recarga = indice
+    simulacao._versao_recarga = simulacao.estado.versao
+
+    for _ in simulacao.simular_iter(ignicao, TRABALHADOR['max_passos']):
+        pass
+
+    return len(simulacao.estado.nos_com('queimado')) + len(simulacao.fogo_ativo)
@@ -0,0 +1,690 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from FirePrevention._compartilhado import compactar
+from FirePrevention.estado import ATRIBUTOS, EstadoCompacto
+from FirePrevention.FirePrevention import FirePreventionandFight
+
+
+# Simulação restaurada e número do passo em que o estado foi gravado
+Checkpoint = namedtuple('Checkpoint', 'simulacao passo')
+
+# Campos alterados pelos registros de delta: os atributos booleanos dos
+# vértices, a frente de fogo, a posição e a água de cada brigadista, os
+# vértices acrescentados ao fim de 'fogos_apagados', o peso de cada entrada
+# do CSR, as arestas fechadas (peso original, ou NaN na reabertura) e o
+# estado do gerador aleatório
+CAMPOS = ATRIBUTOS + (
+    'fronteira', 'posicao', 'agua_brigadista', 'apagado', 'peso', 'fechada', 'rng'
+)
+_FRONTEIRA, _POSICAO, _AGUA, _APAGADO, _PESO, _FECHADA, _RNG = range(
+    len(ATRIBUTOS), len(CAMPOS)
+)
+
+# Campo do registro que encerra cada passo gravado
+_FIM_PASSO = -1
+
+# Registro de uma alteração no arquivo de deltas; 'indice' é o índice do
+# vértice (do brigadista, para posição e água; a posição da entrada u -> v
+# no CSR do checkpoint inicial, para peso e aresta fechada; a parte de 32
+# bits, para o gerador aleatório)
+TIPO_DELTA = np.dtype([
+    ('passo', '<i8'), ('campo', '<i1'), ('indice', '<i8'), ('valor', '<f8')
+])
+
+
+def salvar_checkpoint(simulacao, arquivo, passo=0, comprimir=True):
+    """
+    Grava o estado completo da simulação em um arquivo '.npz' compacto:
+    adjacência CSR, atributos dos vértices em bits ('np.packbits'), frente
+    de fogo, focos apagados, brigadistas, parâmetros e o estado do gerador
+    aleatório. Caches de caminhos e o índice de reabastecimento não são
+    gravados, pois são refeitos sob demanda.
+
+    Parâmetros:
+    - simulacao (FirePreventionandFight): simulação a gravar.
+    - arquivo (str | arquivo): destino, de preferência com extensão '.npz'.
+    - passo (int): número do passo corrente, devolvido na restauração.
+    - comprimir (bool): usa 'np.savez_compressed'.
+    """
+    _gravar(arquivo, _capturar(simulacao, compactar(simulacao), passo), comprimir)
+
+
+def carregar_checkpoint(arquivo, permitir_pickle=False, **parametros):
+    """
+    Restaura uma simulação gravada por 'salvar_checkpoint', no mesmo
+    backend. Continuá-la com 'retomar_iter' produz os mesmos passos que a
+    simulação original produziria.
+
+    Parâmetros:
+    - arquivo (str | arquivo): checkpoint gravado.
+    - permitir_pickle (bool): necessário quando os vértices não são
+    inteiros nem strings (ex.: tuplas); só use com arquivos confiáveis.
+    - parametros: argumentos de FirePreventionandFight que substituem os
+    gravados (ex.: 'limite_cache'). O modelo de propagação não é gravado;
+    um 'PropagacaoEstocastica' deve ser recriado sobre o novo estado.
+
+    Retorna:
+    - Checkpoint: simulação restaurada e passo gravado.
+    """
+    return _montar(_ler(arquivo, permitir_pickle), parametros)
+
+
+class GravadorPassos:
+    """
+    Consumidor de passos que grava a história da simulação em disco.
+
+    Na criação, grava o estado inicial em '<prefixo>.npz'. A cada passo,
+    acrescenta a '<prefixo>.deltas' apenas o que mudou desde o passo
+    anterior, inclusive pesos alterados e arestas fechadas ou reabertas
+    durante a simulação e o estado do gerador aleatório, como registros
+    'TIPO_DELTA' de tamanho fixo. O arquivo de deltas é lido com
+    'np.memmap', então 'reconstruir' obtém o estado de qualquer passo
+    aplicando só o trecho necessário, sem manter cópias do estado em
+    memória. Com 'intervalo_checkpoints', um checkpoint completo é gravado
+    a cada tantos passos, limitando o trecho a reaplicar.
+
+    Para não percorrer todos os vértices a cada passo, só são comparados
+    os vértices citados no passo (novos focos, focos apagados e as frentes
+    de fogo) e os avisados pela simulação ('alterar_peso', 'fechar_aresta',
+    'reabrir_aresta' e os pontos de água), da qual o gravador é observador.
+    Atributos alterados diretamente no estado, entre um passo e outro, não
+    são vistos; pesos alterados assim são, desde que seguidos de
+    'invalidar_caminhos', ao custo de comparar todos os pesos.
+    """
+
+    def __init__(self, simulacao, prefixo, passo=0, intervalo_checkpoints=None):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação a gravar, ainda no
+        estado inicial (ou recém-restaurada).
+        - prefixo (str): caminho dos arquivos, sem extensão.
+        - passo (int): número do passo do estado inicial.
+        - intervalo_checkpoints (int | None): passos entre checkpoints
+        completos ('<prefixo>.<passo>.npz').
+        """
+        self.simulacao = simulacao
+        self.prefixo = prefixo
+        self.intervalo_checkpoints = intervalo_checkpoints
+        self.passo = passo
+
+        compacto = compactar(simulacao)
+        dados = _capturar(simulacao, compacto, passo)
+        dados['intervalo'] = intervalo_checkpoints
+        _gravar(prefixo + '.npz', dados)
+
+        # Mapeamento vértice -> índice fixado pelo checkpoint inicial
+        self._indice = compacto.indice
+        self._indptr = compacto.indptr
+        self._indices = compacto.indices
+        self._brigadistas = list(simulacao.brigadistas)
+
+        # Última versão gravada de cada campo, para calcular as diferenças
+        self._anterior = {a: flag.copy() for a, flag in dados['flags'].items()}
+        self._fronteira = set(simulacao.fronteira_fogo)
+        self._posicoes = dados['posicoes']
+        self._agua = dados['agua'].astype(np.float64)
+        self._apagados = len(simulacao.fogos_apagados)
+        self._pesos = compacto.pesos.astype(np.float64)
+        self._versao = simulacao.estado.versao
+        self._fechadas = dict(simulacao.arestas_fechadas)
+        self._rng = _partes_rng(dados['rng'])
+
+        # Alterações avisadas pela simulação desde o último passo gravado
+        self._arestas_alteradas = set()
+        self._vertices_alterados = set()
+        self._alteracoes = 0
+        simulacao.observadores.append(self)
+
+        self._arquivo = open(prefixo + '.deltas', 'wb')
+
+    def __call__(self, passo):
+        """
+        Grava as alterações de um passo recebido de 'simular_iter'.
+
+        Parâmetros:
+        - passo (Passo): registro do passo da simulação.
+        """
+        simulacao = self.simulacao
+        estado = simulacao.estado
+        numero = passo.estado
+        registros = []
+
+        def registrar(campo, anterior, atual, indices=None):
+            # Sem 'indices', 'atual' cobre todas as posições de 'anterior'
+            if indices is None:
+                indices = np.arange(len(anterior))
+            selecao = anterior[indices] != atual
+            if np.any(selecao):
+                mudou, valores = indices[selecao], atual[selecao]
+                registros.append(_registros(numero, campo, mudou, valores))
+                anterior[mudou] = valores
+
+        # Só os vértices citados no passo ou avisados podem ter mudado
+        fronteira = simulacao.fronteira_fogo
+        apagados = simulacao.fogos_apagados[self._apagados:]
+        vertices = set(passo.novos_focos)
+        vertices.update(apagados, fronteira, self._fronteira, self._vertices_alterados)
+        vertices = list(vertices)
+        indices = _indices(vertices, self._indice)
+        for campo, atributo in enumerate(ATRIBUTOS):
+            atual = _flags_em(estado, vertices, indices, atributo)
+            registrar(campo, self._anterior[atributo], atual, indices)
+
+        entraram = _indices(fronteira - self._fronteira, self._indice)
+        sairam = _indices(self._fronteira - fronteira, self._indice)
+        if len(entraram) or len(sairam):
+            registros.append(_registros(
+                numero, _FRONTEIRA, np.concatenate([entraram, sairam]),
+                np.repeat([1, 0], [len(entraram), len(sairam)])
+            ))
+            self._fronteira = set(fronteira)
+
+        # Os brigadistas são poucos e comparados todos a cada passo
+        posicoes, agua = _brigadistas(simulacao, self._brigadistas, self._indice)
+        registrar(_POSICAO, self._posicoes, posicoes)
+        registrar(_AGUA, self._agua, agua.astype(np.float64))
+
+        if apagados:
+            registros.append(_registros(numero, _APAGADO, _indices(apagados, self._indice), 0))
+            self._apagados = len(simulacao.fogos_apagados)
+
+        # Com todas as alterações de peso avisadas, só as arestas alteradas
+        # são comparadas; sem o aviso (ex.: 'invalidar_caminhos'), todas
+        if estado.versao == self._versao + self._alteracoes:
+            if self._arestas_alteradas:
+                registrar(_PESO, self._pesos, *self._pesos_alterados())
+        else:
+            registrar(_PESO, self._pesos, compactar(simulacao).pesos.astype(np.float64))
+        self._versao = estado.versao
+        self._arestas_alteradas.clear()
+        self._vertices_alterados.clear()
+        self._alteracoes = 0
+        if simulacao.arestas_fechadas != self._fechadas:
+            registros.append(self._registros_fechadas(numero))
+
+        # O gerador é gravado inteiro sempre que muda, para retomar de
+        # qualquer passo com os mesmos sorteios
+        rng = _partes_rng(simulacao.rng.bit_generator.state)
+        if not np.array_equal(rng, self._rng):
+            registros.append(_registros(numero, _RNG, np.arange(len(rng)), rng))
+            self._rng = rng
+
+        registros.append(_registros(numero, _FIM_PASSO, np.zeros(1, np.int64), 0))
+        np.concatenate(registros).tofile(self._arquivo)
+        self.passo = numero
+
+        if self.intervalo_checkpoints and numero % self.intervalo_checkpoints == 0:
+            self._arquivo.flush()
+            salvar_checkpoint(simulacao, f'{self.prefixo}.{numero}.npz', numero)
+
+    def finalizar(self):
+        """Fecha o arquivo de deltas ao final da simulação."""
+        if self in self.simulacao.observadores:
+            self.simulacao.observadores.remove(self)
+        self._arquivo.close()
+
+    def aresta_alterada(self, u, v):
+        """Aviso da simulação: o peso da aresta (u, v) mudou."""
+        self._arestas_alteradas.add((u, v))
+        self._alteracoes += 1
+
+    def vertice_alterado(self, vertice):
+        """Aviso da simulação: um atributo do vértice mudou fora dos passos."""
+        self._vertices_alterados.add(vertice)
+
+    def _pesos_alterados(self):
+        """Pesos atuais e posições no CSR, nos dois sentidos, das arestas alteradas."""
+        indice = self._indice
+        peso = self.simulacao.estado.peso
+        alteradas = [
+            (_posicao(self._indptr, self._indices, indice(a), indice(b)), peso(u, v))
+            for u, v in self._arestas_alteradas for a, b in ((u, v), (v, u))
+        ]
+        posicoes, pesos = zip(*alteradas)
+        return np.array(pesos, dtype=np.float64), np.array(posicoes, dtype=np.int64)
+
+    def _registros_fechadas(self, numero):
+        """Registros das arestas fechadas, reabertas ou com novo peso original."""
+        atuais = self.simulacao.arestas_fechadas
+        alteradas = [
+            (aresta, peso) for aresta, peso in atuais.items()
+            if self._fechadas.get(aresta) != peso
+        ] + [(aresta, np.nan) for aresta in self._fechadas if aresta not in atuais]
+        self._fechadas = dict(atuais)
+
+        posicoes = [
+            _posicao(self._indptr, self._indices, self._indice(u), self._indice(v))
+            for (u, v), _ in alteradas
+        ]
+        return _registros(
+            numero, _FECHADA, np.array(posicoes, dtype=np.int64),
+            np.array([peso for _, peso in alteradas], dtype=np.float64)
+        )
+
+
+def ler_deltas(prefixo):
+    """
+    Abre o arquivo de deltas de um 'GravadorPassos' sem carregá-lo.
+
+    Retorna:
+    - np.memmap | np.ndarray: registros 'TIPO_DELTA' em ordem de passo;
+    'campo' indexa 'CAMPOS' (-1 marca o fim de um passo).
+    """
+    caminho = prefixo + '.deltas'
+    if os.path.getsize(caminho) == 0:
+        return np.zeros(0, dtype=TIPO_DELTA)
+    return np.memmap(caminho, dtype=TIPO_DELTA, mode='r')
+
+
+def reconstruir(prefixo, passo=None, permitir_pickle=False, **parametros):
+    """
+    Reconstrói a simulação gravada por um 'GravadorPassos' tal como estava
+    ao fim de um passo: parte do checkpoint mais recente até esse passo e
+    aplica os deltas seguintes, lidos do arquivo mapeado em memória.
+
+    O estado do gerador aleatório também é reconstruído, então continuar
+    a simulação com 'retomar_iter' a partir de qualquer passo produz os
+    mesmos sorteios da execução original.
+
+    Parâmetros:
+    - prefixo (str): prefixo usado pelo gravador.
+    - passo (int | None): passo desejado; None para o último gravado.
+    - permitir_pickle, parametros: como em 'carregar_checkpoint'.
+
+    Retorna:
+    - Checkpoint: simulação reconstruída e passo correspondente.
+    """
+    dados = _ler(prefixo + '.npz', permitir_pickle)
+    deltas = ler_deltas(prefixo)
+    inicial = dados['passo']
+    ultimo = int(deltas['passo'][-1]) if len(deltas) else inicial
+
+    passo = ultimo if passo is None else min(passo, ultimo)
+    if passo < inicial:
+        raise ValueError(f"O passo {passo} é anterior ao início da gravação ({inicial}).")
+
+    # Parte do checkpoint intermediário mais recente, se houver
+    intervalo = dados['intervalo']
+    if intervalo:
+        for chave in range(passo - passo % intervalo, inicial, -intervalo):
+            arquivo = f'{prefixo}.{chave}.npz'
+            if os.path.exists(arquivo):
+                dados = _ler(arquivo, permitir_pickle)
+                break
+
+    marcas = deltas['passo']
+    inicio = np.searchsorted(marcas, dados['passo'], side='right')
+    fim = np.searchsorted(marcas, passo, side='right')
+    _aplicar(dados, np.asarray(deltas[inicio:fim]))
+    dados['passo'] = passo
+    return _montar(dados, parametros)
+
+
+def _para_networkx(estado):
+    """
+    Reconstrói o grafo networkx de 'compactar', com a mesma ordem de
+    vértices e de vizinhos. A ordem dos vizinhos no networkx é a ordem de
+    inserção das arestas, então cada aresta é inserida quando é a próxima
+    da lista dos dois extremos.
+    """
+    import networkx as nx
+
+    grafo = nx.Graph()
+    grafo.add_nodes_from(
+        (no, {a: bool(estado.flags[a][i]) for a in ATRIBUTOS})
+        for i, no in enumerate(estado.nos())
+    )
+
+    indptr = estado.indptr.tolist()
+    indices = estado.indices.tolist()
+    pesos = estado.pesos.tolist()
+    no = estado.no
+
+    # 'cursor[u]' aponta o próximo vizinho de u ainda sem aresta inserida
+    cursor = indptr[:-1]
+
+    def proximo(u):
+        return indices[cursor[u]] if cursor[u] < indptr[u + 1] else None
+
+    def pronta(u):
+        v = proximo(u)
+        return v is not None and proximo(v) == u
+
+    # Arestas prontas, identificadas pelo menor extremo
+    prontas = [u for u in range(len(estado)) if pronta(u) and u <= proximo(u)]
+    while prontas:
+        u = prontas.pop()
+        v = proximo(u)
+        grafo.add_edge(no(u), no(v), weight=pesos[cursor[u]])
+        cursor[u] += 1
+        if v != u:
+            cursor[v] += 1
+        for x in (u, v):
+            if pronta(x):
+                prontas.append(min(x, proximo(x)))
+
+    # Ordens inconsistentes não ocorrem em grafos reais; por segurança,
+    # as arestas restantes entram na ordem do CSR
+    if grafo.number_of_edges() * 2 < len(indices):
+        for u in range(len(estado)):
+            for posicao in range(indptr[u], indptr[u + 1]):
+                if not grafo.has_edge(no(u), no(indices[posicao])):
+                    grafo.add_edge(no(u), no(indices[posicao]), weight=pesos[posicao])
+    return grafo
+
+
+def _posicao(indptr, indices, i, j):
+    """Posição da entrada i -> j no CSR."""
+    inicio = indptr[i]
+    return int(inicio + np.flatnonzero(indices[inicio:indptr[i + 1]] == j)[0])
+
+
+def _indices(vertices, indice):
+    """Índices dos 'vertices' como array de inteiros."""
+    return np.fromiter((indice(no) for no in vertices), dtype=np.int64)
+
+
+def _flags(estado, indice, num_vertices):
+    """Arrays booleanos dos atributos, na ordem dos índices."""
+    if isinstance(estado, EstadoCompacto):
+        return estado.flags
+    flags = {}
+    for atributo in ATRIBUTOS:
+        flags[atributo] = np.zeros(num_vertices, dtype=bool)
+        flags[atributo][_indices(estado.nos_com(atributo), indice)] = True
+    return flags
+
+
+def _flags_em(estado, vertices, indices, atributo):
+    """Valores de um atributo nos 'vertices', de índices 'indices'."""
+    if isinstance(estado, EstadoCompacto):
+        return estado.flags[atributo][indices]
+    return np.fromiter(
+        (estado.obter(no, atributo) for no in vertices), dtype=bool, count=len(vertices)
+    )
+
+
+def _partes_rng(estado):
+    """
+    Estado do gerador aleatório como partes de 32 bits, exatas em float64:
+    quatro por inteiro, na ordem das chaves. Serve aos geradores cujo
+    estado é feito de inteiros de até 128 bits, como o PCG64 padrão.
+    """
+    inteiros = [estado['state'][chave] for chave in sorted(estado['state'])]
+    inteiros += [estado[chave] for chave in sorted(estado)
+                 if chave not in ('bit_generator', 'state')]
+    if not all(isinstance(x, int) and 0 <= x < 1 << 128 for x in inteiros):
+        raise ValueError(
+            f"O gerador {estado['bit_generator']} não pode ser gravado por passo; "
+            "use o PCG64 padrão."
+        )
+    return np.array(
+        [(x >> (32 * parte)) & 0xFFFFFFFF for x in inteiros for parte in range(4)],
+        dtype=np.float64
+    )
+
+
+def _restaurar_rng(modelo, partes):
+    """Inverso de '_partes_rng', com as chaves de 'modelo'."""
+    partes = partes.astype(np.int64).tolist()
+    inteiros = iter([
+        sum(parte << (32 * k) for k, parte in enumerate(partes[i:i + 4]))
+        for i in range(0, len(partes), 4)
+    ])
+    estado = dict(modelo)
+    estado['state'] = {chave: next(inteiros) for chave in sorted(modelo['state'])}
+    for chave in sorted(modelo):
+        if chave not in ('bit_generator', 'state'):
+            estado[chave] = next(inteiros)
+    return estado
+
+
+def _brigadistas(simulacao, chaves, indice):
+    """Posições (como índices) e água dos brigadistas, na ordem de 'chaves'."""
+    posicoes = _indices((simulacao.brigadistas[b][0] for b in chaves), indice)
+    agua = np.array([simulacao.brigadistas[b][1] for b in chaves])
+    return posicoes, agua
+
+
+def _registros(passo, campo, indices, valores):
+    registros = np.empty(len(indices), dtype=TIPO_DELTA)
+    registros['passo'] = passo
+    registros['campo'] = campo
+    registros['indice'] = indices
+    registros['valor'] = valores
+    return registros
+
+
+def _array_ids(ids):
+    """
+    Converte os vértices em array; vértices que não são todos inteiros,
+    floats ou strings (ex.: tuplas) viram um array de objetos.
+    """
+    if isinstance(ids, np.ndarray):
+        return ids
+    if len({type(no) for no in ids}) == 1 and type(ids[0]) in (int, float, str):
+        return np.asarray(ids)
+    array = np.empty(len(ids), dtype=object)
+    for i, no in enumerate(ids):
+        array[i] = no
+    return array
+
+
+def _capturar(simulacao, compacto, passo):
+    """Copia o estado da simulação para um dicionário de arrays indexados."""
+    indice = compacto.indice
+    n = len(compacto)
+    brigadistas = list(simulacao.brigadistas)
+    posicoes, agua = _brigadistas(simulacao, brigadistas, indice)
+
+    fronteira = np.zeros(n, dtype=bool)
+    fronteira[_indices(simulacao.fronteira_fogo, indice)] = True
+
+    # Coordenadas, já fornecidas ou calculadas, como array na ordem dos índices
+    coordenadas = simulacao._coordenadas
+    if coordenadas is None:
+        coordenadas = simulacao._pos
+    if isinstance(coordenadas, dict):
+        coordenadas = (
+            np.array([coordenadas[no] for no in compacto.nos()], dtype=np.float64)
+            if all(no in coordenadas for no in compacto.nos()) else None
+        )
+
+    return {
+        'indptr': compacto.indptr,
+        'indices': compacto.indices,
+        'pesos': compacto.pesos,
+        'ids': None if compacto.ids is None else _array_ids(compacto.ids),
+        'coordenadas': coordenadas,
+        'flags': {a: flag.copy() for a, flag in
+                  _flags(simulacao.estado, indice, n).items()},
+        'fronteira': fronteira,
+        'apagados': _indices(simulacao.fogos_apagados, indice),
+        'brigadistas': _indices(brigadistas, indice),
+        'posicoes': posicoes,
+        'agua': agua,
+        'fechadas': np.array(
+            [[indice(u), indice(v)] for u, v in simulacao.arestas_fechadas],
+            dtype=np.int64
+        ).reshape(-1, 2),
+        'pesos_fechadas': np.array(
+            list(simulacao.arestas_fechadas.values()), dtype=np.float64
+        ),
+        'passo': passo,
+        'intervalo': None,
+        'parametros': {
+            'backend': 'compacto' if simulacao.grafo is None else 'networkx',
+            'capacidade_caminhoes': simulacao.capacidade_caminhoes,
+            'consumo_por_fogo': simulacao.consumo_por_fogo,
+            'raio_propagacao': simulacao.raio_propagacao,
+            'modo_despacho': simulacao.modo_despacho,
+            'limite_cache': simulacao.caminhos.limite_nos,
+        },
+        'rng': simulacao.rng.bit_generator.state,
+    }
+
+
+def _gravar(arquivo, dados, comprimir=True):
+    """Grava o dicionário de '_capturar', com os atributos em bits."""
+    arrays = {
+        chave: dados[chave]
+        for chave in ('indptr', 'indices', 'pesos', 'ids', 'coordenadas',
+                      'apagados', 'brigadistas', 'posicoes', 'agua',
+                      'fechadas', 'pesos_fechadas')
+        if dados[chave] is not None
+    }
+    arrays['flags'] = np.packbits(
+        np.stack([dados['flags'][a] for a in ATRIBUTOS]), axis=1
+    )
+    arrays['fronteira'] = np.packbits(dados['fronteira'])
+
+    # Escalares e dicionários vão em JSON, sem depender de pickle
+    arrays['metadados'] = np.array(json.dumps({
+        'num_vertices': len(dados['indptr']) - 1,
+        'passo': dados['passo'],
+        'intervalo': dados['intervalo'],
+        'parametros': dados['parametros'],
+        'rng': dados['rng'],
+    }))
+
+    (np.savez_compressed if comprimir else np.savez)(arquivo, **arrays)
+
+
+def _ler(arquivo, permitir_pickle=False):
+    """Lê um arquivo de '_gravar' de volta para o dicionário de arrays."""
+    with np.load(arquivo, allow_pickle=permitir_pickle) as npz:
+        metadados = json.loads(npz['metadados'].item())
+        n = metadados['num_vertices']
+        flags = np.unpackbits(npz['flags'], axis=1, count=n).astype(bool)
+
+        dados = {
+            chave: npz[chave] if chave in npz.files else None
+            for chave in ('indptr', 'indices', 'pesos', 'ids', 'coordenadas',
+                          'apagados', 'brigadistas', 'posicoes', 'agua',
+                          'fechadas', 'pesos_fechadas')
+        }
+        dados['flags'] = dict(zip(ATRIBUTOS, flags))
+        dados['fronteira'] = np.unpackbits(npz['fronteira'], count=n).astype(bool)
+
+    for chave in ('passo', 'intervalo', 'parametros', 'rng'):
+        dados[chave] = metadados[chave]
+    return dados
+
+
+def _aplicar(dados, deltas):
+    """Aplica, em ordem, os registros de delta ao dicionário de arrays."""
+    campos = deltas['campo']
+    indices = deltas['indice']
+    valores = deltas['valor']
+
+    for campo, atributo in enumerate(ATRIBUTOS):
+        selecao = campos == campo
+        _atribuir(dados['flags'][atributo], indices[selecao], valores[selecao] != 0)
+
+    selecao = campos == _FRONTEIRA
+    _atribuir(dados['fronteira'], indices[selecao], valores[selecao] != 0)
+
+    selecao = campos == _POSICAO
+    _atribuir(dados['posicoes'], indices[selecao], valores[selecao].astype(np.int64))
+
+    # A água só vira float se algum valor gravado não for inteiro
+    selecao = campos == _AGUA
+    if dados['agua'].dtype.kind != 'f' and np.any(valores[selecao] % 1):
+        dados['agua'] = dados['agua'].astype(np.float64)
+    _atribuir(dados['agua'], indices[selecao], valores[selecao])
+
+    dados['apagados'] = np.concatenate([dados['apagados'], indices[campos == _APAGADO]])
+
+    # Pesos inteiros viram float com um peso fracionário ou infinito
+    selecao = campos == _PESO
+    pesos = valores[selecao]
+    if dados['pesos'].dtype.kind != 'f' and (
+            np.any(~np.isfinite(pesos)) or np.any(pesos % 1)):
+        dados['pesos'] = dados['pesos'].astype(np.float64)
+    _atribuir(dados['pesos'], indices[selecao], pesos)
+
+    selecao = campos == _FECHADA
+    if np.any(selecao):
+        _aplicar_fechadas(dados, indices[selecao], valores[selecao])
+
+    # Cada registro do gerador traz todas as partes; vale o último
+    selecao = campos == _RNG
+    if np.any(selecao):
+        partes = _partes_rng(dados['rng'])
+        _atribuir(partes, indices[selecao], valores[selecao])
+        dados['rng'] = _restaurar_rng(dados['rng'], partes)
+
+
+def _aplicar_fechadas(dados, posicoes, pesos):
+    """Aplica, em ordem, os registros de arestas fechadas."""
+    fechadas = {}
+    if dados['fechadas'] is not None:
+        fechadas = dict(zip(map(tuple, dados['fechadas'].tolist()),
+                            dados['pesos_fechadas'].tolist()))
+
+    origens = np.searchsorted(dados['indptr'], posicoes, side='right') - 1
+    destinos = dados['indices'][posicoes]
+    for u, v, peso in zip(origens.tolist(), destinos.tolist(), pesos.tolist()):
+        if np.isnan(peso):
+            fechadas.pop((u, v), None)
+        else:
+            fechadas[(u, v)] = peso
+
+    dados['fechadas'] = np.array(list(fechadas), dtype=np.int64).reshape(-1, 2)
+    dados['pesos_fechadas'] = np.array(list(fechadas.values()), dtype=np.float64)
+
+
+def _atribuir(destino, indices, valores):
+    """Atribui 'valores' em 'indices'; com repetições, vale o último."""
+    _, ultimos = np.unique(indices[::-1], return_index=True)
+    ultimos = len(indices) - 1 - ultimos
+    destino[indices[ultimos]] = valores[ultimos].astype(destino.dtype)
+
+
+def _montar(dados, parametros):
+    """Cria a simulação descrita pelo dicionário de arrays."""
+    ids = None if dados['ids'] is None else dados['ids'].tolist()
+    estado = EstadoCompacto(dados['indptr'], dados['indices'], dados['pesos'], ids)
+    for atributo, flag in dados['flags'].items():
+        estado.flags[atributo] = flag
+    no = estado.no
+
+    opcoes = dict(dados['parametros'])
+    opcoes.update(parametros)
+    backend = opcoes.pop('backend')
+
+    # Sem postos na criação, os atributos gravados são mantidos como estão
+    simulacao = FirePreventionandFight(
+        grafo=estado if backend == 'compacto' else _para_networkx(estado),
+        backend=backend,
+        posicoes=dados['coordenadas'],
+        **opcoes
+    )
+
+    chaves = [no(i) for i in dados['brigadistas'].tolist()]
+    simulacao.postos_brigadistas = set(chaves)
+    simulacao.brigadistas = {
+        chave: (no(posicao), agua)
+        for chave, posicao, agua in zip(
+            chaves, dados['posicoes'].tolist(), dados['agua'].tolist()
+        )
+    }
+
+    simulacao.fogo_ativo = {no(i) for i in np.flatnonzero(dados['flags']['fogo']).tolist()}
+    simulacao.fronteira_fogo = {no(i) for i in np.flatnonzero(dados['fronteira']).tolist()}
+    simulacao.fogos_apagados = [no(i) for i in dados['apagados'].tolist()]
+
+    # Pesos originais das arestas fechadas (ausentes em arquivos antigos)
+    if dados['fechadas'] is not None:
+        simulacao.arestas_fechadas = {
+            (no(u), no(v)): peso
+            for (u, v), peso in zip(dados['fechadas'].tolist(),
+                                    dados['pesos_fechadas'].tolist())
+        }
+    simulacao.rng.bit_generator.state = dados['rng']
+
+    return Checkpoint(simulacao, dados['passo'])
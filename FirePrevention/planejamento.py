@@ -0,0 +1,250 @@
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from FirePrevention._compartilhado import anexar_array, compactar, compartilhar_array
+from FirePrevention.caminhos import CacheCaminhos
+from FirePrevention.estado import EstadoCompacto
+
+
+# Estado global de cada processo planejador, preenchido pelo inicializador
+_PLANEJADOR = {}
+
+
+class PlanejadorDespacho:
+    """
+    Busca em paralelo, em processos, os alvos de todos os brigadistas de um
+    turno de 'enviar_brigadistas'.
+
+    A topologia da simulação (em CSR, na mesma ordem de vértices e vizinhos
+    do grafo networkx, se for o caso) e uma cópia dos focos ativos ficam em
+    memória compartilhada. No início de cada turno os focos são copiados
+    para essa cópia, e cada processo responde às buscas sobre ela, com um
+    cache de árvores de caminhos próprio que continua valendo entre turnos.
+
+    O planejamento enxerga apenas os focos do início do turno; quem aplica
+    os deslocamentos, em ordem, é a simulação (ver 'enviar_brigadistas').
+
+    O planejador observa a simulação: cada peso alterado por
+    'alterar_peso', 'fechar_aresta' ou 'reabrir_aresta' é escrito direto
+    nos pesos compartilhados, e um contador de versão compartilhado faz os
+    processos descartarem seus caches na busca seguinte, sem recriá-los.
+    """
+
+    def __init__(self, simulacao, processos):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação planejada.
+        - processos (int): número de processos.
+        """
+        self.processos = processos
+        self.versao = simulacao.estado.versao
+        self._estado = simulacao.estado
+
+        estado = compactar(simulacao)
+        self._indice = estado.indice
+        self._num_vertices = len(estado)
+        self._indptr = estado.indptr
+        self._indices = estado.indices
+
+        self._memorias = []
+        self._executor = None
+        try:
+            # Pesos em float, para receber depois pesos fracionários e infinitos
+            topologia = {'ids': estado.ids, 'arrays': {}}
+            for chave, array in (('indptr', estado.indptr), ('indices', estado.indices),
+                                 ('pesos', estado.pesos.astype(np.float64))):
+                memoria, topologia['arrays'][chave] = compartilhar_array(array)
+                self._memorias.append(memoria)
+            self._memoria_pesos = memoria
+
+            # Alterações de peso feitas desde a criação, lidas pelos processos
+            memoria, topologia['arrays']['versao'] = compartilhar_array(
+                np.zeros(1, dtype=np.int64)
+            )
+            self._memorias.append(memoria)
+            self._memoria_versao = memoria
+
+            # Focos do turno, escritos aqui e lidos pelos processos
+            memoria, descritor = compartilhar_array(np.zeros(len(estado), dtype=bool))
+            self._memorias.append(memoria)
+            self._memoria_fogo = memoria
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=processos,
+                initializer=_inicializar_planejador,
+                initargs=(topologia, descritor, simulacao.caminhos.limite_nos)
+            )
+        except BaseException:
+            _liberar(self._executor, self._memorias)
+            raise
+
+        # Libera os processos e a memória mesmo sem uma chamada a 'fechar'
+        self._finalizador = weakref.finalize(
+            self, _liberar, self._executor, self._memorias
+        )
+        self._observados = simulacao.observadores
+        self._observados.append(self)
+
+    def fechar(self):
+        """Encerra os processos e libera a memória compartilhada."""
+        if self in self._observados:
+            self._observados.remove(self)
+        self._finalizador()
+
+    def aresta_alterada(self, u, v):
+        """
+        Aviso da simulação: escreve o novo peso da aresta (u, v), nos dois
+        sentidos, nos pesos compartilhados. Se o planejador já estava
+        desatualizado (ex.: após 'invalidar_caminhos'), nada é feito e ele
+        é refeito no próximo turno.
+        """
+        if self.versao + 1 != self._estado.versao:
+            return
+        self.versao = self._estado.versao
+
+        # As visões dos blocos são locais, para que eles possam ser fechados depois
+        pesos = np.ndarray(
+            len(self._indices), dtype=np.float64, buffer=self._memoria_pesos.buf
+        )
+        peso = self._estado.peso(u, v)
+        for i, j in ((u, v), (v, u)):
+            i, j = self._indice(i), self._indice(j)
+            inicio = self._indptr[i]
+            vizinhos = self._indices[inicio:self._indptr[i + 1]]
+            pesos[inicio + np.flatnonzero(vizinhos == j)] = peso
+
+        versao = np.ndarray(1, dtype=np.int64, buffer=self._memoria_versao.buf)
+        versao[0] += 1
+
+    def vertice_alterado(self, vertice):
+        """Pontos de água não entram nas buscas de focos."""
+
+    def atualizar_focos(self, focos):
+        """
+        Copia os focos ativos para a memória compartilhada, antes das buscas
+        de um turno.
+
+        Parâmetros:
+        - focos (iterable): vértices em chamas.
+        """
+        # A visão do bloco é local, para que ele possa ser fechado depois
+        fogo = np.ndarray(
+            self._num_vertices, dtype=bool, buffer=self._memoria_fogo.buf
+        )
+        fogo[:] = False
+        fogo[np.fromiter(map(self._indice, focos), dtype=np.int64)] = True
+
+    def mais_proximos(self, origens, k=None):
+        """
+        Foco mais próximo de cada origem (ou os 'k' mais próximos), sem
+        contar a própria origem, sobre os focos de 'atualizar_focos'.
+
+        Parâmetros:
+        - origens (list): posição de cada brigadista.
+        - k (int | None): None busca só o mais próximo, com o caminho.
+
+        Retorna:
+        - tuple(list, int): por origem, o resultado de
+        'CacheCaminhos.mais_proximo' (alvo, distância, caminho) ou de
+        'CacheCaminhos.mais_proximos' (pares alvo, distância); e o total de
+        vértices fixados pelas buscas.
+        """
+        return self._mapear(_buscar_focos, [(origem, k) for origem in origens])
+
+    def caminhos(self, pares):
+        """
+        Caminho mínimo de cada par (origem, destino).
+
+        Retorna:
+        - tuple(list, int): os caminhos e o total de vértices fixados.
+        """
+        return self._mapear(_buscar_caminho, pares)
+
+    def _mapear(self, funcao, tarefas):
+        """
+        Executa 'funcao' nas tarefas, um bloco contíguo por processo, e
+        devolve os resultados na ordem das tarefas.
+        """
+        if not tarefas:
+            return [], 0
+        tamanho = -(-len(tarefas) // self.processos)
+        blocos = [tarefas[i:i + tamanho] for i in range(0, len(tarefas), tamanho)]
+
+        resultados = []
+        fixados = 0
+        for parcial, vertices in self._executor.map(_executar_bloco, [funcao] * len(blocos), blocos):
+            resultados.extend(parcial)
+            fixados += vertices
+        return resultados, fixados
+
+
+def _liberar(executor, memorias):
+    """Encerra o executor e remove os blocos de memória compartilhada."""
+    if executor is not None:
+        executor.shutdown()
+    for memoria in memorias:
+        memoria.close()
+        memoria.unlink()
+    memorias.clear()
+
+
+def _inicializar_planejador(topologia, fogo, limite_nos):
+    """
+    Prepara o processo: anexa a topologia e a cópia dos focos uma única vez
+    e cria o cache de árvores de caminhos.
+    """
+    memorias = []
+    arrays = {}
+    for chave, descritor in topologia['arrays'].items():
+        memoria, arrays[chave] = anexar_array(descritor)
+        memorias.append(memoria)
+    memoria, arrays['fogo'] = anexar_array(fogo)
+    memorias.append(memoria)
+
+    estado = EstadoCompacto(
+        arrays['indptr'], arrays['indices'], arrays['pesos'], topologia['ids']
+    )
+    estado.flags['fogo'] = arrays['fogo']
+
+    _PLANEJADOR.update(
+        memorias=memorias, estado=estado, versao=arrays['versao'],
+        caminhos=CacheCaminhos(estado, limite_nos)
+    )
+
+
+def _executar_bloco(funcao, tarefas):
+    """
+    Executa um bloco de tarefas no processo.
+
+    Retorna:
+    - tuple(list, int): os resultados e os vértices fixados pelas buscas.
+    """
+    # Com pesos alterados desde a última busca, o cache é descartado
+    _PLANEJADOR['estado'].versao = int(_PLANEJADOR['versao'][0])
+
+    caminhos = _PLANEJADOR['caminhos']
+    antes = caminhos.vertices_fixados
+    resultados = [funcao(tarefa) for tarefa in tarefas]
+    return resultados, caminhos.vertices_fixados - antes
+
+
+def _buscar_focos(tarefa):
+    """Busca de um brigadista pelos focos mais próximos, no processo."""
+    origem, k = tarefa
+    estado = _PLANEJADOR['estado']
+    caminhos = _PLANEJADOR['caminhos']
+
+    def eh_foco(n):
+        return n != origem and estado.obter(n, 'fogo')
+
+    if k is None:
+        return caminhos.mais_proximo(origem, eh_foco)
+    return caminhos.mais_proximos(origem, eh_foco, k)
+
+
+def _buscar_caminho(tarefa):
+    """Caminho mínimo de um par (origem, destino), no processo."""
+    origem, destino = tarefa
+    return _PLANEJADOR['caminhos'].caminho(origem, destino)
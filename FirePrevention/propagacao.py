@@ -0,0 +1,315 @@
+import abc
+from collections import namedtuple
+
+import numpy as np
+
+from FirePrevention.estado import EstadoCompacto, arestas_csr
+
+
+# Resultado de 'PropagacaoEstocastica.simular_ensaios', um elemento por ensaio
+# (exceto 'frequencia', com um elemento por vértice)
+ResultadoEnsaios = namedtuple('ResultadoEnsaios', 'ignicoes queimados passos frequencia')
+
+
+class ModeloPropagacao(abc.ABC):
+    """
+    Interface dos modelos de propagação usados por 'propagar_fogo'.
+
+    Um modelo implementa 'propagar(simulacao)', que espalha o fogo a partir
+    dos focos da simulação, marca os novos focos no estado, atualiza
+    'fogo_ativo' e 'fronteira_fogo' e devolve a lista dos novos focos.
+    Pode também sobrescrever 'pode_propagar', usado para encerrar
+    simulações em que o fogo restante não muda mais.
+    """
+
+    @abc.abstractmethod
+    def propagar(self, simulacao):
+        """Espalha o fogo por um passo e devolve a lista dos novos focos."""
+
+    def pode_propagar(self, simulacao):
+        """
+        Diz se o fogo ainda pode alcançar algum vértice em uma chamada
+        futura de 'propagar'. Por padrão, se algum foco tem um vizinho que
+        pode pegar fogo (sem fogo, água, queima anterior ou posto).
+        """
+        estado = simulacao.estado
+        return any(
+            not (estado.obter(vizinho, 'fogo') or estado.obter(vizinho, 'agua') or
+                 estado.obter(vizinho, 'queimado') or
+                 estado.obter(vizinho, 'posto_brigadista'))
+            for foco in simulacao.fogo_ativo
+            for vizinho in estado.vizinhos(foco)
+        )
+
+
+class PropagacaoDeterministica(ModeloPropagacao):
+    """
+    Modelo original: todo vizinho elegível pega fogo, em largura (BFS) a
+    partir da frente de fogo, avançando 'simulacao.raio_propagacao' saltos
+    por chamada (sem limite quando None).
+    """
+
+    def propagar(self, simulacao):
+        estado = simulacao.estado
+        fronteira = simulacao.fronteira_fogo
+        novos_focos = []
+        saltos = 0
+
+        while fronteira and (
+                simulacao.raio_propagacao is None or saltos < simulacao.raio_propagacao):
+            proxima_fronteira = []
+
+            for atual in fronteira:
+                for vizinho in estado.vizinhos(atual):
+                    if (not estado.obter(vizinho, 'fogo') and
+                        not estado.obter(vizinho, 'agua') and
+                        not estado.obter(vizinho, 'queimado') and
+                        not estado.obter(vizinho, 'posto_brigadista')):
+
+                        # Marca o vizinho como novo foco
+                        estado.definir(vizinho, 'fogo', True)
+                        proxima_fronteira.append(vizinho)
+
+            novos_focos.extend(proxima_fronteira)
+            fronteira = proxima_fronteira
+            saltos += 1
+
+        # Os focos da última camada ainda não espalharam e formam a nova frente
+        simulacao.fronteira_fogo = set(fronteira)
+
+        # Atualiza o conjunto de fogo ativo
+        simulacao.fogo_ativo.update(novos_focos)
+
+        return novos_focos
+
+    def pode_propagar(self, simulacao):
+        """Só a frente de fogo ainda espalha o fogo neste modelo."""
+        return bool(simulacao.fronteira_fogo)
+
+
+class PropagacaoEstocastica(ModeloPropagacao):
+    """
+    Propagação probabilística e vetorizada sobre a adjacência CSR de um
+    'EstadoCompacto'.
+
+    A cada passo, todo vértice em chamas tenta incendiar cada vizinho
+    elegível uma vez, com probabilidade
+
+        p(u -> v) = 1 - exp(-intensidade * combustivel[v] * vento(u, v) / peso)
+
+    em que 'vento(u, v) = exp(forca_vento * cos θ)', sendo θ o ângulo entre
+    a aresta u -> v e a direção do vento (1 sem coordenadas). Arestas
+    curtas, vértices com mais combustível e arestas a favor do vento
+    propagam mais; combustível zero torna o vértice não inflamável.
+
+    As probabilidades de todas as entradas do CSR são calculadas uma vez.
+    Um passo reúne as arestas de todos os focos com índices vetorizados e
+    sorteia todas de uma vez com o 'np.random.Generator' da simulação.
+    Um produto da adjacência esparsa pela frente de fogo (como o do
+    'scipy.sparse') daria só totais por vértice, e o sorteio precisa de
+    cada aresta; por isso o modelo usa o CSR diretamente e não depende do
+    scipy. 'simular_ensaios' faz o mesmo para muitos ensaios independentes
+    ao mesmo tempo.
+    """
+
+    def __init__(
+            self,
+            estado,
+            intensidade=1.0,
+            combustivel=None,
+            vento=0.0,
+            forca_vento=0.0,
+            coordenadas=None
+        ):
+        """
+        Parâmetros:
+        - estado (EstadoCompacto): estado sobre o qual o fogo se espalha.
+        - intensidade (float): escala geral das probabilidades.
+        - combustivel (np.ndarray | None): combustível de cada vértice, na
+        ordem dos índices (1 para todos por padrão).
+        - vento (float): direção para onde o vento sopra, em radianos.
+        - forca_vento (float): influência do vento (0 desliga).
+        - coordenadas (np.ndarray | None): posições (n, 2) dos vértices, na
+        ordem dos índices, usadas para a direção das arestas.
+        """
+        if not isinstance(estado, EstadoCompacto):
+            raise ValueError("PropagacaoEstocastica requer o backend 'compacto'.")
+
+        self.estado = estado
+        self.intensidade = intensidade
+        self.combustivel = (
+            np.ones(len(estado)) if combustivel is None
+            else np.asarray(combustivel, dtype=np.float64)
+        )
+        self.vento = vento
+        self.forca_vento = forca_vento
+        self.coordenadas = (
+            None if coordenadas is None else np.asarray(coordenadas, dtype=np.float64)
+        )
+
+        self._versao = None
+        self._probabilidades = None
+
+    @property
+    def probabilidades(self):
+        """
+        Probabilidade de cada entrada do CSR, recalculada se os pesos do
+        estado mudarem.
+        """
+        estado = self.estado
+        if self._versao != estado.versao:
+            self._versao = estado.versao
+            origens = np.repeat(np.arange(len(estado)), np.diff(estado.indptr))
+            destinos = estado.indices
+
+            taxa = self.intensidade * self.combustivel[destinos] / estado.pesos
+            if self.coordenadas is not None and self.forca_vento:
+                direcao = self.coordenadas[destinos] - self.coordenadas[origens]
+                comprimento = np.linalg.norm(direcao, axis=1)
+                cosseno = np.divide(
+                    direcao @ np.array([np.cos(self.vento), np.sin(self.vento)]),
+                    comprimento, out=np.zeros(len(destinos)), where=comprimento > 0
+                )
+                taxa = taxa * np.exp(self.forca_vento * cosseno)
+
+            self._probabilidades = -np.expm1(-taxa)
+        return self._probabilidades
+
+    def propagar(self, simulacao):
+        """
+        Avança um passo na simulação: cada foco ativo tenta incendiar os
+        vizinhos, independentemente de 'raio_propagacao'. Os sorteios usam
+        'simulacao.rng', então a simulação é reprodutível pela semente.
+        """
+        estado = self.estado
+        if simulacao.estado is not estado:
+            raise ValueError("O modelo foi criado para outro estado.")
+
+        fontes = np.sort(np.fromiter(
+            (estado.indice(no) for no in simulacao.fogo_ativo), dtype=np.int64
+        ))
+        posicoes, _ = self._arestas(fontes)
+        sorteados = simulacao.rng.random(len(posicoes)) < self.probabilidades[posicoes]
+
+        flags = estado.flags
+        alvos = np.unique(estado.indices[posicoes[sorteados]])
+        alvos = alvos[~(flags['fogo'][alvos] | flags['agua'][alvos] |
+                        flags['queimado'][alvos] | flags['posto_brigadista'][alvos])]
+        flags['fogo'][alvos] = True
+
+        novos_focos = [estado.no(i) for i in alvos.tolist()]
+        simulacao.fronteira_fogo = set(novos_focos)
+        simulacao.fogo_ativo.update(novos_focos)
+        return novos_focos
+
+    def pode_propagar(self, simulacao):
+        """
+        Diz se algum foco tem uma aresta de probabilidade positiva até um
+        vizinho que ainda pode pegar fogo.
+        """
+        estado = self.estado
+        fontes = np.sort(np.fromiter(
+            (estado.indice(no) for no in simulacao.fogo_ativo), dtype=np.int64
+        ))
+        posicoes, _ = self._arestas(fontes)
+        alvos = estado.indices[posicoes]
+        flags = estado.flags
+        elegiveis = ~(flags['fogo'][alvos] | flags['agua'][alvos] |
+                      flags['queimado'][alvos] | flags['posto_brigadista'][alvos])
+        return bool(np.any(elegiveis & (self.probabilidades[posicoes] > 0)))
+
+    def simular_ensaios(
+            self,
+            ignicoes,
+            num_ensaios=None,
+            max_passos=100,
+            tempo_queima=1,
+            semente=None
+        ):
+        """
+        Executa muitos ensaios independentes de propagação, sem brigadistas,
+        avançando todos juntos a cada passo com operações sobre arrays.
+
+        Cada vértice queima por 'tempo_queima' passos, tentando incendiar
+        os vizinhos em cada um, e depois fica queimado. Pontos de água,
+        postos e vértices já queimados no estado servem de barreira.
+
+        Parâmetros:
+        - ignicoes (int | array): vértice de ignição de cada ensaio, ou um
+        único vértice repetido em 'num_ensaios' ensaios.
+        - num_ensaios (int | None): número de ensaios quando 'ignicoes' é
+        um único vértice.
+        - max_passos (int): limite de passos.
+        - tempo_queima (int): passos que cada vértice passa em chamas.
+        - semente (int | np.random.Generator | None): semente dos sorteios.
+
+        Retorna:
+        - ResultadoEnsaios: ignição, vértices atingidos e passos até o fogo
+        se extinguir em cada ensaio, e a fração dos ensaios em que cada
+        vértice foi atingido.
+        """
+        estado = self.estado
+        rng = np.random.default_rng(semente)
+        n = len(estado)
+
+        ignicoes = np.atleast_1d(np.asarray(ignicoes))
+        if num_ensaios is not None and len(ignicoes) == 1:
+            ignicoes = np.repeat(ignicoes, num_ensaios)
+        indices_ignicao = np.fromiter(
+            (estado.indice(no) for no in ignicoes.tolist()), dtype=np.int64
+        )
+        total = len(ignicoes)
+
+        flags = estado.flags
+        barreira = (flags['agua'] | flags['posto_brigadista'] | flags['queimado'] |
+                    (self.combustivel <= 0))
+        probabilidades = self.probabilidades
+
+        # Estado de todos os ensaios em arrays planos: posição t * n + v
+        queimando = np.zeros(total * n, dtype=bool)
+        atingido = np.zeros(total * n, dtype=bool)
+        restante = np.zeros(total * n, dtype=np.int32)
+        passos = np.zeros(total, dtype=np.int64)
+
+        inicio = np.arange(total) * n + indices_ignicao
+        inicio = inicio[~barreira[indices_ignicao]]
+        queimando[inicio] = True
+        atingido[inicio] = True
+        restante[inicio] = tempo_queima
+
+        for passo in range(1, max_passos + 1):
+            ativos = np.flatnonzero(queimando)
+            if len(ativos) == 0:
+                break
+            ensaio, vertice = np.divmod(ativos, n)
+            passos[np.unique(ensaio)] = passo
+
+            # Sorteio de todas as arestas que saem de focos, em todos os ensaios
+            posicoes, dono = self._arestas(vertice)
+            sorteados = rng.random(len(posicoes)) < probabilidades[posicoes]
+            vizinhos = estado.indices[posicoes[sorteados]]
+            alvos = ensaio[dono[sorteados]] * n + vizinhos
+            alvos = alvos[~barreira[vizinhos] & ~atingido[alvos]]
+
+            # Focos que esgotaram o tempo de queima se apagam
+            restante[ativos] -= 1
+            queimando[ativos[restante[ativos] == 0]] = False
+
+            queimando[alvos] = True
+            atingido[alvos] = True
+            restante[alvos] = tempo_queima
+
+        atingido = atingido.reshape(total, n)
+        return ResultadoEnsaios(
+            ignicoes=ignicoes,
+            queimados=atingido.sum(axis=1),
+            passos=passos,
+            frequencia=atingido.mean(axis=0),
+        )
+
+    def _arestas(self, fontes):
+        """
+        Posições no CSR de todas as arestas que saem de 'fontes' e, para
+        cada uma, a posição da fonte correspondente em 'fontes'.
+        """
+        return arestas_csr(self.estado.indptr, fontes)
@@ -0,0 +1,182 @@
+import heapq
+from itertools import count
+
+
+class IndiceRecarga:
+    """
+    Índice do ponto de reabastecimento mais próximo de cada vértice.
+
+    É construído com um único Dijkstra de múltiplas fontes, partindo ao mesmo
+    tempo de todos os pontos de água e postos de brigadistas. Para cada
+    vértice alcançável guarda a distância até o ponto mais próximo, qual é
+    esse ponto e o próximo vértice no caminho até ele, de modo que o caminho
+    completo é obtido seguindo esses ponteiros, em tempo proporcional ao
+    seu comprimento.
+    """
+
+    def __init__(self, vizinhos, fontes):
+        """
+        Parâmetros:
+        - vizinhos (callable): função que recebe um vértice e devolve pares
+        (vizinho, peso) das arestas incidentes.
+        - fontes (iterable): pontos de reabastecimento iniciais.
+        """
+        self._vizinhos = vizinhos
+        self._contador = count()
+
+        # Distância, ponto de reabastecimento e próximo vértice de cada nó
+        self.distancia = {}
+        self.fonte = {}
+        self.proximo = {}
+        self.fontes = set()
+
+        # Execuções de Dijkstra (construção e atualizações) e vértices
+        # fixados por elas, para a instrumentação
+        self.buscas = 0
+        self.vertices_fixados = 0
+
+        heap = []
+        for fonte in fontes:
+            self._semear(heap, fonte)
+        self._relaxar(heap)
+
+    def caminho(self, origem):
+        """
+        Retorna o caminho de 'origem' até o ponto de reabastecimento mais
+        próximo (incluindo os dois extremos), ou None se não houver.
+        """
+        if origem not in self.distancia:
+            return None
+
+        caminho = [origem]
+        while self.proximo[caminho[-1]] is not None:
+            caminho.append(self.proximo[caminho[-1]])
+        return caminho
+
+    def adicionar(self, fonte):
+        """
+        Inclui um novo ponto de reabastecimento. Só os vértices que ficam
+        mais próximos dele do que do ponto anterior são atualizados.
+        """
+        if fonte in self.fontes:
+            return
+        heap = []
+        self._semear(heap, fonte)
+        self._relaxar(heap)
+
+    def remover(self, fonte):
+        """
+        Retira um ponto de reabastecimento. Apenas a região que era servida
+        por ele é recalculada, a partir das regiões vizinhas.
+        """
+        if fonte not in self.fontes:
+            return
+        self.fontes.discard(fonte)
+
+        # A região servida por 'fonte' é conexa e contém a própria fonte
+        regiao = {fonte}
+        pendentes = [fonte]
+        while pendentes:
+            atual = pendentes.pop()
+            for vizinho, _ in self._vizinhos(atual):
+                if vizinho not in regiao and self.fonte.get(vizinho) == fonte:
+                    regiao.add(vizinho)
+                    pendentes.append(vizinho)
+
+        self._recalcular(regiao)
+
+    def aresta_alterada(self, u, v, peso_antigo, peso):
+        """
+        Atualiza o índice depois que o peso da aresta (u, v) mudou no grafo
+        (peso infinito fecha a aresta).
+
+        Uma redução só melhora vértices a partir do extremo que passa a
+        alcançar o outro mais barato, e a melhora se espalha como no
+        Dijkstra. Um aumento só afeta quem chegava ao reabastecimento por
+        essa aresta: a subárvore pendurada nela, cujos valores são
+        recalculados a partir dos vizinhos fora dela.
+        """
+        if peso < peso_antigo:
+            heap = []
+            for a, b in ((u, v), (v, u)):
+                if a in self.distancia:
+                    distancia = self.distancia[a] + peso
+                    if distancia < self.distancia.get(b, float('inf')):
+                        self.distancia[b] = distancia
+                        self.fonte[b] = self.fonte[a]
+                        self.proximo[b] = a
+                        heapq.heappush(heap, (distancia, next(self._contador), b))
+            if heap:
+                self._relaxar(heap)
+            return
+
+        for a, b in ((u, v), (v, u)):
+            if a in self.proximo and self.proximo[a] == b:
+                # Vértices cujo caminho passa por 'a' (e, portanto, pela aresta)
+                regiao = {a}
+                pendentes = [a]
+                while pendentes:
+                    atual = pendentes.pop()
+                    for vizinho, _ in self._vizinhos(atual):
+                        if vizinho not in regiao and self.proximo.get(vizinho) == atual:
+                            regiao.add(vizinho)
+                            pendentes.append(vizinho)
+                self._recalcular(regiao)
+                return
+
+    def _recalcular(self, regiao):
+        """
+        Descarta os valores dos vértices de 'regiao' e os recalcula a partir
+        dos vizinhos fora dela, cujos valores continuam corretos.
+        """
+        for vertice in regiao:
+            del self.distancia[vertice]
+            del self.fonte[vertice]
+            del self.proximo[vertice]
+
+        heap = []
+        for vertice in regiao:
+            for vizinho, peso in self._vizinhos(vertice):
+                if vizinho in regiao or vizinho not in self.distancia:
+                    continue
+                distancia = self.distancia[vizinho] + peso
+                if distancia < self.distancia.get(vertice, float('inf')):
+                    self.distancia[vertice] = distancia
+                    self.fonte[vertice] = self.fonte[vizinho]
+                    self.proximo[vertice] = vizinho
+                    heapq.heappush(heap, (distancia, next(self._contador), vertice))
+
+        self._relaxar(heap)
+
+    def _semear(self, heap, fonte):
+        """Marca 'fonte' como ponto de reabastecimento à distância zero."""
+        self.fontes.add(fonte)
+        self.distancia[fonte] = 0
+        self.fonte[fonte] = fonte
+        self.proximo[fonte] = None
+        heapq.heappush(heap, (0, next(self._contador), fonte))
+
+    def _relaxar(self, heap):
+        """
+        Dijkstra a partir das entradas em 'heap', atualizando apenas os
+        vértices cuja distância diminui.
+        """
+        fixados = 0
+        while heap:
+            distancia, _, atual = heapq.heappop(heap)
+            if distancia > self.distancia[atual]:
+                continue
+            fixados += 1
+
+            for vizinho, peso in self._vizinhos(atual):
+                nova_distancia = distancia + peso
+                if nova_distancia < self.distancia.get(vizinho, float('inf')):
+                    self.distancia[vizinho] = nova_distancia
+                    self.fonte[vizinho] = self.fonte[atual]
+                    self.proximo[vizinho] = atual
+                    heapq.heappush(
+                        heap, (nova_distancia, next(self._contador), vizinho)
+                    )
+
+        self.buscas += 1
+        self.vertices_fixados += fixados
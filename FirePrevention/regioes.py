@@ -0,0 +1,719 @@
+import multiprocessing
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from FirePrevention._compartilhado import (
+    anexar_array,
+    compartilhar_array,
+    compartilhar_estado,
+)
+from FirePrevention.caminhos import ArvoreCaminhos
+from FirePrevention.estado import ATRIBUTOS, EstadoCompacto, arestas_csr
+from FirePrevention.eventos import (
+    FogoApagado,
+    FogoIncontrolavel,
+    Passo,
+    Reabastecimento,
+    SemReabastecimento,
+    Transferencia,
+)
+from FirePrevention.FirePrevention import FirePreventionandFight
+
+
+# Estado final reunido de todas as regiões por 'SimulacaoRegional.coletar'
+ResultadoRegional = namedtuple(
+    'ResultadoRegional', 'fogo_ativo queimados fogos_apagados brigadistas'
+)
+
+
+def particionar(estado, num_regioes, iteracoes=10, tolerancia=0.05, semente=None):
+    """
+    Divide os vértices em regiões compactas e de tamanhos parecidos, com
+    poucas arestas entre regiões.
+
+    Primeiro as regiões crescem em largura (BFS simultâneo) a partir de
+    vértices sorteados, até a capacidade de '(1 + tolerancia) * n /
+    num_regioes' vértices cada. Depois, rodadas de propagação de rótulos
+    movem cada vértice para a região da maioria dos seus vizinhos, quando
+    isso reduz as arestas de fronteira e a região de destino tem vaga.
+    Tudo é feito com operações vetorizadas sobre o CSR.
+
+    Parâmetros:
+    - estado (EstadoCompacto): grafo a dividir.
+    - num_regioes (int): número de regiões.
+    - iteracoes (int): rodadas de propagação de rótulos.
+    - tolerancia (float): folga de tamanho permitida a cada região.
+    - semente (int | None): semente do sorteio dos vértices iniciais.
+
+    Retorna:
+    - np.ndarray: região de cada vértice, na ordem dos índices.
+    """
+    rng = np.random.default_rng(semente)
+    n = len(estado)
+    indptr, indices = estado.indptr, estado.indices
+    capacidade = int(np.ceil((1 + tolerancia) * n / num_regioes))
+
+    rotulos = np.full(n, -1, dtype=np.int32)
+    tamanhos = np.zeros(num_regioes, dtype=np.int64)
+
+    # Crescimento em largura a partir de um vértice sorteado por região
+    fronteira = rng.choice(n, size=min(num_regioes, n), replace=False)
+    rotulos[fronteira] = np.arange(len(fronteira))
+    tamanhos[:len(fronteira)] = 1
+    livres = n - len(fronteira)
+
+    while livres:
+        if len(fronteira) == 0:
+            # Componente não alcançada ou regiões vizinhas cheias: recomeça
+            # de um vértice livre qualquer, pela menor região
+            sem_rotulo = np.flatnonzero(rotulos < 0)
+            fronteira = sem_rotulo[rng.integers(len(sem_rotulo))][None]
+            menor = np.argmin(tamanhos)
+            rotulos[fronteira] = menor
+            tamanhos[menor] += 1
+            livres -= 1
+            continue
+
+        posicoes, dono = arestas_csr(indptr, fronteira)
+        alvos = indices[posicoes].astype(np.int64)
+        candidatos = rotulos[fronteira][dono]
+        livre = rotulos[alvos] < 0
+        alvos, primeiro = np.unique(alvos[livre], return_index=True)
+        candidatos = candidatos[livre][primeiro]
+
+        aceito = _limitar(candidatos, capacidade - tamanhos)
+        alvos, candidatos = alvos[aceito], candidatos[aceito]
+        rotulos[alvos] = candidatos
+        tamanhos += np.bincount(candidatos, minlength=num_regioes)
+        livres -= len(alvos)
+        fronteira = alvos
+
+    # Propagação de rótulos com limite de tamanho
+    origens = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    for _ in range(iteracoes):
+        # Votos de cada vértice em cada região vizinha
+        chaves, votos = np.unique(
+            origens * num_regioes + rotulos[indices], return_counts=True
+        )
+        vertices, regioes = np.divmod(chaves, num_regioes)
+        atuais = np.zeros(n, dtype=np.int64)
+        proprios = regioes == rotulos[vertices]
+        atuais[vertices[proprios]] = votos[proprios]
+
+        # Região mais votada de cada vértice
+        ordem = np.lexsort((-votos, vertices))
+        vertices, regioes, votos = vertices[ordem], regioes[ordem], votos[ordem]
+        melhor = np.r_[True, vertices[1:] != vertices[:-1]]
+        vertices, regioes, votos = vertices[melhor], regioes[melhor], votos[melhor]
+
+        # Só metade dos candidatos se move por rodada, evitando que vizinhos
+        # troquem de região um com o outro indefinidamente
+        ganho = votos - atuais[vertices]
+        mover = (ganho > 0) & (rng.random(len(vertices)) < 0.5)
+        ordem = np.argsort(-ganho[mover], kind='stable')
+        vertices, regioes = vertices[mover][ordem], regioes[mover][ordem]
+
+        aceito = _limitar(regioes, capacidade - tamanhos)
+        vertices, regioes = vertices[aceito], regioes[aceito].astype(np.int32)
+        if len(vertices) == 0:
+            break
+        tamanhos -= np.bincount(rotulos[vertices], minlength=num_regioes)
+        tamanhos += np.bincount(regioes, minlength=num_regioes)
+        rotulos[vertices] = regioes
+
+    return rotulos
+
+
+def _limitar(rotulos, vagas):
+    """
+    Máscara que aceita, na ordem dada, no máximo 'vagas[r]' elementos de
+    cada rótulo r.
+    """
+    ordem = np.argsort(rotulos, kind='stable')
+    ordenados = rotulos[ordem]
+    posto = np.arange(len(rotulos)) - np.searchsorted(ordenados, ordenados)
+    aceito = np.empty(len(rotulos), dtype=bool)
+    aceito[ordem] = posto < vagas[ordenados]
+    return aceito
+
+
+class SimulacaoRegional:
+    """
+    Simulação dividida em regiões, cada uma em um processo trabalhador.
+
+    Cada região é uma 'FirePreventionandFight' compacta sobre o subgrafo dos
+    seus vértices, que conhece também as arestas que saem dela. As buscas de
+    caminhos e a propagação ficam restritas à região, e a cada passo o
+    coordenador troca com os trabalhadores apenas o que cruza fronteiras:
+
+    - propagação: cada região avança o fogo um salto e devolve os vizinhos
+    de outras regiões alcançados pela sua frente de fogo; os donos desses
+    vértices os incendeiam no mesmo salto. O resultado é o mesmo da
+    propagação em largura sobre o grafo inteiro.
+    - despacho: os brigadistas atendem apenas focos da própria região. Os de
+    uma região sem focos seguem pela saída mais barata (caminho até a
+    fronteira mais o peso da aresta que a cruza) rumo a uma região em
+    chamas e passam a ela (evento 'Transferencia').
+    - verificação global: quando nenhuma região avança, o coordenador
+    procura no grafo inteiro brigadistas que alcancem os focos restantes e
+    os passa às regiões desses focos, que os apagam; só sem nenhum o fogo
+    é declarado incontrolável.
+
+    Sem a visão global, o despacho pode diferir do de uma única simulação,
+    e a propagação é sempre a determinística.
+    """
+
+    def __init__(
+            self,
+            grafo,
+            num_regioes=None,
+            processos=None,
+            rotulos=None,
+            postos_brigadistas=None,
+            pontos_agua=None,
+            raio_propagacao=None,
+            semente=None,
+            **parametros
+        ):
+        """
+        Parâmetros:
+        - grafo (nx.Graph | EstadoCompacto): grafo completo.
+        - num_regioes (int | None): número de regiões (por padrão, o número
+        de processos ou de núcleos).
+        - processos (int | None): número de processos trabalhadores; cada um
+        cuida de uma ou mais regiões. 1 executa tudo no processo atual.
+        - rotulos (np.ndarray | None): região de cada vértice, na ordem dos
+        índices; por padrão calculada por 'particionar'.
+        - postos_brigadistas, pontos_agua (list | None): como em
+        FirePreventionandFight, com os vértices originais.
+        - raio_propagacao (int | None): saltos do fogo por passo.
+        - semente (int | None): semente da partição e das regiões.
+        - parametros: demais argumentos de FirePreventionandFight
+        (capacidade_caminhoes, consumo_por_fogo, modo_despacho, ...).
+        """
+        estado = grafo if isinstance(grafo, EstadoCompacto) else EstadoCompacto.de_grafo(grafo)
+
+        num_regioes = num_regioes or processos or os.cpu_count()
+        if rotulos is None:
+            rotulos = particionar(estado, num_regioes, semente=semente)
+        self.rotulos = np.asarray(rotulos, dtype=np.int32)
+        self.num_regioes = num_regioes
+        self.raio_propagacao = raio_propagacao
+        self.consumo_por_fogo = parametros.get('consumo_por_fogo', 1)
+        self.estado = estado
+
+        # Postos, pontos de água e semente de cada região
+        postos = [[] for _ in range(num_regioes)]
+        agua = [[] for _ in range(num_regioes)]
+        for p in postos_brigadistas or []:
+            postos[self.regiao(p)].append(p)
+        for p in pontos_agua or []:
+            agua[self.regiao(p)].append(p)
+        sementes = np.random.SeedSequence(semente).spawn(num_regioes)
+        configuracoes = {
+            r: (postos[r], agua[r], dict(parametros, semente=sementes[r]))
+            for r in range(num_regioes)
+        }
+
+        # Focos ativos por região, atualizados a cada troca com as regiões
+        self.focos = dict.fromkeys(range(num_regioes), 0)
+
+        # Brigadistas a caminho de outra região, entregues no próximo despacho
+        self._chegadas = {}
+
+        processos = min(processos or num_regioes, num_regioes)
+        self._regioes = None
+        self._trabalhadores = []
+        if processos == 1:
+            self._regioes = {
+                r: _Regiao(estado, self.rotulos, r, *configuracoes[r])
+                for r in range(num_regioes)
+            }
+        else:
+            self._iniciar_trabalhadores(processos, configuracoes)
+
+    def _iniciar_trabalhadores(self, processos, configuracoes):
+        """
+        Coloca a topologia em memória compartilhada e inicia um processo por
+        grupo de regiões. Cada trabalhador copia só o subgrafo das suas
+        regiões, então a memória compartilhada é liberada após a criação.
+        """
+        memorias, topologia = compartilhar_estado(self.estado)
+        try:
+            memoria, topologia['arrays']['rotulos'] = compartilhar_array(self.rotulos)
+            memorias.append(memoria)
+
+            for trabalhador in range(processos):
+                regioes = list(range(trabalhador, self.num_regioes, processos))
+                conexao, conexao_filho = multiprocessing.Pipe()
+                processo = multiprocessing.Process(
+                    target=_executar_trabalhador,
+                    args=(conexao_filho, topologia,
+                          {r: configuracoes[r] for r in regioes}),
+                    daemon=True
+                )
+                processo.start()
+                self._trabalhadores.append((processo, conexao, regioes))
+
+            # Aguarda todos montarem suas regiões antes de liberar a memória
+            for _, conexao, _ in self._trabalhadores:
+                _receber(conexao)
+        except BaseException:
+            self.fechar()
+            raise
+        finally:
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def fechar(self):
+        """Encerra os processos trabalhadores."""
+        for processo, conexao, _ in self._trabalhadores:
+            if processo.is_alive():
+                conexao.send((None, None))
+            processo.join()
+            conexao.close()
+        self._trabalhadores = []
+
+    @property
+    def focos_ativos(self):
+        """Total de focos ativos em todas as regiões."""
+        return sum(self.focos.values())
+
+    def regiao(self, vertice):
+        """Retorna a região do vértice 'vertice'."""
+        return int(self.rotulos[self.estado.indice(vertice)])
+
+    def _chamar(self, metodo, argumentos):
+        """
+        Chama 'metodo' nas regiões de 'argumentos' ({região: argumentos}),
+        em paralelo nos trabalhadores.
+
+        Retorna:
+        - dict: resultado de cada região.
+        """
+        if self._regioes is not None:
+            return {
+                r: getattr(self._regioes[r], metodo)(*args)
+                for r, args in argumentos.items()
+            }
+
+        chamados = []
+        for _, conexao, regioes in self._trabalhadores:
+            parte = {r: argumentos[r] for r in regioes if r in argumentos}
+            if parte:
+                conexao.send((metodo, parte))
+                chamados.append(conexao)
+
+        respostas = {}
+        for conexao in chamados:
+            respostas.update(_receber(conexao))
+        return respostas
+
+    def simular_iter(self, inicio_fogo, max_passos=None):
+        """
+        Executa a simulação por regiões, produzindo um registro por passo,
+        como 'FirePreventionandFight.simular_iter'.
+
+        Parâmetros:
+        - inicio_fogo (int): vértice onde o fogo começa.
+        - max_passos (int | None): limite opcional de passos após o inicial.
+
+        Retorna:
+        - Gerador de 'Passo', com os novos focos e os eventos de todas as
+        regiões (em ordem de região) e o total de focos ativos. Termina
+        também quando um passo não muda mais nada (fogo fora do alcance
+        dos brigadistas e sem ter para onde se espalhar), com um evento
+        'FogoIncontrolavel' no último passo.
+        """
+        regiao = self.regiao(inicio_fogo)
+        aceitos, self.focos[regiao] = self._chamar(
+            'iniciar', {regiao: ([inicio_fogo],)}
+        )[regiao]
+        yield Passo(1, aceitos, [], self.focos_ativos)
+
+        estado = 2
+        while self.focos_ativos and (max_passos is None or estado <= max_passos + 1):
+            novos_focos, parado = self._propagar()
+
+            # Todas as regiões despacham, pois as sem fogo podem ceder brigadistas
+            com_fogo = {r for r, focos in self.focos.items() if focos}
+            respostas = self._chamar('despachar', {
+                r: (com_fogo, self._chegadas.get(r, []))
+                for r in range(self.num_regioes)
+            })
+
+            eventos = []
+            self._chegadas = {}
+            for r in sorted(respostas):
+                eventos_regiao, transferencias, self.focos[r] = respostas[r]
+                eventos.extend(eventos_regiao)
+                for destino, brigadista, vertice, agua in transferencias:
+                    self._chegadas.setdefault(destino, []).append(
+                        (brigadista, vertice, agua)
+                    )
+
+            # Com a frente de fogo esgotada, sem ação de brigadistas e sem
+            # transferências em curso, nada muda nos próximos passos dentro
+            # das regiões: o fogo restante só é inalcançável se nenhum
+            # brigadista chegar a ele pelo grafo inteiro
+            estagnado = (
+                self.focos_ativos and parado and not self._chegadas and
+                not any(not isinstance(e, SemReabastecimento) for e in eventos)
+            )
+            if estagnado:
+                resultado = self.coletar()
+                socorros = self._socorrer(resultado)
+                eventos.extend(socorros)
+                estagnado = not socorros
+                if estagnado:
+                    eventos.append(FogoIncontrolavel(sorted(resultado.fogo_ativo)))
+
+            yield Passo(estado, novos_focos, eventos, self.focos_ativos)
+            if estagnado:
+                break
+            estado += 1
+
+    def _propagar(self):
+        """
+        Avança o fogo até 'raio_propagacao' saltos. Em cada salto, as regiões
+        em chamas propagam internamente e os vizinhos de outras regiões
+        alcançados são incendiados pelos seus donos.
+
+        Retorna:
+        - tuple(list, bool): novos focos de todas as regiões e se o último
+        salto não alcançou nenhum vértice (a frente de fogo se esgotou).
+        """
+        novos_focos = []
+        salto = []
+        saltos = 0
+        while self.raio_propagacao is None or saltos < self.raio_propagacao:
+            respostas = self._chamar('propagar', {
+                r: () for r, focos in self.focos.items() if focos
+            })
+
+            salto = []
+            pedidos = {}
+            for r in sorted(respostas):
+                novos, pedidos_regiao, self.focos[r] = respostas[r]
+                salto.extend(novos)
+                for destino, vertices in pedidos_regiao.items():
+                    pedidos.setdefault(destino, []).extend(vertices)
+
+            if pedidos:
+                respostas = self._chamar('iniciar', {
+                    r: (vertices,) for r, vertices in pedidos.items()
+                })
+                for r in sorted(respostas):
+                    aceitos, self.focos[r] = respostas[r]
+                    salto.extend(aceitos)
+
+            if not salto:
+                break
+            novos_focos.extend(salto)
+            saltos += 1
+        return novos_focos, not salto
+
+    def _socorrer(self, resultado):
+        """
+        Verificação global feita quando nenhuma região avança sozinha: cada
+        brigadista com água busca, no grafo inteiro, o foco restante mais
+        próximo ainda não atribuído, passa à região dele e o apaga.
+
+        Parâmetros:
+        - resultado (ResultadoRegional): estado reunido por 'coletar'.
+
+        Retorna:
+        - list: eventos 'Transferencia' dos brigadistas enviados, seguidos
+        dos focos apagados por eles.
+        """
+        restantes = set(resultado.fogo_ativo)
+        cedidos, socorros = {}, {}
+        eventos = []
+        for brigadista, (posicao, agua) in resultado.brigadistas.items():
+            if agua < self.consumo_por_fogo or not restantes:
+                continue
+            arvore = ArvoreCaminhos(self.estado.vizinhos_ponderados, posicao)
+            foco, _, caminho = arvore.mais_proximo(restantes.__contains__)
+            if foco is None:
+                continue
+
+            restantes.discard(foco)
+            regiao = self.regiao(foco)
+            cedidos.setdefault(self.regiao(posicao), []).append(brigadista)
+            socorros.setdefault(regiao, []).append((brigadista, foco, agua))
+            eventos.append(Transferencia(brigadista, caminho, regiao, agua))
+
+        if socorros:
+            self._chamar('ceder', {r: (brigadistas,) for r, brigadistas in cedidos.items()})
+            respostas = self._chamar('socorrer', {r: (s,) for r, s in socorros.items()})
+            for r in sorted(respostas):
+                eventos_regiao, self.focos[r] = respostas[r]
+                eventos.extend(eventos_regiao)
+        return eventos
+
+    def coletar(self):
+        """
+        Reúne o estado de todas as regiões.
+
+        Retorna:
+        - ResultadoRegional: focos ativos, vértices queimados, fogos apagados
+        (em ordem de região) e brigadistas {posto: (posição, água)}.
+        """
+        respostas = self._chamar('resultado', {r: () for r in range(self.num_regioes)})
+        fogo_ativo, queimados, fogos_apagados, brigadistas = set(), set(), [], {}
+        for r in sorted(respostas):
+            ativos, queimados_regiao, apagados, brigadistas_regiao = respostas[r]
+            fogo_ativo.update(ativos)
+            queimados.update(queimados_regiao)
+            fogos_apagados.extend(apagados)
+            brigadistas.update(brigadistas_regiao)
+
+        for chegadas in self._chegadas.values():
+            for brigadista, vertice, agua in chegadas:
+                brigadistas[brigadista] = (vertice, agua)
+
+        return ResultadoRegional(fogo_ativo, queimados, fogos_apagados, brigadistas)
+
+
+class _Regiao:
+    """
+    Parte da simulação que roda em um trabalhador: a simulação do subgrafo
+    de uma região e as arestas que saem dela.
+    """
+
+    def __init__(self, estado, rotulos, regiao, postos, agua, parametros):
+        # Subgrafo induzido pelos vértices da região, com os índices locais
+        # dados pela posição em 'locais' (ordenado)
+        locais = np.flatnonzero(rotulos == regiao)
+        posicoes, dono = arestas_csr(estado.indptr, locais)
+        destinos = estado.indices[posicoes].astype(np.int64)
+        interna = rotulos[destinos] == regiao
+
+        indptr = np.zeros(len(locais) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dono[interna], minlength=len(locais)), out=indptr[1:])
+        indices = np.searchsorted(locais, destinos[interna]).astype(estado.indices.dtype)
+
+        identidade = estado.ids is None and (
+            len(locais) == 0 or locais[-1] == len(locais) - 1
+        )
+        ids = None if identidade else [estado.no(i) for i in locais.tolist()]
+        subgrafo = EstadoCompacto(indptr, indices, estado.pesos[posicoes[interna]], ids)
+        for atributo in ATRIBUTOS:
+            subgrafo.flags[atributo] = estado.flags[atributo][locais]
+
+        self.simulacao = FirePreventionandFight(
+            grafo=subgrafo,
+            backend='compacto',
+            postos_brigadistas=postos,
+            pontos_agua=agua,
+            raio_propagacao=1,
+            **parametros
+        )
+
+        # Vértice de fronteira -> [(vizinho em outra região, região dele,
+        # peso da aresta)]
+        self.saidas = {}
+        externa = ~interna
+        for u, v, r, peso in zip(locais[dono[externa]].tolist(),
+                                 destinos[externa].tolist(),
+                                 rotulos[destinos[externa]].tolist(),
+                                 estado.pesos[posicoes[externa]].tolist()):
+            self.saidas.setdefault(estado.no(u), []).append((estado.no(v), r, peso))
+
+    def iniciar(self, vertices):
+        """
+        Incendeia os vértices válidos entre 'vertices'.
+
+        Retorna:
+        - tuple(list, int): vértices incendiados e focos ativos da região.
+        """
+        simulacao = self.simulacao
+        aceitos = []
+        for vertice in vertices:
+            if not simulacao.estado.obter(vertice, 'fogo'):
+                simulacao.iniciar_fogo(vertice)
+                if simulacao.estado.obter(vertice, 'fogo'):
+                    aceitos.append(vertice)
+        return aceitos, len(simulacao.fogo_ativo)
+
+    def propagar(self):
+        """
+        Avança o fogo um salto dentro da região.
+
+        Retorna:
+        - tuple(list, dict, int): novos focos, vértices de outras regiões
+        alcançados pela frente de fogo ({região: vértices}) e focos ativos.
+        """
+        simulacao = self.simulacao
+        pedidos = {}
+        for vertice in simulacao.fronteira_fogo:
+            for vizinho, regiao, _ in self.saidas.get(vertice, ()):
+                pedidos.setdefault(regiao, set()).add(vizinho)
+
+        novos_focos = simulacao.propagar_fogo()
+        return (
+            novos_focos,
+            {r: list(vertices) for r, vertices in pedidos.items()},
+            len(simulacao.fogo_ativo)
+        )
+
+    def despachar(self, com_fogo, chegadas):
+        """
+        Recebe os brigadistas vindos de outras regiões e executa o turno dos
+        brigadistas. Sem focos na região, os brigadistas com água seguem
+        para a saída mais barata rumo a uma região de 'com_fogo', contando
+        o peso da aresta que cruza a fronteira.
+
+        Retorna:
+        - tuple(list, list, int): eventos, transferências (região de destino,
+        brigadista, vértice de entrada, água) e focos ativos da região.
+        """
+        simulacao = self.simulacao
+        for brigadista, vertice, agua in chegadas:
+            simulacao.brigadistas[brigadista] = (vertice, agua)
+
+        eventos = simulacao.enviar_brigadistas()
+        transferencias = []
+        if simulacao.fogo_ativo or not com_fogo:
+            return eventos, transferencias, len(simulacao.fogo_ativo)
+
+        # Aresta mais leve de cada vértice de fronteira rumo a uma região
+        # em chamas, e o peso dela como custo de sair por ele
+        saidas = {}
+        for vertice, vizinhos in self.saidas.items():
+            cruzamentos = [
+                (peso, vizinho, regiao) for vizinho, regiao, peso in vizinhos
+                if regiao in com_fogo and peso < float('inf')
+            ]
+            if cruzamentos:
+                saidas[vertice] = min(cruzamentos, key=lambda c: c[0])
+        custos = {vertice: peso for vertice, (peso, _, _) in saidas.items()}
+
+        for brigadista, (posicao, agua) in list(simulacao.brigadistas.items()):
+            # Sem água, reabastece antes de poder ajudar outra região
+            if agua < simulacao.consumo_por_fogo:
+                caminho = simulacao.encontrar_caminho_ate_agua_ou_posto(posicao)
+                if caminho is not None:
+                    simulacao.brigadistas[brigadista] = (
+                        caminho[-1], simulacao.capacidade_caminhoes
+                    )
+                    eventos.append(Reabastecimento(brigadista, caminho[-1], None))
+                continue
+
+            saida, _, caminho = simulacao.caminhos.mais_barato(posicao, custos)
+            if saida is None:
+                continue
+            _, vizinho, regiao = saidas[saida]
+            del simulacao.brigadistas[brigadista]
+            eventos.append(Transferencia(brigadista, caminho + [vizinho], regiao, agua))
+            transferencias.append((regiao, brigadista, vizinho, agua))
+
+        return eventos, transferencias, len(simulacao.fogo_ativo)
+
+    def ceder(self, brigadistas):
+        """Retira da região os brigadistas enviados pela verificação global."""
+        for brigadista in brigadistas:
+            del self.simulacao.brigadistas[brigadista]
+
+    def socorrer(self, socorros):
+        """
+        Recebe os brigadistas enviados pela verificação global, que chegam
+        aos focos da região por fora dela, e apaga esses focos.
+
+        Parâmetros:
+        - socorros (list[tuple]): (brigadista, foco, água) de cada um.
+
+        Retorna:
+        - tuple(list, int): eventos 'FogoApagado' e focos ativos da região.
+        """
+        simulacao = self.simulacao
+        eventos = []
+        for brigadista, foco, agua in socorros:
+            simulacao.apagar_fogo(foco)
+            agua -= simulacao.consumo_por_fogo
+            simulacao.brigadistas[brigadista] = (foco, agua)
+            eventos.append(FogoApagado(brigadista, foco, agua))
+        return eventos, len(simulacao.fogo_ativo)
+
+    def resultado(self):
+        """Focos ativos, queimados, fogos apagados e brigadistas da região."""
+        simulacao = self.simulacao
+        return (
+            list(simulacao.fogo_ativo),
+            simulacao.estado.nos_com('queimado'),
+            simulacao.fogos_apagados,
+            simulacao.brigadistas,
+        )
+
+
+def _executar_trabalhador(conexao, topologia, configuracoes):
+    """
+    Laço de um processo trabalhador: monta as suas regiões a partir da
+    topologia compartilhada e atende às chamadas do coordenador até
+    receber (None, None).
+    """
+    try:
+        regioes = _montar_regioes(topologia, configuracoes)
+    except Exception as erro:
+        conexao.send(erro)
+        return
+    conexao.send(None)
+
+    while True:
+        metodo, argumentos = conexao.recv()
+        if metodo is None:
+            break
+        try:
+            resposta = {
+                r: getattr(regioes[r], metodo)(*args)
+                for r, args in argumentos.items()
+            }
+        except Exception as erro:
+            resposta = erro
+        conexao.send(resposta)
+
+
+def _montar_regioes(topologia, configuracoes):
+    """
+    Anexa a topologia compartilhada, cria as regiões do trabalhador (que
+    guardam apenas cópias dos seus trechos) e solta a memória compartilhada.
+    """
+    memorias = []
+    arrays = {}
+    for chave, descritor in topologia['arrays'].items():
+        memoria, arrays[chave] = anexar_array(descritor)
+        memorias.append(memoria)
+
+    estado = EstadoCompacto(
+        arrays.pop('indptr'), arrays.pop('indices'), arrays.pop('pesos'),
+        topologia['ids']
+    )
+    rotulos = arrays.pop('rotulos')
+    estado.flags = arrays
+    regioes = {
+        r: _Regiao(estado, rotulos, r, *configuracao)
+        for r, configuracao in configuracoes.items()
+    }
+
+    # Nenhum array pode apontar para um bloco quando ele é fechado
+    del estado, rotulos, arrays
+    for memoria in memorias:
+        memoria.close()
+    return regioes
+
+
+def _receber(conexao):
+    """Recebe a resposta de um trabalhador, repassando erros ocorridos nele."""
+    resposta = conexao.recv()
+    if isinstance(resposta, Exception):
+        raise resposta
+    return resposta
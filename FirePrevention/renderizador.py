@@ -0,0 +1,209 @@
+import os
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from matplotlib import animation
+from matplotlib.colors import to_rgba_array
+
+from FirePrevention.estado import EstadoCompacto
+
+
+# Cores dos nós em ordem crescente de prioridade: quando um nó se encaixa
+# em mais de uma categoria, vale a de maior índice
+# 🟢 seguro, ⚫ queimado, 🔵 água ou posto, 🟡 brigadista, 🔴 em chamas
+PALETA = to_rgba_array(['green', 'gray', 'blue', 'yellow', 'red'])
+SEGURO, QUEIMADO, AGUA, BRIGADISTA, FOGO = range(len(PALETA))
+
+
+class Renderizador:
+    """
+    Desenha a simulação reaproveitando uma única figura.
+
+    Nós, arestas e rótulos são desenhados uma vez; a cada passo apenas as
+    cores dos nós e o título são atualizados, além dos pesos e do estilo
+    das arestas quando algum peso muda (arestas fechadas aparecem
+    tracejadas, com peso '∞'). Pode exibir os quadros na tela
+    ou gravá-los em MP4, GIF ou sequência de PNGs sem exibição interativa.
+    """
+
+    def __init__(self, simulacao, tamanho=(10, 8), rotulos=True):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação a ser desenhada.
+        - tamanho (tuple): tamanho da figura, em polegadas.
+        - rotulos (bool): desenha os nomes dos nós e os pesos das arestas.
+        """
+        self.simulacao = simulacao
+        estado = simulacao.estado
+        grafo = estado.para_networkx()
+
+        # Ordem de desenho dos nós e posição de cada nó nessa ordem
+        self._nos = list(grafo.nodes)
+        self._identidade = isinstance(estado, EstadoCompacto) and estado.ids is None
+        self._posicao = (
+            None if self._identidade else {no: i for i, no in enumerate(self._nos)}
+        )
+
+        self.figura, self.eixo = plt.subplots(figsize=tamanho)
+        self.eixo.set_axis_off()
+
+        # Artistas desenhados uma única vez
+        self._artista_nos = nx.draw_networkx_nodes(
+            grafo, simulacao.pos, ax=self.eixo, node_size=500,
+            node_color=PALETA[self.codigos()]
+        )
+        self._arestas = list(grafo.edges)
+        self._artista_arestas = nx.draw_networkx_edges(
+            grafo, simulacao.pos, ax=self.eixo, edgelist=self._arestas
+        )
+        self._rotulos_arestas = {}
+        if rotulos:
+            nx.draw_networkx_labels(grafo, simulacao.pos, ax=self.eixo, font_size=10)
+            self._rotulos_arestas = nx.draw_networkx_edge_labels(
+                grafo, simulacao.pos, ax=self.eixo,
+                edge_labels=nx.get_edge_attributes(grafo, 'weight'),
+                font_size=9
+            )
+        self._titulo = self.eixo.set_title('')
+
+        # Versão do estado cujos pesos estão desenhados; None força o
+        # primeiro 'atualizar' a aplicar o estilo das arestas já fechadas
+        self._versao = None
+
+    def codigos(self):
+        """
+        Calcula o código de cor de todos os nós de uma vez, na ordem de
+        desenho, aplicando as categorias da menor para a maior prioridade.
+
+        Retorna:
+        - np.ndarray: um índice de 'PALETA' por nó.
+        """
+        estado = self.simulacao.estado
+        codigos = np.full(len(self._nos), SEGURO, dtype=np.uint8)
+
+        if self._identidade:
+            codigos[estado.flags['queimado']] = QUEIMADO
+            codigos[estado.flags['agua'] | estado.flags['posto_brigadista']] = AGUA
+        else:
+            codigos[self._indices(estado.nos_com('queimado'))] = QUEIMADO
+            codigos[self._indices(estado.nos_com('agua'))] = AGUA
+            codigos[self._indices(estado.nos_com('posto_brigadista'))] = AGUA
+
+        # Conjunto das posições dos brigadistas, calculado uma vez por quadro
+        posicoes = {posicao for posicao, _ in self.simulacao.brigadistas.values()}
+        codigos[self._indices(posicoes)] = BRIGADISTA
+        codigos[self._indices(self.simulacao.fogo_ativo)] = FOGO
+        return codigos
+
+    def atualizar(self, estado):
+        """
+        Atualiza as cores dos nós e o título para o estado atual.
+
+        Parâmetros:
+        - estado (int): número que representa o estágio atual da simulação.
+        """
+        self._artista_nos.set_facecolor(PALETA[self.codigos()])
+        if self.simulacao.estado.versao != self._versao:
+            self._atualizar_arestas()
+        self._titulo.set_text(f"Estado Atual do Grafo [estado {estado}]")
+
+    def _atualizar_arestas(self):
+        """Redesenha os pesos e o estilo das arestas conforme o estado atual."""
+        estado = self.simulacao.estado
+        fechadas = []
+        for aresta in self._arestas:
+            peso = estado.peso(*aresta)
+            fechadas.append(not np.isfinite(peso))
+            rotulo = self._rotulos_arestas.get(aresta)
+            if rotulo is not None:
+                # Pesos inteiros promovidos a float continuam sem o '.0'
+                rotulo.set_text('∞' if fechadas[-1] else f'{peso:g}')
+
+        self._artista_arestas.set_linestyle(
+            ['dashed' if fechada else 'solid' for fechada in fechadas]
+        )
+        self._artista_arestas.set_color(
+            ['lightgray' if fechada else 'black' for fechada in fechadas]
+        )
+        self._versao = estado.versao
+
+    def exibir(self, estado, pausa=1.5):
+        """
+        Atualiza e mostra a figura na tela, pausando por 'pausa' segundos.
+        """
+        self.atualizar(estado)
+        self.figura.canvas.draw_idle()
+        plt.pause(pausa)
+
+    def salvar(self, estado, arquivo):
+        """Atualiza a figura e a salva como imagem em 'arquivo'."""
+        self.atualizar(estado)
+        self.figura.savefig(arquivo)
+
+    def fechar(self):
+        """Fecha a figura, liberando sua memória."""
+        plt.close(self.figura)
+
+    def _indices(self, nos):
+        """Converte vértices nas respectivas posições da ordem de desenho."""
+        if self._identidade:
+            return np.fromiter(nos, dtype=np.int64)
+        return np.fromiter((self._posicao[no] for no in nos), dtype=np.int64)
+
+
+class GravadorAnimacao:
+    """
+    Consumidor de passos que grava cada quadro da simulação em arquivo,
+    sem exibição interativa e sem pausas.
+
+    O formato é escolhido pelo nome do arquivo:
+    - '.mp4': vídeo (requer o ffmpeg instalado).
+    - '.gif': GIF animado (requer o Pillow).
+    - nome com '{}' (ex.: 'quadros/estado_{:04d}.png'): um PNG por passo.
+    """
+
+    def __init__(self, simulacao, arquivo, fps=2, dpi=100, **opcoes):
+        """
+        Parâmetros:
+        - simulacao (FirePreventionandFight): simulação a ser gravada.
+        - arquivo (str): destino da gravação.
+        - fps (int): quadros por segundo do vídeo ou GIF.
+        - dpi (int): resolução dos quadros.
+        - opcoes: argumentos extras de 'Renderizador'.
+        """
+        self.renderizador = Renderizador(simulacao, **opcoes)
+        self.arquivo = arquivo
+        self.dpi = dpi
+
+        extensao = os.path.splitext(arquivo)[1].lower()
+        if '{' in arquivo:
+            self._gravador = None
+            pasta = os.path.dirname(arquivo)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+        elif extensao == '.mp4':
+            self._gravador = animation.FFMpegWriter(fps=fps)
+        elif extensao == '.gif':
+            self._gravador = animation.PillowWriter(fps=fps)
+        else:
+            raise ValueError("Use '.mp4', '.gif' ou um padrão com '{}' para PNGs.")
+
+        if self._gravador is not None:
+            self._gravador.setup(self.renderizador.figura, arquivo, dpi=dpi)
+
+    def __call__(self, passo):
+        """Grava o quadro correspondente a um 'Passo' da simulação."""
+        self.renderizador.atualizar(passo.estado)
+        if self._gravador is None:
+            self.renderizador.figura.savefig(
+                self.arquivo.format(passo.estado), dpi=self.dpi
+            )
+        else:
+            self._gravador.grab_frame()
+
+    def finalizar(self):
+        """Conclui o arquivo de vídeo ou GIF e fecha a figura."""
+        if self._gravador is not None:
+            self._gravador.finish()
+        self.renderizador.fechar()
@@ -0,0 +1,406 @@
+import heapq
+import math
+from array import array
+from collections import namedtuple
+from itertools import count
+
+import numpy as np
+
+from FirePrevention.estado import EstadoCompacto
+
+
+# Resultado das buscas ponto a ponto: distância e caminho (None quando não
+# há caminho) e vértices fixados pela busca, para a instrumentação
+Rota = namedtuple('Rota', 'distancia caminho fixados')
+
+# Algoritmos aceitos por FirePreventionandFight.caminho_mais_curto
+ALGORITMOS_ROTA = ('dijkstra', 'bidirecional', 'a_estrela', 'alt')
+
+
+def busca_bidirecional(vizinhos, origem, destino):
+    """
+    Dijkstra bidirecional: uma busca parte da origem e outra do destino, e
+    o caminho é fechado quando as duas se encontram. Em grafos esparsos e
+    grandes, cada busca cobre aproximadamente um disco de raio igual à
+    metade da distância, bem menos que o disco inteiro do Dijkstra comum.
+
+    A cada iteração avança o lado cuja próxima distância é menor. A busca
+    termina quando a soma das menores distâncias ainda pendentes nos dois
+    lados não é menor que o melhor caminho já encontrado, que então é
+    mínimo. Como o grafo não é direcionado, as duas buscas usam a mesma
+    vizinhança.
+
+    Parâmetros:
+    - vizinhos (callable): função que recebe um vértice e devolve pares
+    (vizinho, peso) das arestas incidentes.
+    - origem, destino (int): extremidades do caminho.
+
+    Retorna:
+    - Rota: distância, caminho (incluindo os dois extremos) e vértices
+    fixados; distância e caminho são None se não houver caminho.
+    """
+    if origem == destino:
+        return Rota(0, [origem], 0)
+
+    contador = count()
+    distancia = ({origem: 0}, {destino: 0})
+    predecessor = ({origem: None}, {destino: None})
+    fixados = (set(), set())
+    heaps = ([(0, next(contador), origem)], [(0, next(contador), destino)])
+
+    melhor = math.inf
+    encontro = None
+    while heaps[0] and heaps[1]:
+        # Nenhum caminho ainda não visto pode ser menor que o melhor atual
+        if heaps[0][0][0] + heaps[1][0][0] >= melhor:
+            break
+
+        lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        outro = 1 - lado
+        d, _, atual = heapq.heappop(heaps[lado])
+        if atual in fixados[lado]:
+            continue
+        fixados[lado].add(atual)
+
+        for vizinho, peso in vizinhos(atual):
+            if vizinho in fixados[lado]:
+                continue
+            nova_distancia = d + peso
+            if nova_distancia < distancia[lado].get(vizinho, math.inf):
+                distancia[lado][vizinho] = nova_distancia
+                predecessor[lado][vizinho] = atual
+                heapq.heappush(heaps[lado], (nova_distancia, next(contador), vizinho))
+
+                # O vizinho já alcançado pelo outro lado fecha um caminho
+                restante = distancia[outro].get(vizinho)
+                if restante is not None and nova_distancia + restante < melhor:
+                    melhor = nova_distancia + restante
+                    encontro = vizinho
+
+    total_fixados = len(fixados[0]) + len(fixados[1])
+    if encontro is None:
+        return Rota(None, None, total_fixados)
+
+    # Metade da origem até o encontro, seguida da metade até o destino
+    caminho = []
+    atual = encontro
+    while atual is not None:
+        caminho.append(atual)
+        atual = predecessor[0][atual]
+    caminho.reverse()
+    atual = predecessor[1][encontro]
+    while atual is not None:
+        caminho.append(atual)
+        atual = predecessor[1][atual]
+    return Rota(melhor, caminho, total_fixados)
+
+
+def a_estrela(vizinhos, origem, destino, heuristica):
+    """
+    Busca A*: um Dijkstra em que a fila é ordenada pela distância da origem
+    somada a uma estimativa da distância restante até o destino, de modo
+    que os vértices na direção do destino são fixados primeiro.
+
+    A estimativa precisa ser consistente (nunca maior que o peso de uma
+    aresta somado à estimativa do outro extremo), como as de
+    'HeuristicaCoordenadas' e 'IndiceMarcos'; assim cada vértice é fixado
+    uma única vez e o caminho devolvido é mínimo.
+
+    Parâmetros:
+    - vizinhos (callable): função que recebe um vértice e devolve pares
+    (vizinho, peso) das arestas incidentes.
+    - origem, destino (int): extremidades do caminho.
+    - heuristica (callable): estimativa da distância de um vértice até
+    'destino'.
+
+    Retorna:
+    - Rota: distância, caminho (incluindo os dois extremos) e vértices
+    fixados; distância e caminho são None se não houver caminho.
+    """
+    contador = count()
+    distancia = {origem: 0}
+    predecessor = {origem: None}
+    fixados = set()
+    heap = [(heuristica(origem), next(contador), origem)]
+
+    while heap:
+        _, _, atual = heapq.heappop(heap)
+        if atual in fixados:
+            continue
+        fixados.add(atual)
+
+        if atual == destino:
+            caminho = []
+            while atual is not None:
+                caminho.append(atual)
+                atual = predecessor[atual]
+            caminho.reverse()
+            return Rota(distancia[destino], caminho, len(fixados))
+
+        d = distancia[atual]
+        for vizinho, peso in vizinhos(atual):
+            if vizinho in fixados:
+                continue
+            nova_distancia = d + peso
+            if nova_distancia < distancia.get(vizinho, math.inf):
+                distancia[vizinho] = nova_distancia
+                predecessor[vizinho] = atual
+                heapq.heappush(
+                    heap,
+                    (nova_distancia + heuristica(vizinho), next(contador), vizinho)
+                )
+
+    return Rota(None, None, len(fixados))
+
+
+class HeuristicaCoordenadas:
+    """
+    Estimativa da distância restante para o A* a partir das coordenadas dos
+    vértices: a distância euclidiana até o destino multiplicada pela menor
+    razão peso / comprimento entre todas as arestas.
+
+    Com esse fator, nenhuma aresta é mais "barata" por unidade de
+    comprimento que a estimativa, e pela desigualdade triangular a soma
+    dos pesos de qualquer caminho é pelo menos a distância em linha reta
+    vezes o fator: a estimativa é consistente para qualquer conjunto de
+    coordenadas (geográficas ou de um layout de desenho). Quanto mais os
+    pesos acompanham as distâncias, mais a busca se concentra na direção do
+    destino; com algum peso nulo o fator é zero e a busca equivale ao
+    Dijkstra.
+    """
+
+    def __init__(self, estado, coordenadas):
+        """
+        Parâmetros:
+        - estado (EstadoGrafo | EstadoCompacto): estado com as arestas.
+        - coordenadas (dict | np.ndarray): {vértice: (x, y)} ou um array
+        (n, 2) na ordem dos vértices.
+        """
+        self.versao = estado.versao
+
+        # No backend compacto as coordenadas ficam em arrays indexados pelo
+        # índice contíguo de cada vértice
+        if isinstance(coordenadas, dict) and isinstance(estado, EstadoCompacto):
+            coordenadas = [coordenadas[no] for no in estado.nos()]
+
+        if isinstance(coordenadas, dict):
+            self._x = {no: float(xy[0]) for no, xy in coordenadas.items()}
+            self._y = {no: float(xy[1]) for no, xy in coordenadas.items()}
+            self._chave = None
+        else:
+            coordenadas = np.asarray(coordenadas, dtype=np.float64)
+            if isinstance(estado, EstadoCompacto):
+                self._x = array('d', coordenadas[:, 0].tolist())
+                self._y = array('d', coordenadas[:, 1].tolist())
+                self._chave = None if estado.ids is None else estado.indice
+            else:
+                nos = list(estado.nos())
+                self._x = dict(zip(nos, coordenadas[:, 0].tolist()))
+                self._y = dict(zip(nos, coordenadas[:, 1].tolist()))
+                self._chave = None
+
+        self.fator = self._menor_razao(estado)
+
+    def aresta_alterada(self, estado, u, v, peso):
+        """
+        Mantém a estimativa consistente depois que o peso da aresta (u, v)
+        mudou: um peso maior nunca a invalida, e um menor só reduz o fator
+        se a nova razão peso / comprimento for a menor de todas.
+        """
+        self.versao = estado.versao
+        i, j = (u, v) if self._chave is None else (self._chave(u), self._chave(v))
+        comprimento = math.hypot(self._x[j] - self._x[i], self._y[j] - self._y[i])
+        if comprimento > 0:
+            self.fator = min(self.fator, peso / comprimento)
+
+    def para(self, destino):
+        """
+        Retorna a função de estimativa até 'destino', no formato esperado
+        por 'a_estrela'.
+        """
+        x, y, chave, fator = self._x, self._y, self._chave, self.fator
+        alvo = destino if chave is None else chave(destino)
+        xd, yd = x[alvo], y[alvo]
+
+        if chave is None:
+            return lambda v: fator * math.hypot(x[v] - xd, y[v] - yd)
+
+        def heuristica(v):
+            i = chave(v)
+            return fator * math.hypot(x[i] - xd, y[i] - yd)
+
+        return heuristica
+
+    def _menor_razao(self, estado):
+        """Menor razão peso / comprimento entre as arestas do estado."""
+        if isinstance(estado, EstadoCompacto):
+            origens = np.repeat(np.arange(len(estado)), np.diff(estado.indptr))
+            x = np.frombuffer(self._x, dtype=np.float64)
+            y = np.frombuffer(self._y, dtype=np.float64)
+            comprimentos = np.hypot(
+                x[estado.indices] - x[origens], y[estado.indices] - y[origens]
+            )
+            positivos = comprimentos > 0
+            if not positivos.any():
+                return 0.0
+            return float(np.min(estado.pesos[positivos] / comprimentos[positivos]))
+
+        fator = math.inf
+        for u in estado.nos():
+            for v, peso in estado.vizinhos_ponderados(u):
+                comprimento = math.hypot(self._x[v] - self._x[u], self._y[v] - self._y[u])
+                if comprimento > 0:
+                    fator = min(fator, peso / comprimento)
+        return 0.0 if fator == math.inf else fator
+
+
+class IndiceMarcos:
+    """
+    Índice de marcos (ALT: A*, marcos e desigualdade triangular) para
+    consultas ponto a ponto repetidas sobre os mesmos pesos.
+
+    Na construção, a distância de alguns vértices "marco" a todos os demais
+    é calculada uma única vez. Pela desigualdade triangular, para qualquer
+    marco L a distância de v até o destino t é pelo menos |d(L, t) - d(L, v)|,
+    e o maior desses limites é uma estimativa consistente para o A*, que não
+    depende de coordenadas. Marcos na periferia do grafo dão os melhores
+    limites; por isso cada novo marco é o vértice mais distante dos já
+    escolhidos.
+
+    A construção custa um Dijkstra completo por marco e a memória é de uma
+    distância por vértice e marco, então o índice compensa quando muitas
+    rotas são consultadas antes de os pesos mudarem. Aumentos de peso
+    (inclusive o fechamento de arestas) mantêm os limites válidos, apenas
+    menos justos; reduções exigem reconstruir o índice.
+    """
+
+    def __init__(self, estado, num_marcos=8, marcos=None, semente=None):
+        """
+        Parâmetros:
+        - estado (EstadoGrafo | EstadoCompacto): estado com as arestas.
+        - num_marcos (int): quantos marcos escolher.
+        - marcos (list | None): marcos fixos; por padrão, escolhidos pelo
+        critério do mais distante a partir de um vértice sorteado.
+        - semente (int | None): semente do sorteio do primeiro marco.
+        """
+        self.versao = estado.versao
+        self.parametros = (num_marcos, marcos, semente)
+        self._chave = (
+            estado.indice
+            if isinstance(estado, EstadoCompacto) and estado.ids is not None
+            else None
+        )
+
+        nos = list(estado.nos())
+        vizinhos = estado.vizinhos_ponderados
+
+        # Vértices fixados pelos Dijkstras da construção
+        self.vertices_fixados = 0
+        self.marcos = []
+        self.distancias = []
+
+        if marcos is None:
+            rng = np.random.default_rng(semente)
+            proximo = nos[int(rng.integers(len(nos)))] if nos else None
+            num_marcos = min(num_marcos, len(nos))
+        else:
+            marcos = list(marcos)
+            num_marcos = len(marcos)
+            proximo = marcos[0] if marcos else None
+
+        # Menor distância de cada vértice aos marcos já escolhidos
+        minimo = None
+        while len(self.marcos) < num_marcos:
+            distancia = _distancias(vizinhos, proximo)
+            self.vertices_fixados += len(distancia)
+            self.marcos.append(proximo)
+            self.distancias.append(
+                array('d', (distancia.get(no, math.inf) for no in nos))
+                if isinstance(estado, EstadoCompacto) else distancia
+            )
+
+            if len(self.marcos) == num_marcos:
+                break
+            if marcos is not None:
+                proximo = marcos[len(self.marcos)]
+                continue
+
+            # O próximo marco é o vértice alcançável mais distante dos atuais
+            if minimo is None:
+                minimo = distancia
+            else:
+                minimo = {
+                    no: min(d, distancia[no]) for no, d in minimo.items()
+                    if no in distancia
+                }
+            proximo = max(minimo, key=minimo.get)
+            if minimo[proximo] == 0:
+                break
+
+    def para(self, destino):
+        """
+        Retorna a função de estimativa até 'destino', no formato esperado
+        por 'a_estrela'.
+        """
+        chave = self._chave
+        alvo = destino if chave is None else chave(destino)
+
+        # Só servem os marcos que alcançam o destino; sem nenhum, a
+        # estimativa é zero e a busca equivale ao Dijkstra
+        pares = []
+        for distancia in self.distancias:
+            d_alvo = _distancia_de(distancia, alvo)
+            if d_alvo != math.inf:
+                pares.append((distancia, d_alvo))
+
+        if not pares:
+            return lambda v: 0
+
+        if isinstance(pares[0][0], dict):
+            def heuristica(v):
+                return max(
+                    abs(d_alvo - distancia.get(v, math.inf)) for distancia, d_alvo in pares
+                )
+        else:
+            def heuristica(v):
+                i = v if chave is None else chave(v)
+                return max(abs(d_alvo - distancia[i]) for distancia, d_alvo in pares)
+
+        return heuristica
+
+    def desconectados(self, origem, destino):
+        """
+        Diz se algum marco prova que não há caminho entre 'origem' e
+        'destino' (alcança um e não o outro), sem nenhuma busca.
+        """
+        chave = self._chave
+        i = origem if chave is None else chave(origem)
+        j = destino if chave is None else chave(destino)
+        return any(
+            (_distancia_de(distancia, i) == math.inf) != (_distancia_de(distancia, j) == math.inf)
+            for distancia in self.distancias
+        )
+
+
+def _distancias(vizinhos, origem):
+    """Distância de 'origem' a todos os vértices alcançáveis (Dijkstra completo)."""
+    contador = count()
+    distancia = {}
+    heap = [(0, next(contador), origem)]
+    while heap:
+        d, _, atual = heapq.heappop(heap)
+        if atual in distancia:
+            continue
+        distancia[atual] = d
+        for vizinho, peso in vizinhos(atual):
+            # Arestas fechadas (peso infinito) não levam a lugar nenhum
+            if vizinho not in distancia and peso != math.inf:
+                heapq.heappush(heap, (d + peso, next(contador), vizinho))
+    return distancia
+
+
+def _distancia_de(distancias, chave):
+    """Distância guardada para 'chave' (infinita quando não alcançada)."""
+    if isinstance(distancias, dict):
+        return distancias.get(chave, math.inf)
+    return distancias[chave]
@@ -0,0 +1,281 @@
+"""
+Benchmark dos pontos críticos de FirePreventionandFight.
+
+Gera grafos sintéticos com semente fixa, em vários tamanhos e densidades,
+mede o tempo de cada método da simulação, os passos por segundo de uma
+execução completa e, numa execução separada, o pico de memória, grava tudo
+em JSON e, se houver, compara com um baseline salvo.
+
+O baseline depende da máquina, então não é versionado: grave um antes da
+alteração e compare depois, na mesma máquina. Exemplos (a partir da raiz
+do repositório):
+
+    python benchmarks/bench_simulacao.py --tamanhos 100 1000000 --backend compacto
+    python benchmarks/bench_simulacao.py --saida baseline.json
+    python benchmarks/bench_simulacao.py --baseline baseline.json
+
+O código de saída é 1 quando a mediana de alguma métrica de tempo piora
+mais que a tolerância em relação ao baseline.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FirePrevention.FirePrevention import FirePreventionandFight  # noqa: E402
+
+
+# Métricas de tempo comparadas com o baseline (menor é melhor)
+METRICAS_TEMPO = (
+    'construcao_s',
+    'propagar_fogo_s',
+    'enviar_brigadistas_s',
+    'indice_recarga_s',
+    'encontrar_caminho_ate_agua_ou_posto_s',
+    'simulacao_completa_s',
+)
+
+
+def criar_simulacao(config):
+    """
+    Cria a simulação descrita por 'config' com semente fixa, sorteando os
+    postos de brigadistas e os pontos de água entre os vértices.
+    """
+    rng = np.random.default_rng(config['semente'])
+    num_vertices = config['vertices']
+    num_agua = max(1, int(num_vertices * config['proporcao_agua']))
+    sorteados = rng.choice(num_vertices, config['brigadistas'] + num_agua, replace=False)
+
+    return FirePreventionandFight(
+        num_vertices=num_vertices,
+        num_arestas=int(num_vertices * config['densidade']),
+        postos_brigadistas=sorteados[:config['brigadistas']].tolist(),
+        pontos_agua=sorteados[config['brigadistas']:].tolist(),
+        capacidade_caminhoes=config['capacidade'],
+        topologia='conexa',
+        semente=config['semente'],
+        backend=config['backend'],
+        raio_propagacao=1
+    ), rng
+
+
+def escolher_ignicao(simulacao, rng):
+    """Sorteia um vértice onde o fogo pode começar."""
+    while True:
+        vertice = int(rng.integers(len(simulacao.estado)))
+        if not (simulacao.estado.obter(vertice, 'agua') or
+                simulacao.estado.obter(vertice, 'posto_brigadista')):
+            return vertice
+
+
+def medir(config):
+    """
+    Executa as medições de uma configuração.
+
+    Retorna:
+    - dict: tempos por método (em segundos, acumulados na execução) e
+    passos por segundo.
+    """
+    metricas = {}
+
+    inicio = time.perf_counter()
+    simulacao, rng = criar_simulacao(config)
+    metricas['construcao_s'] = time.perf_counter() - inicio
+    ignicao = escolher_ignicao(simulacao, rng)
+
+    # Tempo de cada método ao longo de uma simulação executada passo a passo
+    simulacao.iniciar_fogo(ignicao)
+    tempo_propagar = tempo_enviar = 0.0
+    passos = 0
+    while simulacao.fogo_ativo and passos < config['max_passos']:
+        inicio = time.perf_counter()
+        simulacao.propagar_fogo()
+        meio = time.perf_counter()
+        simulacao.enviar_brigadistas()
+        tempo_enviar += time.perf_counter() - meio
+        tempo_propagar += meio - inicio
+        passos += 1
+    metricas['passos'] = passos
+    metricas['propagar_fogo_s'] = tempo_propagar
+    metricas['enviar_brigadistas_s'] = tempo_enviar
+
+    # Construção do índice de reabastecimento e consultas a ele
+    simulacao.invalidar_caminhos()
+    inicio = time.perf_counter()
+    simulacao.indice_recarga
+    metricas['indice_recarga_s'] = time.perf_counter() - inicio
+
+    origens = rng.integers(len(simulacao.estado), size=config['consultas'])
+    inicio = time.perf_counter()
+    for origem in origens.tolist():
+        simulacao.encontrar_caminho_ate_agua_ou_posto(origem)
+    metricas['encontrar_caminho_ate_agua_ou_posto_s'] = time.perf_counter() - inicio
+
+    # Execução completa, sem desenho
+    inicio = time.perf_counter()
+    metricas['passos_completa'] = executar_completa(config)
+    metricas['simulacao_completa_s'] = time.perf_counter() - inicio
+    return metricas
+
+
+def executar_completa(config):
+    """Executa uma simulação completa e retorna o número de passos."""
+    simulacao, rng = criar_simulacao(config)
+    passos = 0
+    for passo in simulacao.simular_iter(escolher_ignicao(simulacao, rng),
+                                        config['max_passos']):
+        passos = passo.estado - 1
+    return passos
+
+
+def medir_memoria(config):
+    """
+    Pico de memória, em MB, de uma execução completa. Fica numa execução
+    à parte porque o 'tracemalloc' deixa as alocações bem mais lentas e
+    distorceria os tempos.
+    """
+    tracemalloc.start()
+    try:
+        executar_completa(config)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def medir_repetido(config, repeticoes):
+    """
+    Repete 'medir' e fica com a mediana de cada métrica de tempo, menos
+    sensível que uma única execução a picos de carga do sistema, e mede o
+    pico de memória uma vez, separadamente.
+    """
+    execucoes = [medir(config) for _ in range(repeticoes)]
+    metricas = dict(execucoes[0])
+    for metrica in METRICAS_TEMPO:
+        metricas[metrica] = float(np.median([e[metrica] for e in execucoes]))
+    passos = metricas.pop('passos_completa')
+    metricas['passos_por_segundo'] = (
+        passos / metricas['simulacao_completa_s'] if passos else 0.0
+    )
+    metricas['pico_memoria_mb'] = medir_memoria(config)
+    return metricas
+
+
+def chave(config):
+    """Identificador de uma configuração, usado para casar com o baseline."""
+    return (f"{config['backend']}-v{config['vertices']}-d{config['densidade']}"
+            f"-b{config['brigadistas']}-a{config['proporcao_agua']}")
+
+
+def comparar(resultados, baseline, tolerancia, minimo):
+    """
+    Compara as métricas de tempo com o baseline. Tempos menores que
+    'minimo' segundos nas duas execuções são ignorados, pois são dominados
+    por ruído.
+
+    Retorna:
+    - list[str]: descrição das regressões acima da tolerância.
+    """
+    anteriores = {r['chave']: r['metricas'] for r in baseline['resultados']}
+    regressoes = []
+
+    for resultado in resultados:
+        anterior = anteriores.get(resultado['chave'])
+        if anterior is None:
+            continue
+        for metrica in METRICAS_TEMPO:
+            antes, agora = anterior.get(metrica), resultado['metricas'][metrica]
+            if not antes or max(antes, agora) < minimo:
+                continue
+            razao = agora / antes
+            marcador = ''
+            if razao > 1 + tolerancia:
+                marcador = '  <-- regressão'
+                regressoes.append(f"{resultado['chave']} {metrica}: {razao:.2f}x")
+            print(f"  {resultado['chave']:<40} {metrica:<40} {razao:6.2f}x{marcador}")
+
+    return regressoes
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tamanhos', type=int, nargs='+',
+                        default=[100, 1000, 10000, 100000])
+    parser.add_argument('--densidades', type=float, nargs='+', default=[2.0, 4.0],
+                        help='arestas por vértice')
+    parser.add_argument('--brigadistas', type=int, nargs='+', default=[2, 16])
+    parser.add_argument('--proporcao-agua', type=float, nargs='+', default=[0.01])
+    parser.add_argument('--backend', nargs='+', default=['networkx', 'compacto'])
+    parser.add_argument('--capacidade', type=int, default=10)
+    parser.add_argument('--max-passos', type=int, default=200)
+    parser.add_argument('--consultas', type=int, default=1000,
+                        help='consultas ao ponto de reabastecimento mais próximo')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default='resultados_benchmark.json')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='piora relativa aceita antes de acusar regressão')
+    parser.add_argument('--minimo', type=float, default=0.05,
+                        help='tempo, em segundos, abaixo do qual não se compara')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='execuções por configuração (vale a mediana)')
+    opcoes = parser.parse_args(argumentos)
+
+    resultados = []
+    for backend, vertices, densidade, brigadistas, proporcao_agua in itertools.product(
+            opcoes.backend, opcoes.tamanhos, opcoes.densidades,
+            opcoes.brigadistas, opcoes.proporcao_agua):
+        config = {
+            'backend': backend,
+            'vertices': vertices,
+            'densidade': densidade,
+            'brigadistas': brigadistas,
+            'proporcao_agua': proporcao_agua,
+            'capacidade': opcoes.capacidade,
+            'max_passos': opcoes.max_passos,
+            'consultas': opcoes.consultas,
+            'semente': opcoes.semente,
+        }
+        metricas = medir_repetido(config, opcoes.repeticoes)
+        resultados.append({'chave': chave(config), 'config': config, 'metricas': metricas})
+        print(f"{chave(config):<40} passos={metricas['passos']:<5} "
+              f"enviar={metricas['enviar_brigadistas_s']:.3f}s "
+              f"propagar={metricas['propagar_fogo_s']:.3f}s "
+              f"completa={metricas['simulacao_completa_s']:.3f}s "
+              f"({metricas['passos_por_segundo']:.1f} passos/s, "
+              f"pico {metricas['pico_memoria_mb']:.1f} MB)")
+
+    saida = {
+        'metadados': {
+            'data': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+        },
+        'resultados': resultados,
+    }
+    with open(opcoes.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(saida, arquivo, indent=2)
+    print(f"Resultados gravados em {opcoes.saida}")
+
+    if opcoes.baseline:
+        with open(opcoes.baseline, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo)
+        print(f"Comparação com {opcoes.baseline} (agora / antes):")
+        regressoes = comparar(resultados, baseline, opcoes.tolerancia, opcoes.minimo)
+        if regressoes:
+            print(f"{len(regressoes)} regressão(ões) acima de {opcoes.tolerancia:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
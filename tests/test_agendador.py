@@ -0,0 +1,84 @@
+import networkx as nx
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.eventos import Deslocamento, FogoApagado, Ignicao
+
+
+def _grafo(semente):
+    grafo = nx.connected_watts_strogatz_graph(60, 4, 0.3, seed=semente)
+    for u, v in grafo.edges:
+        grafo[u][v]['weight'] = 1 + (u * 7 + v * 3) % 5
+    return grafo
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_sem_brigadistas_ignicoes_no_tempo_do_caminho_mais_curto(backend):
+    grafo = _grafo(0)
+    simulacao = FirePreventionandFight(
+        grafo=grafo.copy(), postos_brigadistas=[], pontos_agua=[], backend=backend
+    )
+
+    ocorrencias = list(simulacao.simular_eventos(0, velocidade_fogo=2.0))
+
+    # Cada vértice pega fogo uma vez, quando a frente mais rápida chega
+    esperado = nx.single_source_dijkstra_path_length(grafo, 0)
+    assert {o.evento.vertice: o.tempo for o in ocorrencias} == pytest.approx(
+        {v: d / 2.0 for v, d in esperado.items()}
+    )
+    assert len(ocorrencias) == len(grafo)
+    tempos = [o.tempo for o in ocorrencias]
+    assert tempos == sorted(tempos)
+
+
+@pytest.mark.parametrize('semente', range(5))
+def test_reservas_e_ordem_dos_eventos(semente):
+    simulacao = FirePreventionandFight(
+        grafo=_grafo(semente), postos_brigadistas=[10, 20, 30, 40],
+        pontos_agua=[50], capacidade_caminhoes=2
+    )
+
+    ocorrencias = list(simulacao.simular_eventos(
+        0, velocidade_fogo=0.5, velocidade_brigadistas=2.0, tempo_extincao=1
+    ))
+
+    tempos = [o.tempo for o in ocorrencias]
+    assert tempos == sorted(tempos)
+
+    # Um foco só é perseguido por um brigadista de cada vez e só é apagado
+    # por quem partiu rumo a ele
+    perseguidos = {}
+    acesos, apagados = set(), set()
+    for ocorrencia in ocorrencias:
+        evento = ocorrencia.evento
+        if isinstance(evento, Ignicao):
+            acesos.add(evento.vertice)
+        elif isinstance(evento, Deslocamento):
+            alvo = evento.caminho[-1]
+            assert alvo not in perseguidos.values()
+            perseguidos[evento.brigadista] = alvo
+        elif isinstance(evento, FogoApagado):
+            assert perseguidos.pop(evento.brigadista) == evento.vertice
+            assert evento.vertice in acesos and evento.vertice not in apagados
+            apagados.add(evento.vertice)
+
+    assert apagados
+    assert not simulacao.fogo_ativo & apagados
+
+
+def test_ignicao_acorda_ocioso_sem_encher_o_cache():
+    # Brigadistas longe do fogo, ociosos até que cada ignição acorde um
+    grafo = nx.path_graph(200)
+    nx.set_edge_attributes(grafo, 1, 'weight')
+    postos = [100, 110, 120, 130, 140]
+    simulacao = FirePreventionandFight(
+        grafo=grafo, postos_brigadistas=postos, pontos_agua=[]
+    )
+
+    ocorrencias = list(simulacao.simular_eventos(0, tempo_max=30))
+
+    partidas = [o.evento for o in ocorrencias if isinstance(o.evento, Deslocamento)]
+    assert sorted(d.caminho[0] for d in partidas) == postos
+    # Ninguém chegou ainda: o cache só tem as árvores das partidas, e não
+    # as das buscas feitas a partir de cada ignição
+    assert set(simulacao.caminhos._arvores) <= set(postos)
@@ -0,0 +1,88 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.caminhos import ArvoreCaminhos
+from FirePrevention.recarga import IndiceRecarga
+
+
+def _custo(simulacao, caminho):
+    return sum(simulacao.estado.peso(u, v) for u, v in zip(caminho, caminho[1:]))
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+@pytest.mark.parametrize('topologia', ['grade', 'geometrica'])
+def test_algoritmos_de_rota_tem_o_custo_do_dijkstra(backend, topologia):
+    simulacao = FirePreventionandFight(
+        num_vertices=300, num_arestas=900, topologia=topologia,
+        backend=backend, semente=1
+    )
+    grafo = simulacao.estado.para_networkx()
+    rng = random.Random(2)
+    nos = list(simulacao.estado.nos())
+
+    for _ in range(40):
+        origem, destino = rng.choice(nos), rng.choice(nos)
+        try:
+            esperado = nx.dijkstra_path_length(grafo, origem, destino)
+        except nx.NetworkXNoPath:
+            esperado = None
+
+        for algoritmo in ('dijkstra', 'bidirecional', 'a_estrela', 'alt'):
+            caminho = simulacao.caminho_mais_curto(origem, destino, algoritmo)
+            if esperado is None:
+                assert caminho is None
+                continue
+            assert caminho[0] == origem and caminho[-1] == destino
+            assert _custo(simulacao, caminho) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_reparo_incremental_igual_a_reconstrucao(backend):
+    rng = random.Random(0)
+    simulacao = FirePreventionandFight(
+        num_vertices=200, num_arestas=500, topologia='geometrica',
+        backend=backend, semente=0,
+        postos_brigadistas=rng.sample(range(200), 4),
+        pontos_agua=rng.sample(range(200), 6)
+    )
+    estado = simulacao.estado
+    nos = list(estado.nos())
+    arestas = [(u, v) for u in nos for v, _ in estado.vizinhos_ponderados(u) if u < v]
+    origens = rng.sample(nos, 8)
+
+    # Estruturas em dia antes das alterações, para serem reparadas
+    simulacao.indice_recarga
+    for origem in origens:
+        simulacao.caminhos.distancia(origem, rng.choice(nos))
+
+    for _ in range(60):
+        u, v = rng.choice(arestas)
+        operacao = rng.random()
+        if operacao < 0.3:
+            simulacao.fechar_aresta(u, v)
+        elif operacao < 0.5 and simulacao.arestas_fechadas:
+            simulacao.reabrir_aresta(*rng.choice(list(simulacao.arestas_fechadas)))
+        else:
+            simulacao.alterar_peso(u, v, rng.choice([0.5, 1, 2, 5, 10, 20]))
+
+        # O índice foi reparado, não refeito
+        assert simulacao._versao_recarga == estado.versao
+        fontes = set(estado.nos_com('agua')) | set(estado.nos_com('posto_brigadista'))
+        referencia = IndiceRecarga(estado.vizinhos_ponderados, fontes)
+        reparado = simulacao.indice_recarga
+        assert reparado.distancia.keys() == referencia.distancia.keys()
+        for no, distancia in referencia.distancia.items():
+            assert reparado.distancia[no] == pytest.approx(distancia)
+
+        for origem in origens:
+            destino = rng.choice(nos)
+            esperado = ArvoreCaminhos(estado.vizinhos_ponderados, origem).distancia_ate(destino)
+            obtido = simulacao.caminhos.distancia(origem, destino)
+            if esperado is None or math.isinf(esperado):
+                assert obtido is None or math.isinf(obtido)
+            else:
+                assert obtido == pytest.approx(esperado)
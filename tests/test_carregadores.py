@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from FirePrevention.carregadores import carregar_arestas
+from FirePrevention.estado import EstadoCompacto
+
+
+def _arestas(semente, esparso):
+    """Arestas com laços e repetições (nos dois sentidos), pesos inteiros."""
+    rng = np.random.default_rng(semente)
+    origens = rng.integers(0, 40, size=300)
+    destinos = rng.integers(0, 40, size=300)
+    pesos = rng.integers(1, 9, size=300)
+    if esparso:
+        codigos = np.sort(rng.choice(10**9, 40, replace=False))
+        origens, destinos = codigos[origens], codigos[destinos]
+    return origens, destinos, pesos
+
+
+def _referencia(origens, destinos, pesos):
+    """'EstadoCompacto.de_arestas' sobre as arestas sem laços nem repetições."""
+    menores = {}
+    for u, v, p in zip(origens.tolist(), destinos.tolist(), pesos.tolist()):
+        chave = (min(u, v), max(u, v))
+        menores[chave] = min(p, menores.get(chave, p))
+    ids = sorted(set(origens.tolist()) | set(destinos.tolist()))
+    indice = {no: i for i, no in enumerate(ids)}
+    simples = [(indice[u], indice[v], p) for (u, v), p in menores.items() if u != v]
+    u, v, p = map(np.array, zip(*simples))
+    return EstadoCompacto.de_arestas(
+        u, v, p, len(ids), None if ids == list(range(len(ids))) else ids
+    )
+
+
+def _vizinhancas(estado):
+    return {
+        no: sorted(estado.vizinhos_ponderados(no)) for no in estado.nos()
+    }
+
+
+@pytest.mark.parametrize('esparso', [False, True])
+@pytest.mark.parametrize('formato', ['array', 'npy', 'csv', 'txt'])
+@pytest.mark.parametrize('tamanho_bloco', [7, 1000])
+def test_carregar_igual_a_de_arestas(tmp_path, esparso, formato, tamanho_bloco):
+    origens, destinos, pesos = _arestas(0, esparso)
+    dados = np.column_stack([origens, destinos, pesos])
+    if formato == 'array':
+        fonte = dados
+    elif formato == 'npy':
+        fonte = str(tmp_path / 'arestas.npy')
+        np.save(fonte, dados)
+    elif formato == 'csv':
+        fonte = str(tmp_path / 'arestas.csv')
+        np.savetxt(fonte, dados, fmt='%d', delimiter=',', header='u,v,peso', comments='')
+    else:
+        fonte = str(tmp_path / 'arestas.txt')
+        np.savetxt(fonte, dados, fmt='%d')
+
+    estado = carregar_arestas(
+        fonte, cabecalho=1 if formato == 'csv' else 0, tamanho_bloco=tamanho_bloco
+    )
+    esperado = _referencia(origens, destinos, pesos)
+
+    assert estado.ids == esperado.ids
+    assert len(estado.indices) == len(esperado.indices)
+    assert _vizinhancas(estado) == _vizinhancas(esperado)
+
+
+def test_aresta_repetida_alterada_uma_vez():
+    estado = carregar_arestas(np.array([[0, 1, 5], [1, 0, 3], [1, 1, 2], [1, 2, 4]]))
+
+    assert sorted(estado.vizinhos_ponderados(1)) == [(0, 3), (2, 4)]
+    estado.alterar_peso(0, 1, 9)
+    assert sorted(estado.vizinhos_ponderados(0)) == [(1, 9)]
+    assert sorted(estado.vizinhos_ponderados(1)) == [(0, 9), (2, 4)]
+
+
+def test_texto_sem_coluna_de_peso(tmp_path):
+    fonte = tmp_path / 'arestas.edges'
+    fonte.write_text('# comentário\n0 1\n1 2\n\n2 0\n2 1\n')
+
+    estado = carregar_arestas(str(fonte), tamanho_bloco=2)
+
+    assert estado.pesos.dtype.kind == 'i'
+    assert _vizinhancas(estado) == {0: [(1, 1), (2, 1)], 1: [(0, 1), (2, 1)],
+                                    2: [(0, 1), (1, 1)]}
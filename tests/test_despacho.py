@@ -0,0 +1,158 @@
+import itertools
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.despacho import atribuir
+
+
+def _grafo(semente):
+    """Grafo conexo de 30 vértices com pesos reais (sem empates)."""
+    rng = random.Random(semente)
+    while True:
+        grafo = nx.gnm_random_graph(30, 60, seed=rng.randrange(10**6))
+        if nx.is_connected(grafo):
+            break
+    for u, v in grafo.edges:
+        grafo[u][v]['weight'] = rng.random() * 10
+    return grafo, rng.randrange(6, 30)
+
+
+def _simular_original(grafo, postos, pontos_agua, capacidade, consumo, inicio):
+    """
+    Simulação com as regras da versão original: propagação completa a cada
+    passo e cada brigadista, em ordem, indo ao foco mais próximo (ou à água
+    mais próxima, quando sem água), com distâncias do networkx.
+    """
+    agua = set(postos) | set(pontos_agua)
+    bloqueados = agua | set(postos)
+    brigadistas = {p: (p, capacidade) for p in set(postos)}
+    fogo_ativo = [inicio] if inicio not in bloqueados else []
+    em_chamas = set(fogo_ativo)
+    queimados, apagados = set(), []
+
+    def distancia(origem, destino):
+        return nx.shortest_path_length(grafo, origem, destino, weight='weight')
+
+    passos = 0
+    while fogo_ativo and passos < 500:
+        # Propagação em largura a partir de todos os focos
+        fila = list(fogo_ativo)
+        while fila:
+            atual = fila.pop(0)
+            for vizinho in grafo.neighbors(atual):
+                if vizinho not in em_chamas | bloqueados | queimados:
+                    em_chamas.add(vizinho)
+                    fogo_ativo.append(vizinho)
+                    fila.append(vizinho)
+
+        for brigadista, (posicao, litros) in brigadistas.items():
+            if litros < consumo:
+                recarga = min(agua, key=lambda p: distancia(posicao, p))
+                brigadistas[brigadista] = (recarga, capacidade)
+                continue
+
+            alvos = [f for f in fogo_ativo if f != posicao]
+            if not alvos:
+                continue
+            alvo = min(alvos, key=lambda f: distancia(posicao, f))
+            caminho = nx.shortest_path(grafo, posicao, alvo, weight='weight')
+
+            # Reabastece no primeiro ponto de água do trajeto, se houver
+            recarga = next((v for v in caminho[1:-1] if v in agua), None)
+            if recarga is not None:
+                brigadistas[brigadista] = (recarga, capacidade)
+            elif alvo in em_chamas:
+                em_chamas.discard(alvo)
+                fogo_ativo.remove(alvo)
+                queimados.add(alvo)
+                apagados.append(alvo)
+                brigadistas[brigadista] = (alvo, litros - consumo)
+            else:
+                brigadistas[brigadista] = (alvo, litros)
+        passos += 1
+
+    return passos, sorted(apagados), brigadistas
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_despacho_guloso_igual_ao_original(backend):
+    for semente in range(15):
+        grafo, inicio = _grafo(semente)
+        esperado = _simular_original(grafo, [0, 4], [5], 3, 1, inicio)
+
+        simulacao = FirePreventionandFight(
+            grafo=grafo.copy(), postos_brigadistas=[0, 4], pontos_agua=[5],
+            capacidade_caminhoes=3, backend=backend
+        )
+        simulacao.iniciar_fogo(inicio)
+        passos = 0
+        while simulacao.fogo_ativo and passos < 500:
+            simulacao.propagar_fogo()
+            simulacao.enviar_brigadistas()
+            passos += 1
+
+        assert (passos, sorted(simulacao.fogos_apagados),
+                dict(simulacao.brigadistas)) == esperado
+
+
+def _forca_bruta(custos):
+    """Menor custo total entre as atribuições que usam todas as linhas ou colunas."""
+    n, m = custos.shape
+    if n <= m:
+        return min(
+            sum(custos[i, j] for i, j in enumerate(colunas))
+            for colunas in itertools.permutations(range(m), n)
+        )
+    return _forca_bruta(custos.T)
+
+
+def test_atribuicao_otima_igual_forca_bruta():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n, m = rng.integers(1, 6, size=2)
+        custos = rng.integers(0, 20, size=(n, m)).astype(np.float64)
+
+        pares = atribuir(custos)
+
+        linhas, colunas = zip(*pares)
+        assert len(pares) == min(n, m)
+        assert len(set(linhas)) == len(linhas) and len(set(colunas)) == len(colunas)
+        assert sum(custos[i, j] for i, j in pares) == _forca_bruta(custos)
+
+
+def test_atribuicao_descarta_pares_infinitos():
+    custos = np.array([
+        [1.0, np.inf, np.inf],
+        [2.0, np.inf, np.inf],
+        [np.inf, 4.0, np.inf],
+    ])
+
+    pares = atribuir(custos)
+
+    # Só uma das duas primeiras linhas pode ficar com a coluna 0
+    assert sorted(pares) == [(0, 0), (2, 1)]
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_capacidade_considera_focos_alem_dos_mais_proximos(backend):
+    # P -50- B -1- f1 e B -2- f2 -1- W: o foco f2 é mais distante, mas quem
+    # fica sem água volta mais rápido dele para reabastecer
+    P, B, f1, f2, W = range(5)
+    grafo = nx.Graph()
+    grafo.add_weighted_edges_from([(P, B, 50), (B, f1, 1), (B, f2, 2), (f2, W, 1)])
+    simulacao = FirePreventionandFight(
+        grafo=grafo, postos_brigadistas=[P], pontos_agua=[W],
+        capacidade_caminhoes=1, modo_despacho='capacidade', backend=backend
+    )
+    simulacao.brigadistas[P] = (B, 1)
+    simulacao.iniciar_fogo(f1)
+    simulacao.iniciar_fogo(f2)
+
+    simulacao.enviar_brigadistas()
+
+    assert simulacao.brigadistas[P] == (f2, 0)
+    assert simulacao.fogo_ativo == {f1}
@@ -0,0 +1,16 @@
+import networkx as nx
+import numpy as np
+
+from FirePrevention.estado import EstadoCompacto
+
+
+def test_vertices_inteiros_do_numpy():
+    grafo = nx.relabel_nodes(nx.path_graph(4), {i: np.int64(i) for i in range(4)})
+
+    estado = EstadoCompacto.de_grafo(grafo)
+
+    # Vértices 0..n-1 do numpy também dispensam o mapeamento
+    assert estado.ids is None
+    assert np.int64(3) in estado and np.int32(0) in estado
+    assert np.int64(4) not in estado and '1' not in estado
+    assert sorted(v for v, _ in estado.vizinhos_ponderados(np.int64(1))) == [0, 2]
@@ -0,0 +1,107 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from FirePrevention.geradores import (
+    TOPOLOGIAS,
+    _codificar_pares,
+    _decodificar_pares,
+    gerar_arestas,
+)
+
+
+def _grafo(origens, destinos, num_vertices):
+    grafo = nx.Graph()
+    grafo.add_nodes_from(range(num_vertices))
+    grafo.add_edges_from(zip(origens.tolist(), destinos.tolist()))
+    return grafo
+
+
+@pytest.mark.parametrize('topologia', TOPOLOGIAS)
+def test_mesma_semente_gera_o_mesmo_grafo(topologia):
+    primeiro = gerar_arestas(500, 1500, topologia, rng=7)
+    segundo = gerar_arestas(500, 1500, topologia, rng=np.random.default_rng(7))
+    outro = gerar_arestas(500, 1500, topologia, rng=8)
+
+    for a, b in zip(primeiro, segundo):
+        if a is None:
+            assert b is None
+        else:
+            np.testing.assert_array_equal(a, b)
+    assert not all(np.array_equal(a, b) for a, b in zip(primeiro[:3], outro[:3]))
+
+
+@pytest.mark.parametrize('topologia', TOPOLOGIAS)
+def test_grafo_simples_com_pesos_no_intervalo(topologia):
+    num_vertices = 400
+    origens, destinos, pesos, coordenadas = gerar_arestas(
+        num_vertices, 1200, topologia, rng=1, peso_min=2, peso_max=9
+    )
+
+    # Sem laços nem arestas repetidas, com vértices válidos
+    assert len(origens) == len(destinos) == len(pesos)
+    assert np.all(origens != destinos)
+    assert len(set(_codificar_pares(origens, destinos).tolist())) == len(origens)
+    assert 0 <= min(origens.min(), destinos.min())
+    assert max(origens.max(), destinos.max()) < num_vertices
+    assert pesos.min() >= 2 and pesos.max() <= 9
+
+    if topologia in ('aleatoria', 'conexa'):
+        assert len(origens) == 1200
+        assert coordenadas is None
+    else:
+        assert coordenadas.shape == (num_vertices, 2)
+
+
+def test_conexa_gera_grafo_conexo():
+    for semente in range(20):
+        # Com o mínimo de arestas, o grafo é a própria árvore geradora
+        for num_arestas in (99, 150):
+            origens, destinos, _, _ = gerar_arestas(100, num_arestas, 'conexa', rng=semente)
+            assert nx.is_connected(_grafo(origens, destinos, 100))
+
+
+def test_grade_liga_vizinhos_da_malha():
+    origens, destinos, _, coordenadas = gerar_arestas(10, topologia='grade', rng=0)
+
+    # 10 vértices em linhas de 4: 0-3, 4-7, 8-9
+    esperado = nx.Graph([
+        (0, 1), (1, 2), (2, 3), (4, 5), (5, 6), (6, 7), (8, 9),
+        (0, 4), (1, 5), (2, 6), (3, 7), (4, 8), (5, 9),
+    ])
+    assert nx.utils.edges_equal(_grafo(origens, destinos, 10).edges, esperado.edges)
+    distancias = np.abs(coordenadas[origens] - coordenadas[destinos]).sum(axis=1)
+    assert np.all(distancias == 1)
+
+
+def test_geometrica_liga_todos_os_pares_proximos():
+    num_vertices, num_arestas = 300, 900
+    origens, destinos, pesos, coordenadas = gerar_arestas(
+        num_vertices, num_arestas, 'geometrica', rng=4
+    )
+
+    # Compara com todos os pares: as células não podem perder vizinhos
+    raio = np.sqrt(2 * num_arestas / (np.pi * num_vertices * (num_vertices - 1)))
+    diferencas = coordenadas[:, None, :] - coordenadas[None, :, :]
+    proximos = np.sum(diferencas ** 2, axis=2) <= raio ** 2
+    i, j = np.nonzero(np.triu(proximos, k=1))
+    assert sorted(_codificar_pares(origens, destinos).tolist()) == \
+        sorted(_codificar_pares(i, j).tolist())
+
+    # Arestas mais longas não têm peso menor
+    comprimentos = np.linalg.norm(coordenadas[origens] - coordenadas[destinos], axis=1)
+    ordem = np.argsort(comprimentos)
+    assert np.all(np.diff(pesos[ordem]) >= 0)
+
+
+def test_codificacao_de_pares_e_inversivel():
+    rng = np.random.default_rng(0)
+    maior = rng.integers(1, 3 * 10**9, size=10000)
+    menor = (rng.random(10000) * maior).astype(np.int64)
+
+    chaves = _codificar_pares(menor, maior)
+
+    assert np.array_equal(_codificar_pares(maior, menor), chaves)
+    decodificado = _decodificar_pares(chaves)
+    assert np.array_equal(decodificado[0], menor)
+    assert np.array_equal(decodificado[1], maior)
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from FirePrevention import FirePreventionandFight
+
+
+def _simulacao(modo_despacho):
+    return FirePreventionandFight(
+        num_vertices=300, num_arestas=900, topologia='conexa', semente=5,
+        postos_brigadistas=[0, 1, 2, 3], pontos_agua=[4, 5],
+        capacidade_caminhoes=2, modo_despacho=modo_despacho,
+        raio_propagacao=1, instrumentar=True
+    )
+
+
+@pytest.mark.parametrize('modo_despacho', ['guloso', 'capacidade'])
+def test_fases_somam_o_tempo_do_passo(modo_despacho):
+    simulacao = _simulacao(modo_despacho)
+    passos = simulacao.simular_iter(150, max_passos=25)
+
+    duracoes = {}
+    while True:
+        inicio = time.perf_counter()
+        passo = next(passos, None)
+        if passo is None:
+            break
+        duracoes[passo.estado] = time.perf_counter() - inicio
+
+    registros = simulacao.instrumentacao.registros()
+    fases = {(r['passo'], r['fase']) for r in registros}
+    assert (1, 'ignicao') in fases
+    assert {fase for passo, fase in fases if passo == 1} == {'ignicao'}
+    assert all((p, 'propagacao') in fases and (p, 'despacho') in fases
+               for p in duracoes if p > 1)
+    if modo_despacho == 'capacidade':
+        assert any(fase == 'recarga' for _, fase in fases)
+
+    # Fases internas não são contadas duas vezes
+    for passo, duracao in duracoes.items():
+        total = sum(r['tempo_s'] for r in registros if r['passo'] == passo)
+        assert 0 < total <= duracao
+    assert all(r['tempo_s'] >= 0 and r['buscas'] >= 0 and r['vertices_fixados'] >= 0
+               for r in registros)
+
+
+def test_fase_interna_descontada_da_externa():
+    simulacao = _simulacao('guloso')
+    instrumentacao = simulacao.instrumentacao
+
+    with instrumentacao.fase('despacho'):
+        time.sleep(0.02)
+        with instrumentacao.fase('recarga'):
+            simulacao.encontrar_caminho_ate_agua_ou_posto(150)
+            time.sleep(0.05)
+
+    resumo = instrumentacao.resumo()
+    assert resumo['recarga']['tempo_s'] >= 0.05
+    assert 0.02 <= resumo['despacho']['tempo_s'] < 0.05
+    assert resumo['recarga']['buscas'] >= 1 and resumo['despacho']['buscas'] == 0
@@ -0,0 +1,71 @@
+import networkx as nx
+import numpy as np
+
+from FirePrevention.lote import executar_lote
+from FirePrevention.otimizacao import otimizar_posicionamento
+
+
+PARAMETROS = dict(raio_propagacao=1, max_passos=40)
+
+
+def _componentes(grafos):
+    """União disjunta dos grafos, com vértices inteiros e pesos unitários."""
+    grafo = nx.convert_node_labels_to_integers(nx.disjoint_union_all(grafos))
+    nx.set_edge_attributes(grafo, 1.0, 'weight')
+    inicios = np.cumsum([0] + [len(g) for g in grafos])[:-1].tolist()
+    return grafo, inicios
+
+
+def _guloso_exaustivo(grafo, ignicoes, candidatos, num_postos):
+    """Guloso simples: a cada rodada simula todos os candidatos restantes."""
+    def area(postos):
+        return executar_lote(
+            grafo, ignicoes, processos=1, postos_brigadistas=postos, **PARAMETROS
+        ).queimados.mean()
+
+    postos = []
+    for _ in range(num_postos):
+        _, _, melhor = min(
+            (area(postos + [c]), ordem, c)
+            for ordem, c in enumerate(candidatos) if c not in postos
+        )
+        postos.append(melhor)
+    return postos, area(postos)
+
+
+def test_guloso_preguicoso_igual_ao_exaustivo():
+    # Caminhos independentes: o ganho de um posto não depende dos demais
+    tamanhos = [9, 15, 11, 21, 13, 17]
+    grafo, inicios = _componentes([nx.path_graph(n) for n in tamanhos])
+    ignicoes = [i + n // 2 for i, n in zip(inicios, tamanhos)]
+    candidatos = [i + d for i, d in zip(inicios, [0, 2, 1, 3, 5, 4])]
+
+    postos, area = _guloso_exaustivo(grafo, ignicoes, candidatos, 3)
+    resultados = [
+        otimizar_posicionamento(
+            grafo, ignicoes, num_postos=3, candidatos_postos=candidatos,
+            processos=1, preguicoso=preguicoso, **PARAMETROS
+        )
+        for preguicoso in (True, False)
+    ]
+
+    for resultado in resultados:
+        assert resultado.postos == postos
+        assert resultado.area_esperada == area
+    assert resultados[0].avaliacoes < resultados[1].avaliacoes
+
+
+def test_guloso_exato_igual_ao_exaustivo_sem_ganhos_decrescentes():
+    # Postos na mesma grade se complementam, o que engana a versão preguiçosa
+    grafo, inicios = _componentes([nx.grid_2d_graph(5, 5) for _ in range(4)])
+    ignicoes = [i + 12 for i in inicios]
+    candidatos = [i + c for i in inicios for c in (0, 6, 7, 13, 18, 24)][:-2]
+
+    postos, area = _guloso_exaustivo(grafo, ignicoes, candidatos, 4)
+    resultado = otimizar_posicionamento(
+        grafo, ignicoes, num_postos=4, candidatos_postos=candidatos,
+        processos=1, preguicoso=False, **PARAMETROS
+    )
+
+    assert resultado.postos == postos
+    assert resultado.area_esperada == area
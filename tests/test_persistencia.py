@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.estado import ATRIBUTOS
+from FirePrevention.persistencia import GravadorPassos, reconstruir
+from FirePrevention.propagacao import PropagacaoEstocastica
+
+
+def _retrato(simulacao):
+    """Estado observável da simulação, comparável entre execuções."""
+    estado = simulacao.estado
+    nos = list(estado.nos())
+    pesos = {
+        (u, v): estado.peso(u, v)
+        for u in nos for v, _ in estado.vizinhos_ponderados(u)
+    }
+    return {
+        'fogo_ativo': sorted(simulacao.fogo_ativo),
+        'fronteira': sorted(simulacao.fronteira_fogo),
+        'apagados': list(simulacao.fogos_apagados),
+        'brigadistas': dict(simulacao.brigadistas),
+        'atributos': {a: sorted(estado.nos_com(a)) for a in ATRIBUTOS},
+        'pesos': pesos,
+        'fechadas': {frozenset(a): p for a, p in simulacao.arestas_fechadas.items()},
+    }
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+@pytest.mark.parametrize('intervalo', [None, 7])
+def test_reconstruir_igual_a_execucao(tmp_path, backend, intervalo):
+    simulacao = FirePreventionandFight(
+        num_vertices=400, num_arestas=1200, topologia='conexa',
+        postos_brigadistas=[0, 5, 9], pontos_agua=[1, 2],
+        capacidade_caminhoes=4, raio_propagacao=1, semente=3, backend=backend
+    )
+    nos = list(simulacao.estado.nos())
+    arestas = [
+        (u, v) for u in nos
+        for v, _ in simulacao.estado.vizinhos_ponderados(u) if u < v
+    ]
+    rng = random.Random(1)
+    prefixo = str(tmp_path / 'historia')
+
+    gravador = GravadorPassos(simulacao, prefixo, intervalo_checkpoints=intervalo)
+    retratos = {}
+    for passo in simulacao.simular_iter(200, max_passos=30):
+        gravador(passo)
+        retratos[passo.estado] = _retrato(simulacao)
+
+        # Alterações de arestas no meio da simulação, gravadas no passo seguinte
+        u, v = rng.choice(arestas)
+        operacao = rng.randrange(3)
+        if operacao == 0:
+            simulacao.fechar_aresta(u, v)
+        elif operacao == 1 and simulacao.arestas_fechadas:
+            simulacao.reabrir_aresta(*rng.choice(list(simulacao.arestas_fechadas)))
+        else:
+            simulacao.alterar_peso(u, v, rng.randrange(1, 20) + 0.5)
+    gravador.finalizar()
+
+    assert any(r['fechadas'] for r in retratos.values())
+    for numero, retrato in retratos.items():
+        assert _retrato(reconstruir(prefixo, numero).simulacao) == retrato
+
+
+def test_retomar_de_qualquer_passo_com_propagacao_estocastica(tmp_path):
+    def criar():
+        simulacao = FirePreventionandFight(
+            num_vertices=400, topologia='grade', backend='compacto', semente=7,
+            postos_brigadistas=[0], pontos_agua=[19], capacidade_caminhoes=1
+        )
+        simulacao.modelo_propagacao = PropagacaoEstocastica(
+            simulacao.estado, coordenadas=simulacao._coordenadas, intensidade=2.0
+        )
+        return simulacao
+
+    simulacao = criar()
+    prefixo = str(tmp_path / 'historia')
+    gravador = GravadorPassos(simulacao, prefixo, intervalo_checkpoints=10)
+    for passo in simulacao.simular_iter(210, max_passos=13):
+        gravador(passo)
+    gravador.finalizar()
+    assert not simulacao.observadores
+
+    # Referência: a mesma execução, sem interrupção, até o fim
+    referencia = [
+        (p.estado, sorted(p.novos_focos), p.eventos)
+        for p in criar().simular_iter(210, max_passos=40)
+    ]
+
+    # O passo 13 não coincide com um checkpoint
+    restaurada, numero = reconstruir(prefixo, 13)
+    restaurada.modelo_propagacao = PropagacaoEstocastica(
+        restaurada.estado, coordenadas=restaurada._coordenadas, intensidade=2.0
+    )
+    continuacao = [
+        (p.estado, sorted(p.novos_focos), p.eventos)
+        for p in restaurada.retomar_iter(numero, max_passos=27)
+    ]
+    assert len(continuacao) == 27
+    assert continuacao == referencia[13:40]
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_alteracoes_entre_passos_fora_dos_eventos(tmp_path, backend):
+    simulacao = FirePreventionandFight(
+        num_vertices=200, num_arestas=600, topologia='conexa',
+        postos_brigadistas=[0], pontos_agua=[1, 2], raio_propagacao=1,
+        semente=4, backend=backend
+    )
+    prefixo = str(tmp_path / 'historia')
+    gravador = GravadorPassos(simulacao, prefixo)
+
+    retratos = {}
+    for passo in simulacao.simular_iter(100, max_passos=6):
+        gravador(passo)
+        retratos[passo.estado] = _retrato(simulacao)
+        if passo.estado == 2:
+            simulacao.remover_ponto_agua(1)
+            simulacao.adicionar_ponto_agua(150)
+        elif passo.estado == 3 and backend == 'networkx':
+            # Peso alterado direto no grafo, sem aviso ao gravador
+            u, v = next(iter(simulacao.grafo.edges))
+            simulacao.grafo[u][v]['weight'] = 99
+            simulacao.invalidar_caminhos()
+    gravador.finalizar()
+
+    for numero, retrato in retratos.items():
+        assert _retrato(reconstruir(prefixo, numero).simulacao) == retrato
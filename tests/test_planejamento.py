@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.eventos import Deslocamento
+
+
+def _executar(backend, modo_despacho, processos):
+    rng = random.Random(5)
+    postos = rng.sample(range(600), 8)
+    simulacao = FirePreventionandFight(
+        num_vertices=600, num_arestas=4000, topologia='geometrica', semente=2,
+        backend=backend, postos_brigadistas=postos,
+        pontos_agua=rng.sample(range(600), 6), capacidade_caminhoes=2,
+        raio_propagacao=1, modo_despacho=modo_despacho,
+        processos_despacho=processos
+    )
+    nos = list(simulacao.estado.nos())
+    arestas = [
+        (u, v) for u in nos
+        for v, _ in simulacao.estado.vizinhos_ponderados(u) if u < v
+    ]
+    inicio = next(no for no in nos if no not in postos)
+
+    historia, planejadores = [], []
+    with simulacao:
+        for passo in simulacao.simular_iter(inicio, max_passos=30):
+            historia.append(passo)
+            planejador = simulacao._planejador
+            if planejador is not None and not any(p is planejador for p in planejadores):
+                planejadores.append(planejador)
+
+            # Alterações entre os turnos, de preferência nas arestas que os
+            # brigadistas acabaram de usar
+            usadas = [
+                tuple(e.caminho[i:i + 2]) for e in passo.eventos
+                if isinstance(e, Deslocamento) for i in range(len(e.caminho) - 1)
+            ]
+            u, v = rng.choice(usadas or arestas)
+            if passo.estado % 3 == 0:
+                simulacao.fechar_aresta(u, v)
+            else:
+                simulacao.alterar_peso(u, v, rng.random() * 4)
+    return historia, planejadores
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+@pytest.mark.parametrize('modo_despacho', ['guloso', 'otimo', 'capacidade'])
+def test_paralelo_igual_ao_sequencial(backend, modo_despacho):
+    sequencial, _ = _executar(backend, modo_despacho, None)
+    paralelo, planejadores = _executar(backend, modo_despacho, 2)
+
+    assert len(sequencial) == 31
+    assert paralelo == sequencial
+    # Os pesos alterados chegam ao planejador sem recriar os processos
+    assert len(planejadores) == 1
+
+
+def test_alteracao_sem_aviso_recria_o_planejador():
+    simulacao = FirePreventionandFight(
+        num_vertices=100, num_arestas=300, topologia='conexa', semente=1,
+        backend='networkx', postos_brigadistas=[0, 1], pontos_agua=[2],
+        processos_despacho=2
+    )
+    with simulacao:
+        primeiro = simulacao._obter_planejador()
+        simulacao.alterar_peso(*next(iter(simulacao.grafo.edges)), 7.5)
+        assert simulacao._obter_planejador() is primeiro
+
+        u, v = next(iter(simulacao.grafo.edges))
+        simulacao.grafo[u][v]['weight'] = 3
+        simulacao.invalidar_caminhos()
+        assert simulacao._obter_planejador() is not primeiro
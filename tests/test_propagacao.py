@@ -0,0 +1,109 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.eventos import FogoIncontrolavel
+from FirePrevention.propagacao import PropagacaoEstocastica
+
+
+def _simulacao(semente, **opcoes):
+    simulacao = FirePreventionandFight(
+        num_vertices=400, topologia='grade', backend='compacto', semente=semente,
+        postos_brigadistas=[0, 399], pontos_agua=[19, 380], capacidade_caminhoes=3
+    )
+    simulacao.modelo_propagacao = PropagacaoEstocastica(
+        simulacao.estado, coordenadas=simulacao._coordenadas, **opcoes
+    )
+    return simulacao
+
+
+def _historia(simulacao):
+    return [
+        (passo.estado, sorted(passo.novos_focos), passo.eventos)
+        for passo in simulacao.simular_iter(210, max_passos=40)
+    ]
+
+
+def test_mesma_semente_reproduz_a_simulacao():
+    opcoes = dict(intensidade=5.0, vento=1.0, forca_vento=0.8)
+
+    primeira = _historia(_simulacao(7, **opcoes))
+    segunda = _historia(_simulacao(7, **opcoes))
+    outra = _historia(_simulacao(8, **opcoes))
+
+    assert primeira == segunda
+    assert primeira != outra
+
+
+def test_probabilidade_um_igual_ao_modelo_deterministico():
+    referencia = FirePreventionandFight(
+        num_vertices=400, topologia='grade', backend='compacto', semente=7,
+        raio_propagacao=1, postos_brigadistas=[0, 399], pontos_agua=[19, 380],
+        capacidade_caminhoes=3
+    )
+    # Intensidade enorme: toda aresta finita propaga com probabilidade 1
+    simulacao = _simulacao(7, intensidade=1e9)
+
+    assert np.all(simulacao.modelo_propagacao.probabilidades == 1)
+    # O determinístico só para um passo depois, quando a frente se esgota
+    assert _acoes(simulacao) == _acoes(referencia)
+    assert simulacao.fogo_ativo == referencia.fogo_ativo
+    assert simulacao.fogos_apagados == referencia.fogos_apagados
+
+
+def _acoes(simulacao):
+    """Passos com novos focos ou ações de brigadistas, sem o encerramento."""
+    return [
+        (sorted(novos), [e for e in eventos if not isinstance(e, FogoIncontrolavel)])
+        for _, novos, eventos in _historia(simulacao)
+        if novos or any(not isinstance(e, FogoIncontrolavel) for e in eventos)
+    ]
+
+
+def test_sem_combustivel_o_fogo_nao_se_espalha():
+    simulacao = _simulacao(7, combustivel=np.zeros(400))
+
+    passos = list(simulacao.simular_iter(210, max_passos=5))
+
+    assert all(not passo.novos_focos for passo in passos[1:])
+    assert not simulacao.modelo_propagacao.pode_propagar(simulacao)
+
+
+def _caminho(num_vertices):
+    grafo = nx.path_graph(num_vertices)
+    nx.set_edge_attributes(grafo, 1, 'weight')
+    simulacao = FirePreventionandFight(
+        grafo=grafo, backend='compacto', postos_brigadistas=[], pontos_agua=[]
+    )
+    return simulacao
+
+
+def test_ensaios_deterministicos_no_caminho():
+    simulacao = _caminho(10)
+    simulacao.estado.definir(7, 'agua')
+    modelo = PropagacaoEstocastica(simulacao.estado, intensidade=1e9)
+
+    resultado = modelo.simular_ensaios([0, 5, 9], max_passos=50, tempo_queima=2)
+
+    # A água em 7 separa 0..6 de 8..9; cada vértice queima por 2 passos
+    assert resultado.queimados.tolist() == [7, 7, 2]
+    assert resultado.passos.tolist() == [8, 7, 3]
+    assert resultado.frequencia[7] == 0
+    np.testing.assert_allclose(resultado.frequencia[:7], 2 / 3)
+    np.testing.assert_allclose(resultado.frequencia[8:], 1 / 3)
+
+
+def test_ensaios_reproduziveis_e_com_a_media_esperada():
+    simulacao = _caminho(2)
+    # Uma aresta com probabilidade 1 - e^-0.5 de propagar por passo
+    modelo = PropagacaoEstocastica(simulacao.estado, intensidade=0.5)
+    probabilidade = -np.expm1(-0.5)
+
+    resultado = modelo.simular_ensaios(0, num_ensaios=20000, semente=3)
+    repetido = modelo.simular_ensaios(0, num_ensaios=20000, semente=3)
+
+    assert np.array_equal(resultado.queimados, repetido.queimados)
+    assert resultado.frequencia[0] == 1
+    assert resultado.frequencia[1] == pytest.approx(probabilidade, abs=0.015)
+    assert set(resultado.queimados.tolist()) == {1, 2}
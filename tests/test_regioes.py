@@ -0,0 +1,89 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.eventos import FogoIncontrolavel, Transferencia
+from FirePrevention.geradores import gerar_arestas
+from FirePrevention.estado import EstadoCompacto
+from FirePrevention.regioes import SimulacaoRegional
+
+
+def _estado():
+    origens, destinos, pesos, _ = gerar_arestas(600, 1800, 'conexa', rng=1)
+    return EstadoCompacto.de_arestas(origens, destinos, pesos, 600)
+
+
+def _historia(passos):
+    return [(p.estado, sorted(p.novos_focos), p.eventos, p.focos_ativos) for p in passos]
+
+
+@pytest.mark.parametrize('raio', [1, 2, None])
+def test_propagacao_igual_a_simulacao_unica(raio):
+    estado = _estado()
+    simulacao = FirePreventionandFight(
+        grafo=estado.clonar(), backend='compacto', raio_propagacao=raio,
+        postos_brigadistas=[], pontos_agua=[]
+    )
+    referencia = [sorted(p.novos_focos) for p in simulacao.simular_iter(7, max_passos=40)]
+
+    with SimulacaoRegional(estado.clonar(), num_regioes=4, processos=1,
+                           raio_propagacao=raio, semente=1) as regional:
+        obtido = [sorted(p.novos_focos) for p in regional.simular_iter(7, max_passos=40)]
+
+    assert obtido == referencia
+
+
+def test_uma_regiao_igual_a_simulacao_unica():
+    estado = _estado()
+    opcoes = dict(postos_brigadistas=[0, 3, 9], pontos_agua=[1, 2],
+                  capacidade_caminhoes=3, raio_propagacao=1)
+    simulacao = FirePreventionandFight(grafo=estado.clonar(), backend='compacto', **opcoes)
+    referencia = _historia(simulacao.simular_iter(50))
+
+    with SimulacaoRegional(estado.clonar(), num_regioes=1, processos=1, **opcoes) as regional:
+        obtido = _historia(regional.simular_iter(50))
+        resultado = regional.coletar()
+
+    assert obtido == referencia
+    assert resultado.fogo_ativo == simulacao.fogo_ativo
+    assert resultado.brigadistas == simulacao.brigadistas
+
+
+def _regional(arestas, rotulos, processos=1, **opcoes):
+    grafo = nx.Graph()
+    grafo.add_nodes_from(range(len(rotulos)))
+    grafo.add_weighted_edges_from(arestas)
+    return SimulacaoRegional(
+        grafo, num_regioes=max(rotulos) + 1, processos=processos,
+        rotulos=np.array(rotulos), raio_propagacao=1, **opcoes
+    )
+
+
+def test_transferencia_conta_o_peso_da_aresta_de_fronteira():
+    # Região 0: 0, 1, 2; região 1: 3, 4. A saída por 1 é mais próxima,
+    # mas a aresta 1-3 é muito mais pesada que o desvio por 2-4
+    arestas = [(0, 1, 1), (1, 2, 1), (1, 3, 100), (2, 4, 1), (3, 4, 1)]
+    with _regional(arestas, [0, 0, 0, 1, 1], postos_brigadistas=[0],
+                   pontos_agua=[1, 2], capacidade_caminhoes=5) as regional:
+        eventos = [e for p in regional.simular_iter(3) for e in p.eventos]
+
+    transferencias = [e for e in eventos if isinstance(e, Transferencia)]
+    assert transferencias[0] == Transferencia(0, [0, 1, 2, 4], 1, 5)
+    assert not regional.focos_ativos
+
+
+@pytest.mark.parametrize('processos', [1, 2])
+def test_foco_fora_do_alcance_da_regiao_mas_alcancavel_pelo_grafo(processos):
+    # Sem arestas internas: o brigadista da região 0 não chega ao foco em 2,
+    # da própria região, sem passar pela região 1
+    arestas = [(0, 1, 1), (1, 2, 1), (2, 3, 1)]
+    with _regional(arestas, [0, 1, 0, 1], processos, postos_brigadistas=[0],
+                   pontos_agua=[], capacidade_caminhoes=10) as regional:
+        eventos = [e for p in regional.simular_iter(2) for e in p.eventos]
+        resultado = regional.coletar()
+
+    assert not any(isinstance(e, FogoIncontrolavel) for e in eventos)
+    assert any(isinstance(e, Transferencia) for e in eventos)
+    assert not resultado.fogo_ativo
+    assert sorted(resultado.fogos_apagados) == [1, 2, 3]
@@ -0,0 +1,88 @@
+import matplotlib
+
+matplotlib.use('Agg')
+
+import networkx as nx  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from FirePrevention import FirePreventionandFight  # noqa: E402
+from FirePrevention.renderizador import (  # noqa: E402
+    AGUA,
+    BRIGADISTA,
+    FOGO,
+    PALETA,
+    QUEIMADO,
+    SEGURO,
+    GravadorAnimacao,
+    Renderizador,
+)
+
+
+def _simulacao(backend, rotulado):
+    """Caminho de 6 vértices, com nomes em texto quando 'rotulado'."""
+    grafo = nx.path_graph(6)
+    nx.set_edge_attributes(grafo, 1, 'weight')
+    nomes = {i: f'v{i}' if rotulado else i for i in range(6)}
+    grafo = nx.relabel_nodes(grafo, nomes)
+    simulacao = FirePreventionandFight(
+        grafo=grafo, postos_brigadistas=[nomes[0]], pontos_agua=[nomes[5]],
+        backend=backend
+    )
+    simulacao.pos = {nomes[i]: (i, 0) for i in range(6)}
+    return simulacao, nomes
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+@pytest.mark.parametrize('rotulado', [False, True])
+def test_cores_seguem_a_prioridade_das_categorias(backend, rotulado):
+    simulacao, nomes = _simulacao(backend, rotulado)
+    simulacao.estado.definir(nomes[1], 'queimado')
+    simulacao.estado.definir(nomes[4], 'queimado')
+    simulacao.iniciar_fogo(nomes[3])
+    # Brigadista sobre um vértice queimado e o fogo sobre o brigadista
+    simulacao.brigadistas[nomes[0]] = (nomes[4], 10)
+    renderizador = Renderizador(simulacao)
+
+    try:
+        codigos = renderizador.codigos()
+        cores = renderizador._artista_nos.get_facecolor()
+    finally:
+        renderizador.fechar()
+
+    assert codigos.tolist() == [AGUA, QUEIMADO, SEGURO, FOGO, BRIGADISTA, AGUA]
+    np.testing.assert_array_equal(cores, PALETA[codigos])
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+def test_arestas_fechadas_ficam_tracejadas(backend):
+    simulacao, _ = _simulacao(backend, False)
+    renderizador = Renderizador(simulacao)
+
+    try:
+        simulacao.fechar_aresta(2, 3)
+        simulacao.alterar_peso(4, 5, 7.5)
+        renderizador.atualizar(1)
+
+        indice = renderizador._arestas.index((2, 3))
+        estilos = renderizador._artista_arestas.get_linestyle()
+        rotulos = {a: r.get_text() for a, r in renderizador._rotulos_arestas.items()}
+    finally:
+        renderizador.fechar()
+
+    assert estilos[indice] != estilos[renderizador._arestas.index((0, 1))]
+    assert rotulos[(2, 3)] == '∞' and rotulos[(4, 5)] == '7.5' and rotulos[(0, 1)] == '1'
+
+
+def test_gravador_salva_um_png_por_passo(tmp_path):
+    simulacao, _ = _simulacao('compacto', False)
+    gravador = GravadorAnimacao(simulacao, str(tmp_path / 'quadros' / 'estado_{:02d}.png'))
+
+    passos = list(simulacao.simular_iter(3))
+    for passo in passos:
+        gravador(passo)
+    gravador.finalizar()
+
+    arquivos = sorted(p.name for p in (tmp_path / 'quadros').iterdir())
+    assert arquivos == [f'estado_{passo.estado:02d}.png' for passo in passos]
+    assert all((tmp_path / 'quadros' / nome).stat().st_size > 0 for nome in arquivos)
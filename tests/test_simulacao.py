@@ -0,0 +1,47 @@
+import networkx as nx
+import pytest
+
+from FirePrevention import FirePreventionandFight
+from FirePrevention.eventos import FogoIncontrolavel
+from FirePrevention.lote import executar_lote
+
+
+def _caminho_com_ilha():
+    """Caminho 0..5 e a aresta isolada 6-7, fora do alcance dos brigadistas."""
+    grafo = nx.path_graph(6)
+    grafo.add_edge(6, 7)
+    nx.set_edge_attributes(grafo, 1.0, 'weight')
+    return grafo
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'compacto'])
+@pytest.mark.parametrize('raio', [None, 1])
+def test_fogo_inalcancavel_encerra_a_simulacao(backend, raio):
+    simulacao = FirePreventionandFight(
+        grafo=_caminho_com_ilha(), postos_brigadistas=[2], pontos_agua=[3],
+        backend=backend, raio_propagacao=raio
+    )
+
+    passos = list(simulacao.simular_iter(6))
+
+    assert simulacao.fogo_ativo == {6, 7}
+    assert passos[-1].eventos == [FogoIncontrolavel([6, 7])]
+    assert not any(isinstance(e, FogoIncontrolavel)
+                   for passo in passos[:-1] for e in passo.eventos)
+
+
+def test_lote_sem_limite_marca_fogo_inalcancavel_como_nao_contido():
+    resultado = executar_lote(
+        _caminho_com_ilha(), ignicoes=[6, 0], processos=1,
+        postos_brigadistas=[2], pontos_agua=[3]
+    )
+
+    assert resultado.contido.tolist() == [False, True]
+
+
+def test_capacidade_menor_que_consumo_e_rejeitada():
+    with pytest.raises(ValueError):
+        FirePreventionandFight(
+            grafo=_caminho_com_ilha(), postos_brigadistas=[2], pontos_agua=[3],
+            capacidade_caminhoes=1, consumo_por_fogo=2
+        )